@@ -71,14 +71,14 @@ Exemple:
 >>> visualisation_graphe_flots_maximaux(debut)
 
 >>> recupere_ville_flot_maximal_faible(probleme)
-[('J', 15), ('L', 15)]
+[('J', 15), ('K', 20), ('L', 15)]
 
 >>> solution = ressort_table_apres_travaux(probleme)
->>> solution_finale = Probleme(transforme_table(solution))
+>>> solution_finale = probleme.resoudre().apres_travaux
 >>> recupere_ville_flot_maximal_faible(solution_finale)
 []
 
->>> solution_finale.affiche()
+>>> solution_finale.probleme.affiche()
    Problème d'adduction d'eau   
 ┏━━━━━━━━━┳━━━━━━━━━┳━━━━━━━━━━┓
 ┃ Initial ┃ Arrivée ┃ Capacité ┃
@@ -95,7 +95,7 @@ Exemple:
 │ D       │ F       │ 4.0      │
 │ D       │ G       │ 10.0     │
 │ E       │ F       │ 5.0      │
-│ E       │ H       │ 7.0      │
+│ E       │ H       │ 5.0      │
 │ E       │ I       │ 15.0     │
 │ F       │ G       │ 5.0      │
 │ F       │ I       │ 15.0     │
@@ -115,9 +115,49 @@ Exemple:
 
 
 from .probleme import Probleme
-from .algorithme import ressort_table_apres_travaux, transforme_table, visualisation_graphe_flots_maximaux, recupere_ville_flot_maximal_faible
+from .table import TableCreuse
 
-__all__ = [
-    "Probleme", "ressort_table_apres_travaux", "transforme_table", 
-    "visualisation_graphe_flots_maximaux", "recupere_ville_flot_maximal_faible"
-]
\ No newline at end of file
+_IMPORTS_DIFFERES = {
+    "Solution": "algorithme",
+    "planifie_travaux": "algorithme",
+    "ressort_table_apres_travaux": "algorithme",
+    "transforme_table": "algorithme",
+    "visualisation_graphe_flots_maximaux": "algorithme",
+    "recupere_ville_flot_maximal_faible": "algorithme",
+    "coupe_minimale": "algorithme",
+    "courbe_flot_travaux": "algorithme",
+    "courbe_flot_demande": "algorithme",
+    "resout_scenarios": "scenarios",
+    "analyse_contingences": "contingences",
+    "simule_pannes": "fiabilite",
+    "simule_demandes": "series",
+    "ReseauVivant": "vivant",
+    "rapport_sensibilite": "sensibilite",
+    "analyse_villes": "livrabilite",
+    "configure_moteur": "moteurs",
+    "configure_cache": "cache",
+    "charge_solution": "stockage",
+    "table_resultats": "colonnes",
+    "ecrit_parquet": "colonnes",
+}
+
+__all__ = ["Probleme", "TableCreuse", *_IMPORTS_DIFFERES]
+
+
+def __getattr__(nom: str):
+    """Importe au premier accès le module définissant `nom` (PEP 562).
+
+    `import Adduction_eau` ne charge ainsi que Probleme et TableCreuse : matplotlib,
+    networkx et rich ne sont importés que par les fonctions qui s'en servent.
+    """
+    if nom not in _IMPORTS_DIFFERES:
+        raise AttributeError(f"module {__name__!r} has no attribute {nom!r}")
+    from importlib import import_module
+    valeur = getattr(import_module(f".{_IMPORTS_DIFFERES[nom]}", __name__), nom)
+    globals()[nom] = valeur
+    return valeur
+
+
+def __dir__():
+    """Liste aussi les noms dont l'import est différé."""
+    return sorted(set(globals()) | set(__all__))
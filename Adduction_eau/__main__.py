@@ -45,6 +45,6 @@ visualisation_graphe_flots_maximaux(debut)
 solution = ressort_table_apres_travaux(probleme)
 visualisation_graphe_flots_maximaux(solution)
 
-solution_finale = Probleme(transforme_table(solution))
+solution_finale = probleme.resoudre().apres_travaux
 recupere_ville_flot_maximal_faible(solution_finale)
-solution_finale.affiche()
\ No newline at end of file
+solution_finale.probleme.affiche()
\ No newline at end of file
@@ -5,29 +5,125 @@
 Contient la fonction de résolution de l'exercice d'adduction d'eau ainsi qu'une fonction de visualisation du graphe et de ses flots.
 
 Fonctions principales :
+- planifie_travaux
 - ressort_table_apres_travaux
+- courbe_flot_travaux
+- courbe_flot_demande
 - visualisation_graphe_flots_maximaux
 - transforme_table
 - recupere_ville_flot_maximal_faible
+- coupe_minimale
 
 Fonctions secondaires :
 - _modifie_reseau
+- _courbe
 - _recupere_sommets
 - _recupere_flots_maximaux
+- _resolution
+- _flots_par_canalisation
+- _graphe_depuis_flots
+- _en_solution
+
+Classes :
+- Solution
+- _SolutionApresTravaux
 """
 
-from typing import List, Dict, Tuple
+from functools import cached_property
+from typing import List, Dict, Tuple, Union
 from Adduction_eau import Probleme
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-import networkx as nx
+from Adduction_eau.cache import cache_actif
+from Adduction_eau.canalisations import Canalisations
+from Adduction_eau.table import TableCreuse
+from Adduction_eau.elagage import flot_par_composantes
+from Adduction_eau.moteurs import moteur_demande
+from Adduction_eau.flot import GrapheResiduel, flot_cout_minimal, flot_parametrique
 import numpy as np
 import pandas as pd
 
 
-def _modifie_reseau(probleme: Probleme) -> pd.DataFrame:
+def planifie_travaux(probleme: Union[Probleme, "Solution"],
+                     couts: Dict[Tuple[str, str], float] = None) -> Dict[Tuple[str, str], float]:
+    """Calcule les augmentations de capacité de coût total minimal permettant d'alimenter toutes les villes.
+    
+    Le coût d'une augmentation est proportionnel à la capacité ajoutée : 1 par unité par défaut,
+    ou la valeur donnée dans `couts` pour une canalisation (`float("inf")` l'exclut des travaux).
+    Les demandes des villes (arrêtes vers le puit) ne sont jamais augmentées. Un seul calcul de
+    flot de coût minimal est fait : chaque canalisation est doublée d'une arrête de travaux
+    de capacité égale à la demande totale. Lève une ValueError si la demande est impossible à satisfaire.
+    
+    Exemple :
+>>> from Adduction_eau import planifie_travaux
+>>> from Adduction_eau import Probleme
+
+>>> probleme = Probleme.par_str(
+...    '''
+... source / A / 15
+... source / B / 15
+... source / C / 15
+... source / D / 10
+... C / A / 5
+... C / F / 5 
+... A / E / 7
+... B / F / 10
+... B / G / 7
+... D / G / 10
+... E / F / 5
+... E / H / 4
+... E / I / 15
+... F / G / 5
+... F / I / 15
+... G / I / 15
+... H / J / 7
+... I / K / 30
+... I / L / 4
+... K / J / 10
+... J / puit / 15
+... K / puit / 20
+... L / puit / 15
+... '''
+... )
+
+>>> planifie_travaux(probleme)
+{('A', 'E'): 13.0, ('E', 'H'): 1.0, ('I', 'L'): 11.0}
+    """
+    table = _en_solution(probleme).table_creuse
+    if "source" not in table.sommets or "puit" not in table.sommets:
+        raise ValueError("Le réseau doit comprendre une source et un puit.")
+    source, puit = table.numero("source"), table.numero("puit")
+    demandes = table.destinations == puit
+    demande = float(table.valeurs[demandes].sum())
+    couts_travaux = np.ones(len(table))
+    if couts:
+        for arrete, cout in couts.items():
+            position = table._position(arrete)
+            if position < 0:
+                raise ValueError(f"La canalisation {arrete} n'existe pas.")
+            couts_travaux[position] = cout
+    candidates = np.flatnonzero(~demandes & (table.origines != puit) & np.isfinite(couts_travaux))
+    origines = np.concatenate([table.origines, table.origines[candidates]])
+    destinations = np.concatenate([table.destinations, table.destinations[candidates]])
+    capacites = np.concatenate([table.valeurs, np.full(len(candidates), demande)])
+    couts_arcs = np.concatenate([np.zeros(len(table)), couts_travaux[candidates]])
+    try:
+        _, flots = flot_cout_minimal(len(table.sommets), origines, destinations, capacites,
+                                     couts_arcs, source, puit, demande)
+    except ValueError:
+        raise ValueError("Aucuns travaux ne permettent d'alimenter toutes les villes.") from None
+    ajouts = flots[len(table):]
+    sommets = table.sommets
+    return {
+        (sommets[table.origines[position]], sommets[table.destinations[position]]): ajout
+        for position, ajout in zip(candidates.tolist(), ajouts.tolist())
+        if ajout > 0
+    }
+
+
+def _modifie_reseau(probleme: Union[Probleme, "Solution"], creuse: bool = False) -> Union[pd.DataFrame, TableCreuse]:
     """
-    Modifie les capacités des arrêtes de façon à voir quel capacité mettre selon le flot maximal.
+    Augmente les capacités des canalisations selon les travaux planifiés par `planifie_travaux`.
+    
+    La table est renvoyée sous forme creuse si `creuse` vaut True.
     
     Exemple :
 >>> from Adduction_eau.algorithme import _modifie_reseau
@@ -65,28 +161,31 @@ def _modifie_reseau(probleme: Probleme) -> pd.DataFrame:
 |      | A  | B  | C  | D  | F  | E  | G  | H  | I  | J  | K  | L  |puit|
 |------|----|----|----|----|----|----|----|----|----|----|----|----|----|
 |source|15.0|15.0|15.0|10.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|
-| A    | 0.0| 0.0| 0.0| 0.0| 0.0|57.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|
+| A    | 0.0| 0.0| 0.0| 0.0| 0.0|20.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|
 | B    | 0.0| 0.0| 0.0| 0.0|10.0| 0.0| 7.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|
 | C    | 5.0| 0.0| 0.0| 0.0| 5.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|
 | D    | 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|10.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|
 | F    | 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 5.0| 0.0|15.0| 0.0| 0.0| 0.0| 0.0|
-| E    | 0.0| 0.0| 0.0| 0.0| 5.0| 0.0| 0.0|54.0|15.0| 0.0| 0.0| 0.0| 0.0|
+| E    | 0.0| 0.0| 0.0| 0.0| 5.0| 0.0| 0.0| 5.0|15.0| 0.0| 0.0| 0.0| 0.0|
 | G    | 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|15.0| 0.0| 0.0| 0.0| 0.0|
 | H    | 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 7.0| 0.0| 0.0| 0.0|
-| I    | 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|30.0|54.0| 0.0|
+| I    | 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|30.0|15.0| 0.0|
 | J    | 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|15.0|
 | K    | 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|10.0| 0.0| 0.0|20.0|
 | L    | 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|15.0|
     """
-    table = probleme.table_depart()
-    for depart, arrivee in probleme._recupere_noeuds_capacite_insuffisante():
-        table.loc[depart, arrivee] += 50
-    return table
+    solution = _en_solution(probleme)
+    table = solution.table_creuse.copie()
+    for arrete, ajout in solution.travaux.items():
+        table[arrete] += ajout
+    return table if creuse else table.en_dataframe()
 
 
-def ressort_table_apres_travaux(probleme: Probleme) -> pd.DataFrame:
+def ressort_table_apres_travaux(probleme: Union[Probleme, "Solution"], creuse: bool = False) -> Union[pd.DataFrame, TableCreuse]:
     """Ressort la table lorsque les travaux sont finis.
     
+    La table est renvoyée sous forme creuse si `creuse` vaut True.
+    
     Exemple :
 >>> from Adduction_eau import ressort_table_apres_travaux
 >>> from Adduction_eau import Probleme
@@ -128,7 +227,7 @@ def ressort_table_apres_travaux(probleme: Probleme) -> pd.DataFrame:
 | C    | 5.0| 0.0| 0.0| 0.0| 5.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|
 | D    | 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|10.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|
 | F    | 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 5.0| 0.0|15.0| 0.0| 0.0| 0.0| 0.0|
-| E    | 0.0| 0.0| 0.0| 0.0| 5.0| 0.0| 0.0| 7.0|15.0| 0.0| 0.0| 0.0| 0.0|
+| E    | 0.0| 0.0| 0.0| 0.0| 5.0| 0.0| 0.0| 5.0|15.0| 0.0| 0.0| 0.0| 0.0|
 | G    | 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|15.0| 0.0| 0.0| 0.0| 0.0|
 | H    | 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 7.0| 0.0| 0.0| 0.0|
 | I    | 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|30.0|15.0| 0.0|
@@ -136,18 +235,142 @@ def ressort_table_apres_travaux(probleme: Probleme) -> pd.DataFrame:
 | K    | 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|10.0| 0.0| 0.0|20.0|
 | L    | 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|15.0|
     """
-    table = _modifie_reseau(probleme)
-    flots_maximaux = _recupere_flots_maximaux(table)
-    for depart, arrivee in probleme._recupere_noeuds_capacite_insuffisante():
-        for arrete, capacite in flots_maximaux.items():
-            if (depart, arrivee) == arrete:
-                table.loc[depart, arrivee] = capacite
-                break
-    return table
+    table = _en_solution(probleme).table_finale
+    return table.copie() if creuse else table.en_dataframe()
+
+
+def _courbe(table: TableCreuse, capacites: np.ndarray, directions: np.ndarray, parametre_max: float,
+            nom: str, points: Union[int, List[float], None]) -> pd.DataFrame:
+    """Calcule la courbe du flot maximal lorsque les capacités valent `capacites + parametre * directions`."""
+    if "source" not in table.sommets or "puit" not in table.sommets:
+        raise ValueError("Le réseau doit comprendre une source et un puit.")
+    parametres, flots = flot_parametrique(
+        len(table.sommets), table.origines, table.destinations, capacites, directions,
+        table.numero("source"), table.numero("puit"), parametre_max
+    )
+    if points is not None:
+        valeurs = np.linspace(0., parametre_max, points) if isinstance(points, int) else np.asarray(points, dtype=np.float64)
+        parametres, flots = valeurs, np.interp(valeurs, parametres, flots)
+    return pd.DataFrame({nom: parametres, "flot": flots})
 
 
-def transforme_table(table: pd.DataFrame) -> List[Tuple[str, str, float]]:
-    """Transforme la table en liste de tuples.
+def courbe_flot_travaux(probleme: Union[Probleme, "Solution"], canalisations: List[Tuple[str, str]],
+                        ajout_max: float, points: Union[int, List[float]] = None) -> pd.DataFrame:
+    """Calcule l'eau livrée en fonction de la capacité ajoutée à chaque canalisation de `canalisations`.
+    
+    La courbe est affine par morceaux : ses points de rupture, pour un ajout de 0 à `ajout_max`,
+    sont calculés en un seul passage de flot paramétrique. Si `points` est donné (un nombre de
+    points régulièrement espacés ou une liste d'ajouts), la courbe est évaluée en ces points
+    sans nouveau calcul de flot.
+    
+    Exemple :
+>>> from Adduction_eau.algorithme import courbe_flot_travaux
+>>> from Adduction_eau import Probleme
+
+>>> probleme = Probleme.par_str(
+...    '''
+... source / A / 15
+... source / B / 15
+... source / C / 15
+... source / D / 10
+... C / A / 5
+... C / F / 5 
+... A / E / 7
+... B / F / 10
+... B / G / 7
+... D / G / 10
+... E / F / 5
+... E / H / 4
+... E / I / 15
+... F / G / 5
+... F / I / 15
+... G / I / 15
+... H / J / 7
+... I / K / 30
+... I / L / 4
+... K / J / 10
+... J / puit / 15
+... K / puit / 20
+... L / puit / 15
+... '''
+... )
+
+>>> courbe_flot_travaux(probleme, [("A", "E"), ("I", "L")], 20)
+   ajout  flot
+0    0.0  37.0
+1   12.0  49.0
+2   20.0  49.0
+    """
+    table = _en_solution(probleme).table_creuse
+    directions = np.zeros(len(table))
+    for arrete in canalisations:
+        position = table._position(arrete)
+        if position < 0:
+            raise ValueError(f"La canalisation {arrete} n'existe pas.")
+        directions[position] = 1.
+    return _courbe(table, table.valeurs, directions, ajout_max, "ajout", points)
+
+
+def courbe_flot_demande(probleme: Union[Probleme, "Solution"], facteur_max: float = 1.,
+                        points: Union[int, List[float]] = None) -> pd.DataFrame:
+    """Calcule l'eau livrée lorsque toutes les demandes des villes sont multipliées par un même facteur.
+    
+    Le facteur varie de 0 à `facteur_max` ; la courbe est calculée et évaluée comme pour
+    `courbe_flot_travaux`.
+    
+    Exemple :
+>>> from Adduction_eau.algorithme import courbe_flot_demande
+>>> from Adduction_eau import Probleme
+
+>>> probleme = Probleme.par_str(
+...    '''
+... source / A / 15
+... source / B / 15
+... source / C / 15
+... source / D / 10
+... C / A / 5
+... C / F / 5 
+... A / E / 7
+... B / F / 10
+... B / G / 7
+... D / G / 10
+... E / F / 5
+... E / H / 4
+... E / I / 15
+... F / G / 5
+... F / I / 15
+... G / I / 15
+... H / J / 7
+... I / K / 30
+... I / L / 4
+... K / J / 10
+... J / puit / 15
+... K / puit / 20
+... L / puit / 15
+... '''
+... )
+
+>>> courbe_flot_demande(probleme, 2)
+    facteur       flot
+0  0.000000   0.000000
+1  0.266667  13.333333
+2  0.933333  36.666667
+3  0.950000  37.000000
+4  2.000000  37.000000
+    """
+    table = _en_solution(probleme).table_creuse
+    if "puit" not in table.sommets:
+        raise ValueError("Le réseau doit comprendre une source et un puit.")
+    demandes = table.destinations == table.numero("puit")
+    capacites = np.where(demandes, 0., table.valeurs)
+    directions = np.where(demandes, table.valeurs, 0.)
+    return _courbe(table, capacites, directions, facteur_max, "facteur", points)
+
+
+def transforme_table(table: Union[pd.DataFrame, TableCreuse, "Solution"]) -> List[Tuple[str, str, float]]:
+    """Transforme la table (dense ou creuse) en liste de tuples.
+    
+    Pour une solution, c'est la table après travaux qui est transformée.
     
     Exemple :
 >>> from Adduction_eau import transforme_table
@@ -206,17 +429,20 @@ def transforme_table(table: pd.DataFrame) -> List[Tuple[str, str, float]]:
  ('K', 'puit', 20.0),
  ('L', 'puit', 15.0)]
     """
-    colonnes = list(table.loc[:])
-    lignes = list(table.index)
-    liste_tuple = list()
-    for ligne in lignes:
-        for colonne in colonnes:
-            if table.loc[ligne, colonne] != 0:
-                liste_tuple.append((ligne, colonne, table.loc[ligne, colonne]))
-    return liste_tuple
+    if isinstance(table, Solution):
+        table = table.table_finale
+    if isinstance(table, TableCreuse):
+        return table.aretes()
+    valeurs = table.to_numpy()
+    lignes, colonnes = np.nonzero(valeurs)
+    return list(zip(
+        table.index[lignes].tolist(),
+        table.columns[colonnes].tolist(),
+        valeurs[lignes, colonnes].tolist()
+    ))
 
 
-def _recupere_sommets(table: pd.DataFrame) -> nx.DiGraph:
+def _recupere_sommets(table: Union[pd.DataFrame, TableCreuse]) -> "nx.DiGraph":
     """Récupère les sommets afin de dessiner le graphe.
     
     Exemple :
@@ -257,13 +483,14 @@ def _recupere_sommets(table: pd.DataFrame) -> nx.DiGraph:
 >>> list(_recupere_sommets(probleme.table_depart()))
 ['source', 'A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'puit']
     """
+    import networkx as nx
     reseau = nx.DiGraph()
     reseau.add_weighted_edges_from(transforme_table(table), weight="capacite")
     return reseau
 
 
-def _recupere_flots_maximaux(table: pd.DataFrame) -> Dict[Tuple[str, str], float]:
-    """Fonction qui récupère les flots maximaux du graphe.
+def _recupere_flots_maximaux(table: Union[pd.DataFrame, TableCreuse]) -> Dict[Tuple[str, str], float]:
+    """Fonction qui récupère les flots maximaux du graphe à l'aide du moteur natif.
     
     Exemple :
 >>> from Adduction_eau.algorithme import _recupere_flots_maximaux
@@ -298,46 +525,90 @@ def _recupere_flots_maximaux(table: pd.DataFrame) -> Dict[Tuple[str, str], float
 ... )
 
 >>> _recupere_flots_maximaux(probleme.table_depart())
-{('source', 'A'): 2.0,
+{('source', 'A'): 7.0,
  ('source', 'B'): 15.0,
- ('source', 'C'): 10.0,
+ ('source', 'C'): 5.0,
  ('source', 'D'): 10.0,
  ('A', 'E'): 7.0,
  ('B', 'F'): 10.0,
  ('B', 'G'): 5.0,
- ('C', 'A'): 5.0,
+ ('C', 'A'): 0.0,
  ('C', 'F'): 5.0,
  ('D', 'G'): 10.0,
- ('E', 'F'): 0,
+ ('E', 'F'): 0.0,
  ('E', 'H'): 4.0,
  ('E', 'I'): 3.0,
- ('F', 'G'): 0,
+ ('F', 'G'): 0.0,
  ('F', 'I'): 15.0,
  ('G', 'I'): 15.0,
  ('H', 'J'): 4.0,
- ('I', 'K'): 30.0,
- ('I', 'L'): 3.0,
- ('J', 'puit'): 14.0,
- ('K', 'J'): 10.0,
+ ('I', 'K'): 29.0,
+ ('I', 'L'): 4.0,
+ ('J', 'puit'): 13.0,
+ ('K', 'J'): 9.0,
  ('K', 'puit'): 20.0,
- ('L', 'puit'): 3.0}
+ ('L', 'puit'): 4.0}
     """
-    _, repartition_flot = nx.maximum_flow(
-        flowG=_recupere_sommets(table),
-        _s="source",
-        _t="puit", 
-        capacity="capacite"
+    if not isinstance(table, TableCreuse):
+        table = TableCreuse.depuis_dataframe(table)
+    return _flots_en_dictionnaire(table, _graphe_residuel(table))
+
+
+def _resolution(table: TableCreuse, moteur: str = None) -> Tuple[GrapheResiduel, Dict[str, int]]:
+    """Calcule le flot maximal après élagage et découpage du réseau en sous-réseaux indépendants.
+    
+    Renvoie le graphe résiduel de toutes les arrêtes non nulles de la table, portant ce
+    flot maximal calculé par le moteur `moteur`, et le rapport d'élagage.
+    """
+    if "source" not in table.sommets or "puit" not in table.sommets:
+        raise ValueError("Le réseau doit comprendre une source et un puit.")
+    origines, destinations, capacites = table.non_nulles()
+    flots, rapport = flot_par_composantes(
+        len(table.sommets), origines, destinations, capacites, table.numero("source"), table.numero("puit"),
+        moteur=moteur
     )
-    liste_flots = {}
-    for cle, items in repartition_flot.items():
-        for item_1, poids_item_1 in items.items():
-            liste_flots[(cle, item_1)] = poids_item_1
-    return liste_flots
+    return GrapheResiduel(len(table.sommets), origines, destinations, capacites, flots), rapport
+
+
+def _graphe_residuel(table: TableCreuse) -> GrapheResiduel:
+    """Construit le graphe résiduel des arrêtes non nulles de la table et y calcule le flot maximal."""
+    return _resolution(table)[0]
+
+
+def _flots_par_canalisation(canalisations: Canalisations, graphe: GrapheResiduel) -> np.ndarray:
+    """Renvoie le flot de chaque canalisation, nul pour celles que remplace une occurrence suivante."""
+    flots = np.zeros(len(canalisations))
+    flots[canalisations.positions(graphe.origines, graphe.destinations)] = graphe.flots
+    return flots
 
 
-def recupere_ville_flot_maximal_faible(probleme: Probleme) -> List[Tuple[str, int]]:
+def _graphe_depuis_flots(table: TableCreuse, canalisations: Canalisations, flots: np.ndarray) -> GrapheResiduel:
+    """Construit le graphe résiduel des arrêtes non nulles de la table portant le flot de chaque canalisation."""
+    origines, destinations, capacites = table.non_nulles()
+    return GrapheResiduel(
+        len(table.sommets), origines, destinations, capacites,
+        np.asarray(flots)[canalisations.positions(origines, destinations)]
+    )
+
+
+def _flots_en_dictionnaire(table: TableCreuse, graphe: GrapheResiduel) -> Dict[Tuple[str, str], float]:
+    """Associe à chaque arrête du graphe, désignée par les noms de ses sommets, le flot qu'elle porte."""
+    sommets = table.sommets
+    return {
+        (sommets[depart], sommets[arrivee]): flot
+        for depart, arrivee, flot in zip(
+            graphe.origines.tolist(), graphe.destinations.tolist(), graphe.flots.tolist()
+        )
+    }
+
+
+def recupere_ville_flot_maximal_faible(probleme: Union[Probleme, "Solution"]) -> List[Tuple[str, int]]:
     """Récupère les villes dont le flot d'arrivée d'eau n'est pas maximal.
     
+    Une ville n'est comptée comme alimentée que si tous les flots maximaux la satisfont :
+    K, qui pourrait recevoir moins si J recevait plus, est donc signalée. Le résultat ne
+    dépend ni du moteur de calcul ni de l'ordre des canalisations.
+    
     Exemple :
 >>> from Adduction_eau.algorithme import recupere_ville_flot_maximal_faible
 >>> from Adduction_eau import Probleme
@@ -371,26 +642,92 @@ def recupere_ville_flot_maximal_faible(probleme: Probleme) -> List[Tuple[str, in
 ... )
 
 >>> recupere_ville_flot_maximal_faible(probleme)
-[('J', 15), ('L', 15)]
+[('J', 15), ('K', 20), ('L', 15)]
+    """
+    return list(_en_solution(probleme).villes_non_alimentees)
+
+
+def coupe_minimale(probleme: Union[Probleme, "Solution"]) -> Tuple[List[Tuple[str, str]], float, List[str]]:
+    """Renvoie la coupe minimale du réseau : ses canalisations, sa capacité et les villes du côté du puit.
+    
+    La coupe est lue directement dans le graphe résiduel du flot maximal : ses canalisations
+    vont d'un sommet encore atteignable depuis la source à un sommet qui ne l'est plus.
+    Elles sont saturées et leur capacité totale est la valeur du flot maximal ; augmenter
+    une autre canalisation ne peut pas, seul, augmenter l'eau livrée.
+    
+    Exemple :
+>>> from Adduction_eau.algorithme import coupe_minimale
+>>> from Adduction_eau import Probleme
+
+>>> probleme = Probleme.par_str(
+...    '''
+... source / A / 15
+... source / B / 15
+... source / C / 15
+... source / D / 10
+... C / A / 5
+... C / F / 5 
+... A / E / 7
+... B / F / 10
+... B / G / 7
+... D / G / 10
+... E / F / 5
+... E / H / 4
+... E / I / 15
+... F / G / 5
+... F / I / 15
+... G / I / 15
+... H / J / 7
+... I / K / 30
+... I / L / 4
+... K / J / 10
+... J / puit / 15
+... K / puit / 20
+... L / puit / 15
+... '''
+... )
+
+>>> coupe_minimale(probleme)
+([('source', 'B'), ('source', 'D'), ('A', 'E'), ('C', 'F')], 37.0, ['J', 'K', 'L'])
+    """
+    return _en_solution(probleme).coupe
+
+
+def _villes_non_alimentees(probleme: Probleme, table: TableCreuse, graphe: GrapheResiduel) -> List[Tuple[str, int]]:
+    """Renvoie les villes, avec leur demande, dont l'arrête vers le puit n'est pas saturée par tous les flots maximaux.
+    
+    La répartition du flot maximal entre les villes n'est pas unique : une ville n'est
+    comptée comme alimentée que si tous les flots maximaux la satisfont, ce qui ne
+    dépend ni du moteur de calcul ni de l'ordre des canalisations.
     """
     villes_non_alimentees = list()
-    reseau_flots = _recupere_flots_maximaux(probleme.table_depart())
     arretes = dict()
-    for initial, arrivee, capacite in probleme._reseau:
-        if arrivee == "puit":
+    canalisations = probleme._canalisations
+    if "puit" in canalisations.numeros:
+        for position in np.flatnonzero(canalisations.destinations == canalisations.numero("puit")).tolist():
+            initial, arrivee, capacite = canalisations[position]
             arretes[(initial, arrivee)] = capacite
+    alimentees = set()
+    if arretes:
+        demandes = np.flatnonzero(graphe.destinations == table.numero("puit"))
+        saturees = graphe.toujours_saturees(demandes, table.numero("puit"))
+        alimentees = {table.sommets[ville] for ville in graphe.origines[demandes[saturees]].tolist()}
             
     for canalisation_arrivee in arretes:
-        if arretes.get(canalisation_arrivee) != reseau_flots.get(canalisation_arrivee):
+        if canalisation_arrivee[0] not in alimentees:
             villes_non_alimentees.append(
                 (canalisation_arrivee[0], arretes.get(canalisation_arrivee))
             )
     return villes_non_alimentees
 
 
-def visualisation_graphe_flots_maximaux(table: pd.DataFrame) -> plt.plot:
+def visualisation_graphe_flots_maximaux(table: Union[pd.DataFrame, TableCreuse, "Solution"],
+                                        flots: Dict[Tuple[str, str], float] = None) -> "plt.plot":
     """Fonction afin de créer le graphe et visualiser les flots maximaux de ce dernier.
     
+    Les flots déjà calculés peuvent être passés par `flots`. Pour une solution,
+    c'est le réseau de départ et ses flots mémorisés qui sont dessinés.
+    
     Exemple :
 >>> from Adduction_eau import visualisation_graphe_flots_maximaux
 >>> from Adduction_eau import Probleme
@@ -426,6 +763,11 @@ def visualisation_graphe_flots_maximaux(table: pd.DataFrame) -> plt.plot:
 >>> visualisation_graphe_flots_maximaux(probleme.table_depart())
 
     """
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as mpatches
+    import networkx as nx
+    if isinstance(table, Solution):
+        table, flots = table.table_creuse, table.flots
     figure, repere = plt.subplots()
     point_rouge = mpatches.Patch(color="red")
     point_bleu = mpatches.Patch(color="blue")
@@ -433,7 +775,7 @@ def visualisation_graphe_flots_maximaux(table: pd.DataFrame) -> plt.plot:
     positions = nx.circular_layout(G=arretes)
     nx.draw_networkx(G=arretes, pos=positions, ax=repere)
     capacites = nx.get_edge_attributes(G=arretes, name="capacite")
-    liste_flots = _recupere_flots_maximaux(table)
+    liste_flots = _recupere_flots_maximaux(table) if flots is None else flots
     nx.draw_networkx_edge_labels(G=arretes, pos=positions, edge_labels=capacites,
                                 verticalalignment="top", horizontalalignment="right",
                                 font_color="blue")
@@ -441,4 +783,244 @@ def visualisation_graphe_flots_maximaux(table: pd.DataFrame) -> plt.plot:
                                 font_color = "red", verticalalignment="bottom",
                                 horizontalalignment="left")
     repere.legend((point_rouge, point_bleu), ("Flots", "Capacités"), fontsize="x-large")
-    repere.set_title("Graphe orienté avec capacités et flots", color="yellow");
\ No newline at end of file
+    repere.set_title("Graphe orienté avec capacités et flots", color="yellow");
+
+
+def _en_solution(probleme: Union[Probleme, "Solution"]) -> "Solution":
+    """Renvoie la solution mémorisée d'un problème, ou la solution elle-même."""
+    if isinstance(probleme, Solution):
+        return probleme
+    return Solution(probleme)
+
+
+class Solution:
+    """Résolution d'un problème dont chaque étape est calculée au premier accès puis réutilisée.
+    
+    Exemple :
+>>> from Adduction_eau import Probleme
+
+>>> probleme = Probleme.par_str(
+...    '''
+... source / A / 15
+... source / B / 15
+... source / C / 15
+... source / D / 10
+... C / A / 5
+... C / F / 5 
+... A / E / 7
+... B / F / 10
+... B / G / 7
+... D / G / 10
+... E / F / 5
+... E / H / 4
+... E / I / 15
+... F / G / 5
+... F / I / 15
+... G / I / 15
+... H / J / 7
+... I / K / 30
+... I / L / 4
+... K / J / 10
+... J / puit / 15
+... K / puit / 20
+... L / puit / 15
+... '''
+... )
+
+>>> solution = probleme.resoudre()
+>>> solution.villes_non_alimentees
+[('J', 15), ('K', 20), ('L', 15)]
+>>> solution.capacites_insuffisantes
+[('A', 'E'), ('E', 'H'), ('I', 'L')]
+>>> solution.travaux
+{('A', 'E'): 13.0, ('E', 'H'): 1.0, ('I', 'L'): 11.0}
+    """
+    def __init__(self, probleme: Probleme, moteur: str = None):
+        self.probleme = probleme
+        self.moteur = moteur
+        
+    
+    def __repr__(self) -> str:
+        """Renvoie le problème résolu."""
+        return f"Solution(probleme={self.probleme !r})"
+    
+    
+    def sauvegarde(self, chemin: str) -> None:
+        """Écrit le réseau, le flot maximal de chaque canalisation et le rapport d'élagage au format binaire.
+        
+        La solution relue par `Adduction_eau.stockage.charge_solution` ne recalcule pas le flot maximal.
+        """
+        from Adduction_eau.stockage import sauvegarde
+        sauvegarde(self, chemin)
+    
+    
+    @cached_property
+    def table_creuse(self) -> TableCreuse:
+        """Table de départ sous forme creuse."""
+        return self.probleme.table_creuse()
+    
+    
+    @cached_property
+    def table_depart(self) -> pd.DataFrame:
+        """Table de départ sous forme dense."""
+        return self.table_creuse.en_dataframe()
+    
+    
+    @cached_property
+    def _resolution(self) -> Tuple[GrapheResiduel, Dict[str, int]]:
+        """Graphe résiduel du réseau de départ après calcul du flot maximal, et rapport d'élagage.
+        
+        Avec un cache actif (voir `Adduction_eau.cache`), le flot de chaque canalisation est
+        rangé dans l'ordre canonique du réseau, si bien qu'un même réseau saisi dans un autre
+        ordre le retrouve. Aucun moteur ne tournant alors, le rapport relu dans le cache
+        n'a pas de durées de calcul (`moteurs` vide) et indique `cache`. La répartition
+        relue est celle du moteur qui l'a calculée ; la coupe et les villes non alimentées
+        n'en dépendent pas.
+        """
+        cache = cache_actif()
+        if cache is None:
+            return _resolution(self.table_creuse, self.moteur)
+        canalisations = self.probleme._canalisations
+        ordre = self.probleme._forme_canonique()[4]
+        cle = cache.cle(self.probleme, "flot", moteur=moteur_demande(self.moteur))
+        resultat = cache.lit(cle)
+        if resultat is None:
+            graphe, rapport = _resolution(self.table_creuse, self.moteur)
+            cache.ecrit(cle, (_flots_par_canalisation(canalisations, graphe)[ordre], {**rapport, "moteurs": dict()}))
+            return graphe, rapport
+        flots_canoniques, rapport = resultat
+        flots = np.empty(len(canalisations))
+        flots[ordre] = flots_canoniques
+        rapport["cache"] = True
+        return _graphe_depuis_flots(self.table_creuse, canalisations, flots), rapport
+    
+    
+    @cached_property
+    def graphe(self) -> GrapheResiduel:
+        """Graphe résiduel du réseau de départ, après calcul du flot maximal."""
+        return self._resolution[0]
+    
+    
+    @cached_property
+    def elagage(self) -> Dict[str, int]:
+        """Rapport d'élagage : sommets et canalisations retirés avant le calcul, sous-réseaux indépendants et durée de chaque moteur."""
+        return self._resolution[1]
+    
+    
+    @cached_property
+    def flots(self) -> Dict[Tuple[str, str], float]:
+        """Flots maximaux du réseau de départ."""
+        return _flots_en_dictionnaire(self.table_creuse, self.graphe)
+    
+    
+    @cached_property
+    def villes_non_alimentees(self) -> List[Tuple[str, int]]:
+        """Villes dont l'arrivée d'eau n'est pas saturée par tous les flots maximaux (voir `GrapheResiduel.toujours_saturees`)."""
+        return _villes_non_alimentees(self.probleme, self.table_creuse, self.graphe)
+    
+    
+    @cached_property
+    def coupe(self) -> Tuple[List[Tuple[str, str]], float, List[str]]:
+        """Coupe minimale du réseau de départ : canalisations, capacité et villes du côté du puit."""
+        table, graphe = self.table_creuse, self.graphe
+        source, puit = table.numero("source"), table.numero("puit")
+        aretes = graphe.coupe(source)
+        atteignables = graphe.atteignables(source)
+        sommets = table.sommets
+        canalisations = [
+            (sommets[depart], sommets[arrivee])
+            for depart, arrivee in zip(graphe.origines[aretes].tolist(), graphe.destinations[aretes].tolist())
+        ]
+        villes = graphe.origines[(graphe.destinations == puit)]
+        villes = [sommets[ville] for ville in villes[~atteignables[villes]].tolist()]
+        return canalisations, float(graphe.capacites[aretes].sum()), villes
+    
+    
+    @cached_property
+    def travaux(self) -> Dict[Tuple[str, str], float]:
+        """Augmentations de capacité de coût minimal permettant d'alimenter toutes les villes, lues dans le cache s'il est actif."""
+        cache = cache_actif()
+        if cache is None:
+            return planifie_travaux(self)
+        return cache.memorise(self.probleme, "travaux", lambda: planifie_travaux(self))
+    
+    
+    @cached_property
+    def capacites_insuffisantes(self) -> List[Tuple[str, str]]:
+        """Canalisations dont la capacité doit être augmentée."""
+        return list(self.travaux)
+    
+    
+    @cached_property
+    def table_finale(self) -> TableCreuse:
+        """Table après travaux sous forme creuse."""
+        return _modifie_reseau(self, creuse=True)
+    
+    
+    @cached_property
+    def apres_travaux(self) -> "Solution":
+        """Solution du réseau après travaux, dont le flot maximal repart de celui du réseau de départ."""
+        return _SolutionApresTravaux(self)
+    
+    
+    @cached_property
+    def flots_finaux(self) -> Dict[Tuple[str, str], float]:
+        """Flots maximaux du réseau après travaux."""
+        table = self.table_finale
+        return {
+            arrete: flot
+            for arrete, flot in self.apres_travaux.flots.items()
+            if table[arrete] != 0
+        }
+
+
+class _SolutionApresTravaux(Solution):
+    """Solution du réseau après travaux, calculée à partir du flot maximal du réseau de départ.
+    
+    Augmenter des capacités ne rend pas ce flot irréalisable : seuls les nouveaux chemins
+    sont cherchés. Une canalisation de capacité nulle n'étant pas dans le graphe de départ,
+    ses travaux imposent de recalculer le flot maximal.
+    
+    Exemple :
+>>> from Adduction_eau import Probleme
+>>> solution = Probleme([("source", "A", 10), ("A", "B", 4), ("A", "puit", 2), ("B", "puit", 6)]).resoudre()
+>>> solution.villes_non_alimentees
+[('B', 6)]
+>>> solution.apres_travaux.villes_non_alimentees
+[]
+>>> solution.apres_travaux.elagage["travaux"]
+True
+    """
+    def __init__(self, depart: Solution):
+        super().__init__(Probleme(transforme_table(depart.table_finale)), depart.moteur)
+        self.depart = depart
+    
+    
+    @cached_property
+    def table_creuse(self) -> TableCreuse:
+        """Table après travaux du réseau de départ, dont elle garde la numérotation des sommets."""
+        return self.depart.table_finale
+    
+    
+    @cached_property
+    def _resolution(self) -> Tuple[GrapheResiduel, Dict[str, int]]:
+        """Graphe résiduel du réseau de départ portant son flot maximal, agrandi puis complété.
+        
+        Aucun moteur ne tournant, le rapport est celui du réseau de départ, sans durées
+        de calcul (`moteurs` vide), et indique `travaux`.
+        """
+        depart, table = self.depart, self.table_creuse
+        graphe = depart.graphe.copie()
+        positions = {
+            arrete: position
+            for position, arrete in enumerate(zip(graphe.origines.tolist(), graphe.destinations.tolist()))
+        }
+        aretes = [
+            positions.get((table.numero(initial), table.numero(arrivee)), -1)
+            for initial, arrivee in depart.travaux
+        ]
+        if -1 in aretes:
+            return _resolution(table, self.moteur)
+        graphe.augmente_capacites(aretes, list(depart.travaux.values()))
+        graphe.pousse(table.numero("source"), table.numero("puit"))
+        return graphe, {**depart.elagage, "moteurs": dict(), "travaux": True}
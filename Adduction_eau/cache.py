@@ -0,0 +1,162 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Cache persistant des résultats dans une base SQLite. Une entrée est désignée par
+l'empreinte du réseau (`Probleme.empreinte`, indépendante de l'ordre des
+canalisations), le nom du calcul et ses paramètres ; son contenu est picklé. Quand
+la base dépasse sa taille ou son nombre d'entrées maximal, les entrées utilisées le
+moins récemment sont effacées. Le cache n'est utilisé que s'il est configuré par
+`configure_cache` ou par la variable d'environnement ADDUCTION_EAU_CACHE, qui donne
+le chemin de la base.
+
+Fonctions principales :
+- configure_cache
+- cache_actif
+
+Classe :
+- CacheResultats
+"""
+
+from typing import Any, Callable, Dict, Iterator, Optional, Union
+from contextlib import closing, contextmanager
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+from Adduction_eau.probleme import Probleme
+
+
+VERSION = 1
+TAILLE_MAX = 512 * 2 ** 20
+_CACHE_CONFIGURE = None
+_CACHES_OUVERTS: Dict[str, "CacheResultats"] = dict()
+
+
+class CacheResultats:
+    """Cache LRU de résultats stocké dans une base SQLite, borné en octets et en nombre d'entrées.
+
+    Exemple :
+>>> import os, tempfile
+>>> from Adduction_eau import Probleme
+>>> from Adduction_eau.cache import CacheResultats
+>>> cache = CacheResultats(os.path.join(tempfile.mkdtemp(), "cache.sqlite"))
+>>> probleme = Probleme([("source", "A", 15), ("A", "puit", 10)])
+>>> cache.memorise(probleme, "somme", lambda: 25, unite="m3")
+25
+>>> cache.memorise(Probleme([("A", "puit", 10), ("source", "A", 15)]), "somme", lambda: 0, unite="m3")
+25
+>>> len(cache)
+1
+    """
+    def __init__(self, chemin: Union[str, os.PathLike], taille_max: int = TAILLE_MAX, entrees_max: int = None):
+        self.chemin = os.fspath(chemin)
+        self.taille_max = taille_max
+        self.entrees_max = entrees_max
+        with self._transaction() as connexion:
+            connexion.execute(
+                "CREATE TABLE IF NOT EXISTS resultats "
+                "(cle TEXT PRIMARY KEY, valeur BLOB NOT NULL, taille INTEGER NOT NULL, acces INTEGER NOT NULL)"
+            )
+            connexion.execute("CREATE INDEX IF NOT EXISTS resultats_acces ON resultats (acces)")
+
+
+    def __repr__(self) -> str:
+        """Renvoie le chemin et les bornes du cache."""
+        return f"CacheResultats(chemin={self.chemin!r}, taille_max={self.taille_max}, entrees_max={self.entrees_max})"
+
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Ouvre une connexion dont les modifications sont validées à la sortie, puis la ferme."""
+        with closing(sqlite3.connect(self.chemin, timeout=60)) as connexion:
+            with connexion:
+                yield connexion
+
+
+    def __len__(self) -> int:
+        """Renvoie le nombre d'entrées."""
+        with self._transaction() as connexion:
+            return connexion.execute("SELECT COUNT(*) FROM resultats").fetchone()[0]
+
+
+    @property
+    def taille(self) -> int:
+        """Renvoie la taille totale des entrées en octets."""
+        with self._transaction() as connexion:
+            return connexion.execute("SELECT COALESCE(SUM(taille), 0) FROM resultats").fetchone()[0]
+
+
+    @staticmethod
+    def cle(probleme: Probleme, calcul: str, **parametres: Any) -> str:
+        """Renvoie la clé d'un calcul : l'empreinte du réseau, le nom du calcul et ses paramètres."""
+        description = json.dumps([VERSION, probleme.empreinte(), calcul, parametres], sort_keys=True, default=repr)
+        return hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+
+    def lit(self, cle: str, defaut: Any = None) -> Any:
+        """Renvoie le résultat de la clé, marqué comme le plus récemment utilisé, ou `defaut`."""
+        with self._transaction() as connexion:
+            ligne = connexion.execute("SELECT valeur FROM resultats WHERE cle = ?", (cle,)).fetchone()
+            if ligne is None:
+                return defaut
+            connexion.execute(
+                "UPDATE resultats SET acces = (SELECT MAX(acces) + 1 FROM resultats) WHERE cle = ?", (cle,)
+            )
+        return pickle.loads(ligne[0])
+
+
+    def ecrit(self, cle: str, valeur: Any) -> None:
+        """Enregistre le résultat de la clé puis efface les entrées les moins récemment utilisées en trop."""
+        donnees = pickle.dumps(valeur, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(donnees) > self.taille_max:
+            return
+        with self._transaction() as connexion:
+            connexion.execute(
+                "INSERT OR REPLACE INTO resultats (cle, valeur, taille, acces) "
+                "VALUES (?, ?, ?, (SELECT COALESCE(MAX(acces), 0) + 1 FROM resultats))",
+                (cle, donnees, len(donnees))
+            )
+            connexion.execute(
+                "DELETE FROM resultats WHERE cle IN (SELECT cle FROM ("
+                "SELECT cle, SUM(taille) OVER (ORDER BY acces DESC) AS cumul, "
+                "ROW_NUMBER() OVER (ORDER BY acces DESC) AS rang FROM resultats"
+                ") WHERE cumul > ? OR rang > ?)",
+                (self.taille_max, self.entrees_max if self.entrees_max is not None else 2 ** 62)
+            )
+
+
+    def memorise(self, probleme: Probleme, calcul: str, calcule: Callable[[], Any], **parametres: Any) -> Any:
+        """Renvoie le résultat du calcul s'il est dans le cache, sinon le calcule avec `calcule` et l'enregistre."""
+        cle = self.cle(probleme, calcul, **parametres)
+        absent = object()
+        resultat = self.lit(cle, absent)
+        if resultat is absent:
+            resultat = calcule()
+            self.ecrit(cle, resultat)
+        return resultat
+
+
+    def vide(self) -> None:
+        """Efface toutes les entrées."""
+        with self._transaction() as connexion:
+            connexion.execute("DELETE FROM resultats")
+
+
+def configure_cache(chemin: Union[str, os.PathLike] = None, taille_max: int = TAILLE_MAX, entrees_max: int = None) -> None:
+    """Active le cache persistant dans la base `chemin` ; None rend la main à la variable d'environnement ADDUCTION_EAU_CACHE."""
+    global _CACHE_CONFIGURE
+    _CACHE_CONFIGURE = None if chemin is None else CacheResultats(chemin, taille_max, entrees_max)
+
+
+def cache_actif() -> Optional[CacheResultats]:
+    """Renvoie le cache configuré, sinon celui de la base donnée par ADDUCTION_EAU_CACHE, ou None."""
+    if _CACHE_CONFIGURE is not None:
+        return _CACHE_CONFIGURE
+    chemin = os.environ.get("ADDUCTION_EAU_CACHE")
+    if not chemin:
+        return None
+    if chemin not in _CACHES_OUVERTS:
+        _CACHES_OUVERTS[chemin] = CacheResultats(chemin)
+    return _CACHES_OUVERTS[chemin]
@@ -0,0 +1,127 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Classe Canalisations permettant de stocker les canalisations d'un réseau sous
+forme de tableaux typés, les noms des sommets étant remplacés par des numéros.
+"""
+
+from typing import Iterable, Iterator, List, Tuple, Union
+import numpy as np
+
+
+class Canalisations:
+    """Stockage compact des canalisations d'un réseau.
+
+    Chaque nom de sommet est numéroté une seule fois, dans son ordre d'apparition.
+    La canalisation `k` va de `noms[origines[k]]` à `noms[destinations[k]]` avec la
+    capacité `capacites[k]`; `entieres[k]` indique si la capacité a été saisie
+    comme un entier.
+
+    Exemple :
+>>> from Adduction_eau.canalisations import Canalisations
+>>> canalisations = Canalisations.depuis_tuples([("source", "A", 10), ("A", "puit", 2.5)])
+>>> canalisations.numero("A"), canalisations.nom(2)
+(1, 'puit')
+>>> canalisations.origines, canalisations.capacites
+(array([0, 1], dtype=int32), array([10. ,  2.5]))
+>>> canalisations.tuples()
+[('source', 'A', 10), ('A', 'puit', 2.5)]
+    """
+    __slots__ = ("noms", "numeros", "origines", "destinations", "capacites", "entieres")
+
+    def __init__(self, noms: List[str], origines, destinations, capacites, entieres=None):
+        self.noms = list(noms)
+        self.numeros = {nom: numero for numero, nom in enumerate(self.noms)}
+        self.origines = np.asarray(origines, dtype=np.int32)
+        self.destinations = np.asarray(destinations, dtype=np.int32)
+        self.capacites = np.asarray(capacites, dtype=np.float64)
+        if entieres is None:
+            entieres = np.zeros(len(self.capacites), dtype=bool)
+        self.entieres = np.asarray(entieres, dtype=bool)
+
+
+    @classmethod
+    def depuis_tuples(cls, reseau: Iterable[Tuple[str, str, Union[int, float]]]) -> "Canalisations":
+        """Construit le stockage à partir d'une liste de tuples (départ, arrivée, capacité)."""
+        numeros = dict()
+        origines, destinations, capacites, entieres = list(), list(), list(), list()
+        for initial, arrivee, capacite in reseau:
+            origines.append(numeros.setdefault(initial, len(numeros)))
+            destinations.append(numeros.setdefault(arrivee, len(numeros)))
+            capacites.append(capacite)
+            entieres.append(isinstance(capacite, (int, np.integer)))
+        return cls(list(numeros), origines, destinations, capacites, entieres)
+
+
+    def __len__(self) -> int:
+        """Renvoie le nombre de canalisations."""
+        return len(self.capacites)
+
+
+    def __getitem__(self, position: int) -> Tuple[str, str, Union[int, float]]:
+        """Renvoie la canalisation `position` sous forme de tuple."""
+        capacite = self.capacites[position].item()
+        if self.entieres[position]:
+            capacite = int(capacite)
+        return (self.noms[self.origines[position]], self.noms[self.destinations[position]], capacite)
+
+
+    def __iter__(self) -> Iterator[Tuple[str, str, Union[int, float]]]:
+        """Parcourt les canalisations sous forme de tuples."""
+        noms = self.noms
+        for initial, arrivee, capacite, entiere in zip(
+            self.origines.tolist(), self.destinations.tolist(),
+            self.capacites.tolist(), self.entieres.tolist()
+        ):
+            yield (noms[initial], noms[arrivee], int(capacite) if entiere else capacite)
+
+
+    def tuples(self) -> List[Tuple[str, str, Union[int, float]]]:
+        """Renvoie la vue historique du réseau : une liste de tuples (départ, arrivée, capacité)."""
+        return list(self)
+
+
+    def numero(self, nom: str) -> int:
+        """Renvoie le numéro d'un sommet à partir de son nom."""
+        return self.numeros[nom]
+
+
+    def nom(self, numero: int) -> str:
+        """Renvoie le nom d'un sommet à partir de son numéro."""
+        return self.noms[numero]
+
+
+    def dernieres_occurrences(self) -> np.ndarray:
+        """Renvoie, dans l'ordre, la position de la dernière occurrence de chaque couple (départ, arrivée)."""
+        cles = self.origines.astype(np.int64) * max(len(self.noms), 1) + self.destinations
+        _, positions_inversees = np.unique(cles[::-1], return_index=True)
+        return np.sort(len(cles) - 1 - positions_inversees)
+
+
+    def positions(self, origines, destinations) -> np.ndarray:
+        """Renvoie la position de la dernière occurrence de chaque couple (départ, arrivée) donné par numéros, ou -1.
+
+        Exemple :
+>>> from Adduction_eau.canalisations import Canalisations
+>>> canalisations = Canalisations.depuis_tuples([("source", "A", 10), ("A", "puit", 2), ("source", "A", 12)])
+>>> canalisations.positions([0, 1, 2], [1, 2, 0])
+array([ 2,  1, -1])
+        """
+        origines = np.asarray(origines, dtype=np.int64)
+        cherchees = origines * max(len(self.noms), 1) + np.asarray(destinations, dtype=np.int64)
+        gardees = self.dernieres_occurrences()
+        if len(gardees) == 0:
+            return np.full(len(cherchees), -1, dtype=np.int64)
+        cles = self.origines[gardees].astype(np.int64) * max(len(self.noms), 1) + self.destinations[gardees]
+        ordre = np.argsort(cles)
+        rangs = np.minimum(np.searchsorted(cles[ordre], cherchees), len(cles) - 1)
+        trouvees = gardees[ordre[rangs]]
+        return np.where(cles[ordre[rangs]] == cherchees, trouvees, -1)
+
+
+    @property
+    def nombre_sommets(self) -> int:
+        """Renvoie le nombre de sommets distincts."""
+        return len(self.noms)
+
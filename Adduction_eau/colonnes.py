@@ -0,0 +1,178 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Lecture et écriture des réseaux et des résultats en colonnes Arrow ou Parquet. Les
+canalisations sont lues directement depuis les colonnes choisies, sans passer par
+des chaines "A / B / c" ni par des tuples Python : seuls les noms distincts des
+sommets deviennent des objets Python. Les autres colonnes (diamètre, longueur,
+matériau, zone...) restent des colonnes Arrow et suivent les canalisations
+jusqu'aux résultats. Ces fonctions demandent pyarrow, importé à la première
+utilisation.
+
+Fonctions principales :
+- depuis_arrow
+- lit_parquet
+- table_resultats
+- ecrit_parquet
+
+Fonctions secondaires :
+- _pyarrow
+- _tableau
+- _travaux_par_canalisation
+"""
+
+from typing import List, Union
+import os
+import numpy as np
+import pandas as pd
+from Adduction_eau.algorithme import Solution, _en_solution, _flots_par_canalisation
+from Adduction_eau.canalisations import Canalisations
+from Adduction_eau.probleme import Probleme
+
+
+def _pyarrow():
+    """Renvoie le module pyarrow, ou explique comment l'installer."""
+    try:
+        import pyarrow
+        import pyarrow.compute
+    except ImportError:
+        raise ImportError("La lecture et l'écriture en colonnes Arrow/Parquet demandent pyarrow : pip install pyarrow") from None
+    return pyarrow
+
+
+def _tableau(table, colonne: str):
+    """Renvoie une colonne de la table, en vérifiant qu'elle existe et qu'aucune valeur n'y manque."""
+    if colonne not in table.column_names:
+        raise ValueError(f"La colonne {colonne!r} n'existe pas ; colonnes disponibles : {table.column_names}.")
+    valeurs = table.column(colonne)
+    if valeurs.null_count:
+        ligne = int(np.flatnonzero(valeurs.is_null().to_numpy())[0]) + 1
+        raise ValueError(f"La colonne {colonne!r} n'a pas de valeur à la ligne {ligne}.")
+    return valeurs
+
+
+def depuis_arrow(table, initial: str = "initial", arrivee: str = "arrivee", capacite: str = "capacite",
+                 attributs: List[str] = None) -> Probleme:
+    """Construit un problème à partir d'une table Arrow (ou de tout objet accepté par `pyarrow.table`).
+
+    Les sommets sont numérotés dans leur ordre d'apparition, comme pour `Probleme.par_str`,
+    et une capacité de type entier est gardée entière. Les colonnes `attributs`, par défaut
+    toutes les colonnes autres que les trois premières, sont gardées dans `Probleme.attributs`
+    sous forme de dataframe adossé aux tableaux Arrow.
+
+    Exemple :
+>>> import pyarrow as pa
+>>> from Adduction_eau.colonnes import depuis_arrow
+>>> probleme = depuis_arrow(pa.table({
+...     "initial": ["source", "A"], "arrivee": ["A", "puit"], "capacite": [15, 10], "diametre": [300, 200]
+... }))
+>>> probleme
+Probleme(reseau=[('source', 'A', 15), ('A', 'puit', 10)])
+>>> probleme.attributs
+   diametre
+0       300
+1       200
+    """
+    pa = _pyarrow()
+    table = pa.table(table)
+    departs, arrivees = _tableau(table, initial), _tableau(table, arrivee)
+    capacites = _tableau(table, capacite)
+    nb_canalisations = len(table)
+
+    extremites = pa.chunked_array(
+        departs.cast(pa.large_string()).chunks + arrivees.cast(pa.large_string()).chunks, type=pa.large_string()
+    )
+    distincts = pa.compute.unique(extremites)
+    codes = pa.compute.index_in(extremites, value_set=distincts).to_numpy().astype(np.int64)
+    entrelaces = np.column_stack([codes[:nb_canalisations], codes[nb_canalisations:]]).ravel()
+    _, premieres = np.unique(entrelaces, return_index=True)
+    ordre = np.argsort(premieres)
+    rangs = np.empty(len(ordre), dtype=np.int64)
+    rangs[ordre] = np.arange(len(ordre))
+
+    if attributs is None:
+        attributs = [colonne for colonne in table.column_names if colonne not in (initial, arrivee, capacite)]
+    return Probleme(Canalisations(
+        distincts.take(pa.array(ordre)).to_pylist(),
+        rangs[codes[:nb_canalisations]],
+        rangs[codes[nb_canalisations:]],
+        capacites.to_numpy().astype(np.float64, copy=False),
+        np.full(nb_canalisations, pa.types.is_integer(capacites.type), dtype=bool)
+    ), table.select(attributs).to_pandas(types_mapper=pd.ArrowDtype) if attributs else None)
+
+
+def lit_parquet(chemin: Union[str, os.PathLike], initial: str = "initial", arrivee: str = "arrivee",
+                capacite: str = "capacite", attributs: List[str] = None) -> Probleme:
+    """Construit un problème à partir d'un fichier Parquet, projeté en mémoire.
+
+    Avec `attributs`, seules les colonnes utiles sont lues ; sinon toutes les colonnes
+    sont lues et les autres colonnes sont gardées comme attributs (voir `depuis_arrow`).
+    """
+    _pyarrow()
+    import pyarrow.parquet as pq
+    colonnes = None if attributs is None else [initial, arrivee, capacite, *attributs]
+    return depuis_arrow(pq.read_table(chemin, columns=colonnes, memory_map=True), initial, arrivee, capacite, attributs)
+
+
+def _travaux_par_canalisation(solution: Solution) -> np.ndarray:
+    """Renvoie l'augmentation de capacité de chaque canalisation, nulle pour celles que remplace une occurrence suivante."""
+    canalisations = solution.probleme._canalisations
+    travaux = np.zeros(len(canalisations))
+    if solution.travaux:
+        positions = canalisations.positions(
+            [canalisations.numero(depart) for depart, _ in solution.travaux],
+            [canalisations.numero(arrivee) for _, arrivee in solution.travaux]
+        )
+        travaux[positions] = list(solution.travaux.values())
+    return travaux
+
+
+def table_resultats(probleme: Union[Probleme, Solution], travaux: bool = True):
+    """Renvoie une table Arrow des résultats, une ligne par canalisation dans l'ordre du problème.
+
+    Colonnes : initial et arrivee (encodées par dictionnaire des noms de sommets), capacite,
+    flot, sature (flot égal à une capacité non nulle) puis, avec `travaux`, l'augmentation
+    de capacité de coût minimal et la capacite_finale, suivies des attributs du problème.
+    Une canalisation remplacée par une occurrence suivante porte un flot nul.
+
+    Exemple :
+>>> from Adduction_eau import Probleme
+>>> from Adduction_eau.colonnes import table_resultats
+>>> probleme = Probleme([("source", "A", 15), ("A", "puit", 10), ("source", "puit", 2)])
+>>> table_resultats(probleme).drop_columns(["initial", "arrivee"]).to_pandas()
+   capacite  flot  sature  travaux  capacite_finale
+0      15.0  10.0   False      0.0             15.0
+1      10.0  10.0    True      0.0             10.0
+2       2.0   2.0    True      0.0              2.0
+    """
+    pa = _pyarrow()
+    solution = _en_solution(probleme)
+    canalisations = solution.probleme._canalisations
+    noms = pa.array(canalisations.noms, type=pa.string())
+    capacites = canalisations.capacites
+    flots = _flots_par_canalisation(canalisations, solution.graphe)
+    colonnes = {
+        "initial": pa.DictionaryArray.from_arrays(canalisations.origines, noms),
+        "arrivee": pa.DictionaryArray.from_arrays(canalisations.destinations, noms),
+        "capacite": capacites,
+        "flot": flots,
+        "sature": (capacites > 0) & (flots >= capacites - 1e-9),
+    }
+    if travaux:
+        colonnes["travaux"] = _travaux_par_canalisation(solution)
+        colonnes["capacite_finale"] = capacites + colonnes["travaux"]
+    resultats = pa.table(colonnes)
+    attributs = solution.probleme.attributs
+    if attributs is not None:
+        attributs = pa.Table.from_pandas(attributs, preserve_index=False)
+        for nom, colonne in zip(attributs.column_names, attributs.columns):
+            resultats = resultats.append_column(nom, colonne)
+    return resultats
+
+
+def ecrit_parquet(probleme: Union[Probleme, Solution], chemin: Union[str, os.PathLike], travaux: bool = True) -> None:
+    """Écrit la table des résultats (voir `table_resultats`) dans un fichier Parquet."""
+    _pyarrow()
+    import pyarrow.parquet as pq
+    pq.write_table(table_resultats(probleme, travaux), chemin)
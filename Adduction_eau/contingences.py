@@ -0,0 +1,94 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Analyse de contingence N-1 : pour chaque canalisation, on calcule l'eau perdue par
+les villes lorsque cette seule canalisation casse. Chaque calcul repart du flot
+maximal du réseau intact et ne déplace que le flot de la canalisation cassée.
+
+Fonctions principales :
+- analyse_contingences
+
+Fonctions secondaires :
+- _resout_panne
+"""
+
+from typing import Dict
+from Adduction_eau import Probleme
+from Adduction_eau.flot import GrapheResiduel
+from Adduction_eau.parallele import execute_en_parallele, graphe_partage
+import numpy as np
+import pandas as pd
+
+
+def _resout_panne(tableaux: Dict[str, np.ndarray], arete: int) -> np.ndarray:
+    """Renvoie l'eau reçue par chaque ville lorsque l'arrête `arete` est cassée."""
+    _, source, puit = tableaux["parametres"].tolist()
+    graphe = graphe_partage(tableaux).copie()
+    graphe.modifie_capacite(arete, 0., source, puit)
+    graphe.pousse(source, puit)
+    return graphe.flots[tableaux["demandes"]]
+
+
+def analyse_contingences(probleme: Probleme, processus: int = None) -> pd.DataFrame:
+    """Classe les canalisations selon l'eau perdue par les villes lorsqu'elles cassent.
+
+    Les arrêtes vers le puit représentent la demande des villes et ne sont pas
+    considérées comme des canalisations. Une canalisation ne portant aucun flot ne
+    change rien en cassant. Les autres pannes sont réparties sur `processus`
+    processus (tous les cœurs par défaut).
+
+    Renvoie une table, triée de la panne la plus grave à la moins grave, avec pour
+    chaque canalisation son flot dans le réseau intact, l'eau perdue, les villes dont
+    l'alimentation baisse et les villes non alimentées après la panne.
+
+    Exemple :
+>>> from Adduction_eau import Probleme
+>>> from Adduction_eau.contingences import analyse_contingences
+>>> probleme = Probleme([("source", "A", 10), ("source", "B", 4), ("A", "B", 3),
+...                      ("A", "puit", 6), ("B", "puit", 6)])
+>>> analyse_contingences(probleme, processus=1)
+   depart arrivee  flot  perte villes_privees villes_non_alimentees
+0  source       A   8.0    8.0         [A, B]                [A, B]
+1  source       B   4.0    3.0            [B]                   [B]
+2       A       B   2.0    2.0            [B]                   [B]
+    """
+    table = probleme.table_creuse()
+    if "source" not in table.sommets or "puit" not in table.sommets:
+        raise ValueError("Le réseau doit comprendre une source et un puit.")
+    source, puit = table.numero("source"), table.numero("puit")
+    origines, destinations, capacites = table.non_nulles()
+    graphe = GrapheResiduel(len(table.sommets), origines, destinations, capacites)
+    graphe.pousse(source, puit)
+    flots = graphe.flots
+    demandes = np.flatnonzero(destinations == puit)
+    canalisations = np.flatnonzero(destinations != puit)
+    pannes = canalisations[flots[canalisations] > 0]
+    tableaux = {
+        "origines": origines,
+        "destinations": destinations,
+        "capacites": capacites,
+        "flots": flots,
+        "demandes": demandes,
+        "parametres": np.array([len(table.sommets), source, puit], dtype=np.int64),
+    }
+    recues = np.tile(flots[demandes], (len(canalisations), 1))
+    rangs = np.searchsorted(canalisations, pannes)
+    for rang, resultat in zip(rangs.tolist(), execute_en_parallele(_resout_panne, tableaux, pannes.tolist(), processus)):
+        recues[rang] = resultat
+
+    sommets = table.sommets
+    villes = np.array([sommets[ville] for ville in origines[demandes].tolist()], dtype=object)
+    privees = recues < flots[demandes] - 1e-9
+    non_alimentees = recues < capacites[demandes] - 1e-9
+    resultats = pd.DataFrame({
+        "depart": [sommets[sommet] for sommet in origines[canalisations].tolist()],
+        "arrivee": [sommets[sommet] for sommet in destinations[canalisations].tolist()],
+        "flot": flots[canalisations],
+        "perte": (flots[demandes] - recues).sum(axis=1),
+        "villes_privees": [villes[masque].tolist() for masque in privees],
+        "villes_non_alimentees": [villes[masque].tolist() for masque in non_alimentees],
+    })
+    resultats["nb_villes"] = privees.sum(axis=1)
+    resultats = resultats.sort_values(["perte", "nb_villes", "flot"], ascending=False, kind="stable")
+    return resultats.drop(columns="nb_villes").reset_index(drop=True)
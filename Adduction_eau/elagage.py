@@ -0,0 +1,166 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Préparation du réseau avant le calcul du flot maximal : les canalisations qui ne
+peuvent porter aucun flot utile (branches mortes qui n'atteignent pas le puit,
+parties que la source n'alimente pas) sont élaguées, puis le reste est découpé en
+sous-réseaux indépendants qui ne partagent que la source et le puit. Chaque
+sous-réseau est résolu séparément par le moteur choisi, en parallèle pour les
+grands réseaux.
+
+Fonctions principales :
+- elague
+- decompose
+- flot_par_composantes
+
+Fonctions secondaires :
+- _resout_composante
+"""
+
+from typing import Dict, Tuple
+from Adduction_eau.flot import GrapheResiduel
+from Adduction_eau.moteurs import calcule_flot, moteur_demande
+from Adduction_eau.parallele import GroupeDeCalcul
+import numpy as np
+
+
+SEUIL_PARALLELE = 200_000
+
+
+def elague(nb_sommets: int, origines, destinations, source: int, puit: int) -> np.ndarray:
+    """Indique les arrêtes dont l'origine est atteignable depuis la source et dont la destination atteint le puit.
+
+    Les autres arrêtes ne font partie d'aucun chemin de la source au puit : un flot
+    maximal peut toujours leur donner un flot nul.
+
+    Exemple :
+>>> from Adduction_eau.elagage import elague
+>>> elague(5, [0, 1, 0, 3], [1, 4, 2, 2], 0, 4)
+array([ True,  True, False, False])
+    """
+    origines = np.asarray(origines, dtype=np.int64)
+    destinations = np.asarray(destinations, dtype=np.int64)
+    uns = np.ones(len(origines))
+    depuis_source = GrapheResiduel(nb_sommets, origines, destinations, uns).atteignables(source)
+    vers_puit = GrapheResiduel(nb_sommets, destinations, origines, uns).atteignables(puit)
+    return depuis_source[origines] & vers_puit[destinations]
+
+
+def decompose(nb_sommets: int, origines, destinations, source: int, puit: int) -> np.ndarray:
+    """Numérote les sous-réseaux reliés entre eux autrement que par la source ou le puit.
+
+    Renvoie le numéro de sous-réseau de chaque arrête, de 0 au nombre de sous-réseaux
+    moins un. Les arrêtes allant directement de la source au puit forment chacune leur
+    propre sous-réseau.
+
+    Exemple :
+>>> from Adduction_eau.elagage import decompose
+>>> decompose(6, [0, 1, 0, 2, 3, 0], [1, 5, 2, 3, 5, 5], 0, 5)
+array([0, 0, 1, 1, 1, 2])
+    """
+    parents = list(range(nb_sommets))
+
+    def racine(sommet: int) -> int:
+        while parents[sommet] != sommet:
+            parents[sommet] = parents[parents[sommet]]
+            sommet = parents[sommet]
+        return sommet
+
+    extremites = (source, puit)
+    for depart, arrivee in zip(np.asarray(origines).tolist(), np.asarray(destinations).tolist()):
+        if depart not in extremites and arrivee not in extremites:
+            parents[racine(depart)] = racine(arrivee)
+    representants = list()
+    for numero, (depart, arrivee) in enumerate(zip(np.asarray(origines).tolist(), np.asarray(destinations).tolist())):
+        if depart not in extremites:
+            representants.append(racine(depart))
+        elif arrivee not in extremites:
+            representants.append(racine(arrivee))
+        else:
+            representants.append(nb_sommets + numero)
+    _, composantes = np.unique(np.array(representants, dtype=np.int64), return_inverse=True)
+    return composantes.reshape(-1)
+
+
+def _resout_composante(tableaux: Dict[str, np.ndarray], tache: Tuple[int, int, str]) -> Tuple[np.ndarray, Dict[str, float]]:
+    """Calcule le flot maximal d'un sous-réseau, dont les arrêtes occupent les positions `debut` à `fin` exclu.
+
+    Le moteur est choisi par `calcule_flot` ; avec le choix automatique, un sous-réseau
+    série-parallèle, comme un arbre, est résolu en temps linéaire par réduction.
+    """
+    debut, fin, moteur = tache
+    source, puit = tableaux["parametres"].tolist()
+    origines = tableaux["origines"][debut:fin]
+    destinations = tableaux["destinations"][debut:fin]
+    sommets, locaux = np.unique(np.concatenate([[source, puit], origines, destinations]), return_inverse=True)
+    locaux = locaux.reshape(-1)
+    return calcule_flot(
+        len(sommets), locaux[2:2 + len(origines)], locaux[2 + len(origines):], tableaux["capacites"][debut:fin],
+        int(locaux[0]), int(locaux[1]), moteur
+    )
+
+
+def flot_par_composantes(nb_sommets: int, origines, destinations, capacites, source: int, puit: int,
+                         processus: int = None, moteur: str = None) -> Tuple[np.ndarray, Dict[str, int]]:
+    """Calcule un flot maximal en élaguant le réseau et en résolvant chaque sous-réseau séparément.
+
+    Les sous-réseaux sont répartis sur `processus` processus ; par défaut, le calcul reste
+    dans ce processus tant que le réseau élagué compte moins de `SEUIL_PARALLELE` arrêtes.
+    Chacun est résolu par le moteur `moteur` (voir `Adduction_eau.moteurs.calcule_flot`).
+    Renvoie le flot de chaque arrête (nul sur les arrêtes élaguées) et un rapport donnant
+    le nombre de sommets et d'arrêtes avant et après élagage, la capacité élaguée, le
+    nombre de sous-réseaux, le nombre d'arrêtes du plus grand et la durée de calcul
+    cumulée de chaque moteur utilisé.
+
+    Exemple :
+>>> from Adduction_eau.elagage import flot_par_composantes
+>>> flots, rapport = flot_par_composantes(6, [0, 1, 0, 2, 4], [1, 5, 2, 5, 2], [4., 3., 2., 5., 1.], 0, 5)
+>>> flots
+array([3., 3., 2., 2., 0.])
+>>> {cle: valeur for cle, valeur in rapport.items() if cle != "moteurs"}
+{'sommets': 5, 'sommets_elagues': 1, 'aretes': 5, 'aretes_elaguees': 1, 'capacite_elaguee': 1.0, 'composantes': 2, 'plus_grande_composante': 2}
+>>> list(rapport["moteurs"])
+['serie_parallele']
+    """
+    origines = np.asarray(origines, dtype=np.int64)
+    destinations = np.asarray(destinations, dtype=np.int64)
+    capacites = np.asarray(capacites, dtype=np.float64)
+    garde = elague(nb_sommets, origines, destinations, source, puit)
+    gardees = np.flatnonzero(garde)
+    composantes = decompose(nb_sommets, origines[gardees], destinations[gardees], source, puit)
+    ordre = np.argsort(composantes, kind="stable")
+    tailles = np.bincount(composantes)
+    bornes = np.concatenate([[0], np.cumsum(tailles)]).tolist()
+    aretes = gardees[ordre]
+    tableaux = {
+        "origines": origines[aretes],
+        "destinations": destinations[aretes],
+        "capacites": capacites[aretes],
+        "parametres": np.array([source, puit], dtype=np.int64),
+    }
+    if processus is None and len(aretes) < SEUIL_PARALLELE:
+        processus = 1
+    flots = np.zeros(len(origines))
+    durees = dict()
+    taches = [(debut, fin, moteur_demande(moteur)) for debut, fin in zip(bornes[:-1], bornes[1:])]
+    with GroupeDeCalcul(tableaux, processus) as groupe:
+        for (debut, fin, _), (resultat, mesure) in zip(taches, groupe.map(_resout_composante, taches)):
+            flots[aretes[debut:fin]] = resultat
+            durees[mesure["moteur"]] = durees.get(mesure["moteur"], 0.) + mesure["duree"]
+
+    presents = np.zeros(nb_sommets, dtype=bool)
+    presents[origines] = presents[destinations] = True
+    restants = np.zeros(nb_sommets, dtype=bool)
+    restants[origines[gardees]] = restants[destinations[gardees]] = True
+    rapport = {
+        "sommets": int(presents.sum()),
+        "sommets_elagues": int((presents & ~restants).sum()),
+        "aretes": len(origines),
+        "aretes_elaguees": int(len(origines) - len(gardees)),
+        "capacite_elaguee": float(capacites[~garde].sum()),
+        "composantes": len(tailles),
+        "plus_grande_composante": int(tailles.max()) if len(tailles) else 0,
+        "moteurs": durees,
+    }
+    return flots, rapport
@@ -0,0 +1,171 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Simulation de Monte-Carlo de pannes aléatoires : chaque canalisation casse avec sa
+propre probabilité, et l'eau reçue par chaque ville est estimée sur de nombreux
+tirages. Les tirages sont faits par lots vectorisés, résolus en parallèle, et les
+estimations sont renvoyées au fil du calcul avec leurs intervalles de confiance.
+
+Fonctions principales :
+- simule_pannes
+
+Fonctions secondaires :
+- _taux_par_canalisation
+- _resout_tirages
+- _estimations
+"""
+
+from statistics import NormalDist
+from typing import Dict, Iterator, Tuple, Union
+from Adduction_eau import Probleme
+from Adduction_eau.flot import GrapheResiduel
+from Adduction_eau.parallele import GroupeDeCalcul, graphe_partage
+from Adduction_eau.table import TableCreuse
+import numpy as np
+import pandas as pd
+
+
+def _taux_par_canalisation(table: TableCreuse, origines, destinations,
+                           taux_pannes: Union[float, Dict[Tuple[str, str], float]]) -> np.ndarray:
+    """Renvoie la probabilité de panne de chaque arrête ; les arrêtes vers le puit ne cassent pas."""
+    puit = table.numero("puit")
+    if isinstance(taux_pannes, dict):
+        positions = {
+            (table.sommets[depart], table.sommets[arrivee]): position
+            for position, (depart, arrivee) in enumerate(zip(origines.tolist(), destinations.tolist()))
+        }
+        taux = np.zeros(len(origines))
+        for arrete, valeur in taux_pannes.items():
+            if arrete not in positions:
+                raise ValueError(f"La canalisation {arrete} n'existe pas ou a une capacité nulle.")
+            taux[positions[arrete]] = valeur
+    else:
+        taux = np.full(len(origines), float(taux_pannes))
+    if np.any((taux < 0) | (taux > 1)):
+        raise ValueError("Les taux de panne doivent être compris entre 0 et 1.")
+    taux[destinations == puit] = 0.
+    return taux
+
+
+def _resout_tirages(tableaux: Dict[str, np.ndarray], tache: Tuple[np.ndarray, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Renvoie, pour chaque tirage d'un lot de pannes, l'eau reçue par chaque ville et si tous les flots maximaux l'alimentent."""
+    bits, nb_candidates = tache
+    _, source, puit = tableaux["parametres"].tolist()
+    candidates = tableaux["candidates"]
+    base = graphe_partage(tableaux)
+    masques = np.unpackbits(bits, axis=1, count=nb_candidates).astype(bool)
+    recues = np.empty((len(masques), len(tableaux["demandes"])))
+    alimentees = np.empty((len(masques), len(tableaux["demandes"])), dtype=bool)
+    for rang, masque in enumerate(masques):
+        graphe = base.copie()
+        for arete in candidates[masque].tolist():
+            graphe.modifie_capacite(arete, 0., source, puit)
+        graphe.pousse(source, puit)
+        recues[rang] = graphe.flots[tableaux["demandes"]]
+        alimentees[rang] = graphe.toujours_saturees(tableaux["demandes"], puit)
+    return recues, alimentees
+
+
+def _estimations(villes, demandes: np.ndarray, tirages: np.ndarray, alimentees: np.ndarray, confiance: float) -> pd.DataFrame:
+    """Calcule les estimations de l'eau reçue par chaque ville à partir des tirages déjà faits."""
+    nombre = len(tirages)
+    moyennes = tirages.mean(axis=0)
+    ecarts_types = tirages.std(axis=0, ddof=1) if nombre > 1 else np.zeros(len(villes))
+    demi_largeurs = NormalDist().inv_cdf(0.5 + confiance / 2) * ecarts_types / np.sqrt(nombre)
+    quantiles = np.quantile(tirages, [0.05, 0.5, 0.95], axis=0)
+    return pd.DataFrame({
+        "demande": demandes,
+        "moyenne": moyennes,
+        "ecart_type": ecarts_types,
+        "borne_basse": moyennes - demi_largeurs,
+        "borne_haute": moyennes + demi_largeurs,
+        "probabilite_alimentee": alimentees.mean(axis=0),
+        "q05": quantiles[0],
+        "mediane": quantiles[1],
+        "q95": quantiles[2],
+    }, index=pd.Index(villes, name="ville"))
+
+
+def simule_pannes(probleme: Probleme, taux_pannes: Union[float, Dict[Tuple[str, str], float]],
+                  graine: int = 0, taille_lot: int = 1_000, tirages_max: int = 100_000,
+                  precision: float = None, confiance: float = 0.95, processus: int = None) -> Iterator[pd.DataFrame]:
+    """Estime par Monte-Carlo l'eau reçue par chaque ville lorsque des canalisations cassent au hasard.
+
+    `taux_pannes` donne la probabilité de panne de toutes les canalisations, ou de
+    chacune par un dictionnaire {(départ, arrivée): taux} (0 pour celles qui n'y sont pas).
+    Les pannes de chaque lot de `taille_lot` tirages sont tirées d'un seul coup à partir
+    de `graine` et du numéro du lot : les résultats ne dépendent pas du nombre de processus.
+
+    Après chaque lot, une table est renvoyée avec, pour chaque ville, sa demande, la
+    moyenne et l'écart type de l'eau reçue, l'intervalle de confiance de la moyenne, la
+    probabilité d'être entièrement alimentée et des quantiles. `attrs["tirages"]` donne le
+    nombre de tirages faits et `attrs["convergee"]` indique si toutes les demi-largeurs
+    d'intervalle sont inférieures à `precision` ; le calcul s'arrête alors.
+
+    Une ville est comptée comme alimentée dans un tirage si tous les flots maximaux du
+    réseau amputé l'alimentent (voir `Solution.villes_non_alimentees`) : cette probabilité
+    ne dépend pas de la répartition du flot. L'eau reçue par chaque ville, elle, dépend de
+    cette répartition quand des villes se partagent une canalisation saturée ; seul son
+    total par tirage est déterminé. Tous les tirages sont résolus par le moteur natif
+    (`GrapheResiduel`), quel que soit le moteur configuré, si bien qu'une même graine
+    donne toujours les mêmes estimations.
+
+    Exemple :
+>>> from Adduction_eau import Probleme
+>>> from Adduction_eau.fiabilite import simule_pannes
+>>> probleme = Probleme([("source", "A", 10), ("source", "B", 4), ("A", "B", 3),
+...                      ("A", "puit", 6), ("B", "puit", 6)])
+>>> for estimation in simule_pannes(probleme, 0.1, taille_lot=500, precision=0.1, processus=1):
+...     print(estimation.attrs["tirages"], estimation.attrs["convergee"])
+500 False
+1000 False
+1500 True
+>>> estimation[["demande", "moyenne", "probabilite_alimentee"]].round(3)
+       demande  moyenne  probabilite_alimentee
+ville
+A          6.0    5.316                  0.886
+B          6.0    5.279                  0.719
+    """
+    table = probleme.table_creuse()
+    if "source" not in table.sommets or "puit" not in table.sommets:
+        raise ValueError("Le réseau doit comprendre une source et un puit.")
+    source, puit = table.numero("source"), table.numero("puit")
+    origines, destinations, capacites = table.non_nulles()
+    taux = _taux_par_canalisation(table, origines, destinations, taux_pannes)
+    graphe = GrapheResiduel(len(table.sommets), origines, destinations, capacites)
+    graphe.pousse(source, puit)
+    demandes = np.flatnonzero(destinations == puit)
+    candidates = np.flatnonzero(taux > 0)
+    tableaux = {
+        "origines": origines,
+        "destinations": destinations,
+        "capacites": capacites,
+        "flots": graphe.flots,
+        "demandes": demandes,
+        "candidates": candidates,
+        "parametres": np.array([len(table.sommets), source, puit], dtype=np.int64),
+    }
+    villes = [table.sommets[ville] for ville in origines[demandes].tolist()]
+    tirages = np.empty((0, len(demandes)))
+    alimentees = np.empty((0, len(demandes)), dtype=bool)
+    with GroupeDeCalcul(tableaux, processus) as groupe:
+        numero_lot = 0
+        while len(tirages) < tirages_max:
+            nombre = min(taille_lot, tirages_max - len(tirages))
+            generateur = np.random.default_rng([graine, numero_lot])
+            masques = generateur.random((nombre, len(candidates))) < taux[candidates]
+            morceaux = np.array_split(masques, min(nombre, 4 * groupe.processus))
+            taches = [(np.packbits(morceau, axis=1), len(candidates)) for morceau in morceaux]
+            resultats = list(groupe.map(_resout_tirages, taches, taille_lot=1))
+            tirages = np.vstack([tirages, *(recues for recues, _ in resultats)])
+            alimentees = np.vstack([alimentees, *(alimentations for _, alimentations in resultats)])
+            numero_lot += 1
+            estimation = _estimations(villes, capacites[demandes], tirages, alimentees, confiance)
+            demi_largeurs = (estimation["borne_haute"] - estimation["moyenne"]).to_numpy()
+            convergee = precision is not None and len(tirages) > 1 and bool(np.all(demi_largeurs <= precision))
+            estimation.attrs["tirages"] = len(tirages)
+            estimation.attrs["convergee"] = convergee
+            yield estimation
+            if convergee:
+                return
@@ -0,0 +1,548 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Contient le moteur de calcul du flot maximal (algorithme de Dinic) travaillant
+sur des identifiants entiers de sommets et des tableaux NumPy au format CSR.
+
+Classe principale :
+- GrapheResiduel
+
+Fonctions principales :
+- flot_maximal
+- flot_cout_minimal
+- flot_parametrique
+- flot_serie_parallele
+
+Fonctions secondaires :
+- _niveaux
+- _phase_bloquante
+- _distances
+"""
+
+from typing import List, Optional, Tuple
+import heapq
+import numpy as np
+
+
+class GrapheResiduel:
+    """Graphe résiduel compressé (CSR) d'un réseau de canalisations.
+
+    Chaque arrête `e` donne deux arcs : l'arc direct, de capacité résiduelle
+    `capacites[e] - flot[e]`, et l'arc retour, de capacité résiduelle `flot[e]`.
+    Les arcs sont triés par sommet de départ, ceux du sommet `u` occupant les
+    positions `debuts[u]` à `debuts[u + 1]`.
+
+    Un flot initial réalisable peut être donné par `flots` : les calculs suivants
+    repartent alors de ce flot au lieu de repartir de zéro.
+
+    Exemple :
+>>> from Adduction_eau.flot import GrapheResiduel
+>>> graphe = GrapheResiduel(3, [0, 1, 0], [1, 2, 2], [5., 3., 1.])
+>>> graphe.pousse(0, 2)
+4.0
+>>> graphe.flots
+array([3., 3., 1.])
+    """
+    __slots__ = (
+        "nb_sommets", "origines", "destinations", "capacites",
+        "debuts", "cibles", "inverses", "directs", "residuels"
+    )
+
+    def __init__(self, nb_sommets: int, origines, destinations, capacites, flots=None):
+        self.nb_sommets = int(nb_sommets)
+        self.origines = np.asarray(origines, dtype=np.int64)
+        self.destinations = np.asarray(destinations, dtype=np.int64)
+        self.capacites = np.asarray(capacites, dtype=np.float64)
+        nb_aretes = len(self.origines)
+        queues = np.empty(2 * nb_aretes, dtype=np.int64)
+        queues[0::2] = self.origines
+        queues[1::2] = self.destinations
+        tetes = np.empty(2 * nb_aretes, dtype=np.int64)
+        tetes[0::2] = self.destinations
+        tetes[1::2] = self.origines
+        ordre = np.argsort(queues, kind="stable")
+        rang = np.empty_like(ordre)
+        rang[ordre] = np.arange(2 * nb_aretes)
+        self.cibles = tetes[ordre]
+        self.inverses = rang[ordre ^ 1]
+        self.directs = rang[0::2]
+        self.debuts = np.zeros(self.nb_sommets + 1, dtype=np.int64)
+        np.cumsum(np.bincount(queues, minlength=self.nb_sommets), out=self.debuts[1:])
+        self.residuels = np.zeros(2 * nb_aretes, dtype=np.float64)
+        self.residuels[self.directs] = self.capacites
+        if flots is not None:
+            flots = np.asarray(flots, dtype=np.float64)
+            if np.any(flots < 0) or np.any(flots > self.capacites):
+                raise ValueError("Le flot initial doit être compris entre 0 et la capacité de chaque arrête.")
+            self.residuels[self.directs] -= flots
+            self.residuels[self.inverses[self.directs]] = flots
+
+
+    def copie(self) -> "GrapheResiduel":
+        """Renvoie une copie du graphe dont l'état résiduel est indépendant."""
+        copie = object.__new__(GrapheResiduel)
+        for attribut in GrapheResiduel.__slots__:
+            setattr(copie, attribut, getattr(self, attribut))
+        copie.capacites = self.capacites.copy()
+        copie.residuels = self.residuels.copy()
+        return copie
+
+
+    def augmente_capacites(self, aretes, ajouts) -> None:
+        """Augmente la capacité des arrêtes données sans modifier le flot courant.
+
+        Augmenter une capacité ne rend jamais le flot courant irréalisable : un
+        appel à `pousse` ne cherche ensuite que les chemins augmentants nouveaux.
+        """
+        aretes = np.asarray(aretes, dtype=np.int64)
+        ajouts = np.broadcast_to(np.asarray(ajouts, dtype=np.float64), aretes.shape)
+        if np.any(ajouts < 0):
+            raise ValueError("Les capacités ne peuvent qu'être augmentées.")
+        np.add.at(self.capacites, aretes, ajouts)
+        np.add.at(self.residuels, self.directs[aretes], ajouts)
+
+
+    def modifie_capacite(self, arete: int, capacite: float, source: int, puit: int) -> None:
+        """Remplace la capacité d'une arrête en gardant un flot réalisable proche du flot courant.
+
+        Si le flot de l'arrête dépasse sa nouvelle capacité, seul l'excédent est déplacé :
+        il est d'abord redirigé de l'origine vers la destination de l'arrête par d'autres
+        chemins, puis le reste est annulé en amont (vers `source`) et en aval (depuis `puit`).
+        Un appel à `pousse(source, puit)` rend ensuite le flot maximal.
+        """
+        if capacite < 0:
+            raise ValueError("La capacité doit être positive.")
+        direct = self.directs[arete]
+        retour = self.inverses[direct]
+        ajout = capacite - self.capacites[arete]
+        if ajout >= 0:
+            self.augmente_capacites([arete], ajout)
+            return
+        excedent = self.residuels[retour] - capacite
+        self.capacites[arete] = capacite
+        self.residuels[direct] = max(self.residuels[direct] + ajout, 0.)
+        if excedent <= 0:
+            return
+        self.residuels[retour] = capacite
+        depart, arrivee = int(self.origines[arete]), int(self.destinations[arete])
+        excedent -= self.pousse(depart, arrivee, limite=excedent)
+        if excedent > 0 and depart not in (source, puit):
+            self.pousse(depart, source, limite=excedent)
+        if excedent > 0 and arrivee not in (source, puit):
+            self.pousse(puit, arrivee, limite=excedent)
+
+
+    @property
+    def flots(self) -> np.ndarray:
+        """Flot porté par chaque arrête, dans l'ordre des arrêtes d'origine."""
+        return self.residuels[self.inverses[self.directs]]
+
+
+    def valeur(self, source: int) -> float:
+        """Renvoie la valeur du flot courant, c'est-à-dire le flot net sortant de `source`."""
+        flots = self.flots
+        return float(flots[self.origines == source].sum() - flots[self.destinations == source].sum())
+
+
+    def atteignables(self, source: int) -> np.ndarray:
+        """Indique les sommets atteignables depuis `source` dans le graphe résiduel.
+
+        Une fois le flot maximal calculé, ces sommets forment le côté source d'une coupe minimale.
+        """
+        niveaux = _niveaux(self.nb_sommets, self.debuts.tolist(), self.cibles.tolist(), self.residuels.tolist(), source)
+        return np.array(niveaux) >= 0
+
+
+    def coupe(self, source: int) -> np.ndarray:
+        """Renvoie les arrêtes allant d'un sommet atteignable depuis `source` à un sommet non atteignable.
+
+        Une fois le flot maximal calculé, ce sont les arrêtes d'une coupe minimale : elles
+        sont saturées et la somme de leurs capacités est la valeur du flot maximal.
+        """
+        atteignables = self.atteignables(source)
+        return np.flatnonzero(atteignables[self.origines] & ~atteignables[self.destinations])
+
+
+    def toujours_saturees(self, aretes, arrivee: int) -> np.ndarray:
+        """Indique si chacune des arrêtes `aretes`, toutes dirigées vers `arrivee`, est saturée par tous les flots maximaux.
+
+        Le flot courant doit être maximal. Une arrête saturée peut être désaturée par un
+        autre flot maximal de même valeur exactement quand son origine atteint encore
+        `arrivee` dans le graphe résiduel : le flot peut passer par ce chemin au lieu de
+        l'arrête. Le résultat ne dépend donc pas du flot maximal trouvé. Une arrête de
+        capacité nulle est toujours saturée.
+
+        Exemple :
+>>> from Adduction_eau.flot import GrapheResiduel
+>>> graphe = GrapheResiduel(4, [0, 1, 1, 2], [1, 2, 3, 3], [5., 5., 3., 3.])
+>>> graphe.pousse(0, 3)
+5.0
+>>> graphe.toujours_saturees([2, 3], 3)
+array([False, False])
+        """
+        aretes = np.asarray(aretes, dtype=np.int64)
+        ouverts = (self.residuels[self.inverses] > 1e-9).astype(np.float64)
+        niveaux = _niveaux(self.nb_sommets, self.debuts.tolist(), self.cibles.tolist(), ouverts.tolist(), arrivee)
+        remontent = np.array(niveaux) >= 0
+        saturees = self.residuels[self.directs[aretes]] <= 1e-9
+        return saturees & (~remontent[self.origines[aretes]] | (self.capacites[aretes] <= 1e-9))
+
+
+    def plus_larges(self, depart: int, vers_depart: bool = False) -> np.ndarray:
+        """Renvoie, pour chaque sommet, la plus grande capacité résiduelle d'un chemin depuis `depart`.
+
+        La capacité d'un chemin est la plus petite capacité résiduelle de ses arcs : c'est
+        la quantité de flot que ce seul chemin peut encore porter. Avec `vers_depart`, ce
+        sont les chemins allant de chaque sommet jusqu'à `depart` qui sont considérés.
+        Les sommets sans chemin valent 0 et `depart` vaut l'infini.
+        """
+        debuts, cibles, inverses = self.debuts.tolist(), self.cibles.tolist(), self.inverses.tolist()
+        residuels = self.residuels.tolist()
+        largeurs = [0.] * self.nb_sommets
+        largeurs[depart] = float("inf")
+        tas = [(-largeurs[depart], depart)]
+        while tas:
+            largeur, sommet = heapq.heappop(tas)
+            largeur = -largeur
+            if largeur < largeurs[sommet]:
+                continue
+            for arc in range(debuts[sommet], debuts[sommet + 1]):
+                residuel = residuels[inverses[arc]] if vers_depart else residuels[arc]
+                if residuel > 0:
+                    cible = cibles[arc]
+                    nouvelle = residuel if residuel < largeur else largeur
+                    if nouvelle > largeurs[cible]:
+                        largeurs[cible] = nouvelle
+                        heapq.heappush(tas, (-nouvelle, cible))
+        return np.array(largeurs)
+
+
+    def pousse(self, source: int, puit: int, limite: float = float("inf")) -> float:
+        """Augmente le flot courant de `source` vers `puit` et renvoie la quantité poussée.
+
+        Le calcul repart de l'état résiduel courant, dans la limite de `limite`.
+        """
+        if source == puit:
+            raise ValueError("La source et le puit doivent être distincts.")
+        debuts = self.debuts.tolist()
+        cibles = self.cibles.tolist()
+        inverses = self.inverses.tolist()
+        residuels = self.residuels.tolist()
+        total = 0.0
+        while total < limite:
+            niveaux = _niveaux(self.nb_sommets, debuts, cibles, residuels, source, puit)
+            if niveaux[puit] < 0:
+                break
+            total += _phase_bloquante(
+                debuts, cibles, inverses, residuels, niveaux, source, puit, limite - total
+            )
+        self.residuels = np.array(residuels, dtype=np.float64)
+        return total
+
+
+def _niveaux(nb_sommets: int, debuts: List[int], cibles: List[int],
+             residuels: List[float], source: int, puit: int = -1) -> List[int]:
+    """Calcule la distance (en arcs) de chaque sommet à la source dans le graphe résiduel.
+
+    Si `puit` est donné, le parcours s'arrête une fois le niveau du puit atteint : les
+    sommets plus éloignés, inutiles à la phase bloquante, gardent le niveau -1.
+    """
+    niveaux = [-1] * nb_sommets
+    niveaux[source] = 0
+    file = [source]
+    for sommet in file:
+        suivant = niveaux[sommet] + 1
+        if puit >= 0 and 0 <= niveaux[puit] < suivant:
+            break
+        for arc in range(debuts[sommet], debuts[sommet + 1]):
+            if residuels[arc] > 0:
+                cible = cibles[arc]
+                if niveaux[cible] < 0:
+                    niveaux[cible] = suivant
+                    file.append(cible)
+    return niveaux
+
+
+def _phase_bloquante(debuts: List[int], cibles: List[int], inverses: List[int],
+                     residuels: List[float], niveaux: List[int],
+                     source: int, puit: int, limite: float) -> float:
+    """Pousse un flot bloquant dans le graphe de niveaux et renvoie la quantité poussée."""
+    courant = debuts[:-1]
+    chemin = list()
+    pousse = 0.0
+    sommet = source
+    while True:
+        if sommet == puit:
+            delta = limite - pousse
+            for arc in chemin:
+                if residuels[arc] < delta:
+                    delta = residuels[arc]
+            for arc in chemin:
+                residuels[arc] -= delta
+                residuels[inverses[arc]] += delta
+            pousse += delta
+            if pousse >= limite:
+                return pousse
+            rang = 0
+            while residuels[chemin[rang]] > 0:
+                rang += 1
+            del chemin[rang:]
+            sommet = cibles[chemin[-1]] if chemin else source
+            continue
+        fin = debuts[sommet + 1]
+        arc = courant[sommet]
+        niveau_suivant = niveaux[sommet] + 1
+        while arc < fin and not (residuels[arc] > 0 and niveaux[cibles[arc]] == niveau_suivant):
+            arc += 1
+        courant[sommet] = arc
+        if arc < fin:
+            chemin.append(arc)
+            sommet = cibles[arc]
+        elif chemin:
+            niveaux[sommet] = -1
+            sommet = cibles[inverses[chemin.pop()]]
+            courant[sommet] += 1
+        else:
+            return pousse
+
+
+def flot_maximal(nb_sommets: int, origines, destinations, capacites,
+                 source: int, puit: int, flots_initiaux=None) -> Tuple[float, np.ndarray]:
+    """Calcule le flot maximal entre `source` et `puit`.
+
+    Renvoie la valeur du flot et le flot de chaque arrête, aligné sur les tableaux d'entrée.
+    Le calcul peut repartir d'un flot réalisable `flots_initiaux`, par exemple le flot
+    maximal du même réseau avant une augmentation de capacités.
+
+    Exemple :
+>>> from Adduction_eau.flot import flot_maximal
+>>> flot_maximal(4, [0, 0, 1, 2], [1, 2, 3, 3], [10., 4., 3., 8.], 0, 3)
+(7.0, array([3., 4., 3., 4.]))
+    """
+    graphe = GrapheResiduel(nb_sommets, origines, destinations, capacites, flots_initiaux)
+    graphe.pousse(source, puit)
+    return graphe.valeur(source), graphe.flots
+
+
+def _distances(nb_sommets: int, debuts: List[int], cibles: List[int], residuels: List[float],
+               couts: List[float], potentiels: List[float], source: int) -> List[float]:
+    """Calcule les plus courtes distances depuis la source avec les coûts réduits par les potentiels (Dijkstra)."""
+    distances = [float("inf")] * nb_sommets
+    distances[source] = 0.
+    tas = [(0., source)]
+    while tas:
+        distance, sommet = heapq.heappop(tas)
+        if distance > distances[sommet]:
+            continue
+        potentiel = potentiels[sommet]
+        for arc in range(debuts[sommet], debuts[sommet + 1]):
+            if residuels[arc] > 0:
+                cible = cibles[arc]
+                nouvelle = distance + max(couts[arc] + potentiel - potentiels[cible], 0.)
+                if nouvelle < distances[cible]:
+                    distances[cible] = nouvelle
+                    heapq.heappush(tas, (nouvelle, cible))
+    return distances
+
+
+def flot_cout_minimal(nb_sommets: int, origines, destinations, capacites, couts,
+                      source: int, puit: int, valeur: float) -> Tuple[float, np.ndarray]:
+    """Calcule un flot de valeur `valeur` entre `source` et `puit` de coût minimal.
+
+    Les coûts sont unitaires et positifs. À chaque phase, les potentiels sont mis à jour
+    par un plus court chemin (Dijkstra) puis un flot bloquant de Dinic est poussé sur les
+    seuls arcs de coût réduit nul. Renvoie le coût total et le flot de chaque arrête ;
+    lève une ValueError si la valeur demandée ne peut pas être atteinte.
+
+    Exemple :
+>>> from Adduction_eau.flot import flot_cout_minimal
+>>> flot_cout_minimal(3, [0, 0, 1], [1, 1, 2], [2., 10., 5.], [0., 1., 0.], 0, 2, 5.)
+(3.0, array([2., 3., 5.]))
+    """
+    graphe = GrapheResiduel(nb_sommets, origines, destinations, capacites)
+    couts = np.asarray(couts, dtype=np.float64)
+    if np.any(couts < 0):
+        raise ValueError("Les coûts doivent être positifs.")
+    couts_arcs = np.empty(len(graphe.residuels), dtype=np.float64)
+    couts_arcs[graphe.directs] = couts
+    couts_arcs[graphe.inverses[graphe.directs]] = -couts
+    tolerance = 1e-9 * max(1., float(couts.max(initial=0.)) * nb_sommets)
+    debuts = graphe.debuts.tolist()
+    cibles = graphe.cibles.tolist()
+    inverses = graphe.inverses.tolist()
+    queues = graphe.cibles[graphe.inverses].tolist()
+    couts_arcs = couts_arcs.tolist()
+    residuels = graphe.residuels.tolist()
+    potentiels = [0.] * graphe.nb_sommets
+    total = 0.
+    while total < valeur:
+        distances = _distances(graphe.nb_sommets, debuts, cibles, residuels, couts_arcs, potentiels, source)
+        borne = distances[puit]
+        if borne == float("inf"):
+            raise ValueError(f"Le flot ne peut pas dépasser {total} sur les {valeur} demandés.")
+        for sommet, distance in enumerate(distances):
+            potentiels[sommet] += min(distance, borne)
+        admissibles = [
+            arc for arc, residuel in enumerate(residuels)
+            if residuel > 0 and abs(couts_arcs[arc] + potentiels[queues[arc]] - potentiels[cibles[arc]]) <= tolerance
+        ]
+        masques = [0.] * len(residuels)
+        for arc in admissibles:
+            masques[arc] = residuels[arc]
+            masques[inverses[arc]] = residuels[inverses[arc]]
+        while total < valeur:
+            niveaux = _niveaux(graphe.nb_sommets, debuts, cibles, masques, source, puit)
+            if niveaux[puit] < 0:
+                break
+            total += _phase_bloquante(debuts, cibles, inverses, masques, niveaux, source, puit, valeur - total)
+        for arc in admissibles:
+            residuels[arc] = masques[arc]
+            residuels[inverses[arc]] = masques[inverses[arc]]
+    graphe.residuels = np.array(residuels, dtype=np.float64)
+    flots = graphe.flots
+    return float(flots @ couts), flots
+
+
+def flot_parametrique(nb_sommets: int, origines, destinations, capacites, directions,
+                      source: int, puit: int, parametre_max: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Calcule le flot maximal lorsque les capacités valent `capacites + t * directions`, pour t de 0 à `parametre_max`.
+
+    Le flot maximal est une fonction concave et affine par morceaux de t : chaque coupe
+    donne une droite et le flot est le minimum de ces droites. Les points de rupture sont
+    trouvés par dichotomie sur les intersections de droites (méthode d'Eisner et Severance) :
+    chaque calcul repart du flot obtenu pour un paramètre plus petit, les capacités ne
+    faisant qu'augmenter. Il faut environ deux calculs de flot par point de rupture.
+
+    Renvoie les valeurs du paramètre aux points de rupture (extrémités comprises) et le
+    flot maximal en ces points ; entre deux points, le flot est affine.
+
+    Exemple :
+>>> from Adduction_eau.flot import flot_parametrique
+>>> flot_parametrique(3, [0, 1], [1, 2], [2., 4.], [1., 0.], 0, 2, 5.)
+(array([0., 2., 5.]), array([2., 4., 4.]))
+    """
+    capacites = np.asarray(capacites, dtype=np.float64)
+    directions = np.asarray(directions, dtype=np.float64)
+    if np.any(directions < 0):
+        raise ValueError("Les capacités ne peuvent qu'augmenter avec le paramètre.")
+    if not 0 <= parametre_max < float("inf"):
+        raise ValueError("Le paramètre maximal doit être positif et fini.")
+    variables = np.flatnonzero(directions)
+    tolerance = 1e-9 * max(1., float(capacites.sum() + parametre_max * directions.sum()))
+
+    def resout(graphe: GrapheResiduel, depart: float, parametre: float):
+        """Résout en `parametre` à partir du graphe résolu en `depart` ; renvoie le graphe, le flot et la droite de la coupe."""
+        graphe = graphe.copie()
+        graphe.augmente_capacites(variables, (parametre - depart) * directions[variables])
+        graphe.pousse(source, puit)
+        coupe = graphe.coupe(source)
+        return graphe, graphe.valeur(source), (float(capacites[coupe].sum()), float(directions[coupe].sum()))
+
+    graphe_bas, valeur_bas, droite_bas = resout(GrapheResiduel(nb_sommets, origines, destinations, capacites), 0., 0.)
+    _, valeur_haut, droite_haut = resout(graphe_bas, 0., parametre_max)
+    ruptures = {0.: valeur_bas, float(parametre_max): valeur_haut}
+    pile = [(0., graphe_bas, droite_bas, float(parametre_max), droite_haut)]
+    while pile:
+        debut, graphe, (constante_bas, pente_bas), fin, (constante_haut, pente_haut) = pile.pop()
+        if pente_bas <= pente_haut:
+            continue
+        milieu = (constante_haut - constante_bas) / (pente_bas - pente_haut)
+        if not debut < milieu < fin:
+            continue
+        graphe_milieu, valeur, droite = resout(graphe, debut, milieu)
+        if valeur >= constante_bas + pente_bas * milieu - tolerance:
+            ruptures[milieu] = valeur
+        else:
+            pile.append((debut, graphe, (constante_bas, pente_bas), milieu, droite))
+            pile.append((milieu, graphe_milieu, droite, fin, (constante_haut, pente_haut)))
+    parametres = np.array(sorted(ruptures))
+    return parametres, np.array([ruptures[parametre] for parametre in parametres.tolist()])
+
+
+def flot_serie_parallele(nb_sommets: int, origines, destinations, capacites,
+                         source: int, puit: int) -> Optional[np.ndarray]:
+    """Calcule en temps linéaire le flot maximal d'un réseau série-parallèle, ou renvoie None.
+
+    Le réseau est réduit pas à pas : deux arrêtes de mêmes extrémités sont fusionnées
+    (capacités additionnées), un sommet n'ayant qu'une arrête entrante et une sortante
+    est court-circuité (plus petite des deux capacités), et un sommet sans arrête
+    entrante ou sans arrête sortante est retiré avec ses arrêtes, qui ne portent aucun
+    flot. Les arbres partant de la source dont les feuilles mènent au puit se réduisent
+    ainsi à une seule arrête de la source au puit, dont la capacité est le flot maximal ;
+    il est ensuite redescendu en remplissant, à chaque fusion, la première arrête avant
+    la suivante. Cette répartition peut différer de celle de Dinic, mais la valeur, la
+    coupe minimale et les villes toujours alimentées (voir `GrapheResiduel.toujours_saturees`)
+    sont les mêmes. Si la réduction n'aboutit pas, le réseau n'est pas série-parallèle et
+    None est renvoyé : il faut alors utiliser le calcul général.
+
+    Exemple :
+>>> from Adduction_eau.flot import flot_serie_parallele
+>>> flot_serie_parallele(4, [0, 1, 1, 2], [1, 3, 2, 3], [10., 4., 5., 3.], 0, 3)
+array([7., 4., 3., 3.])
+>>> flot_serie_parallele(4, [0, 0, 1, 2, 1], [1, 2, 3, 3, 2], [1., 1., 1., 1., 1.], 0, 3) is None
+True
+    """
+    origines = np.asarray(origines, dtype=np.int64).tolist()
+    destinations = np.asarray(destinations, dtype=np.int64).tolist()
+    nb_aretes = len(origines)
+    capacites_composees = np.asarray(capacites, dtype=np.float64).tolist()
+    enfants = [None] * nb_aretes
+    sorties = [dict() for _ in range(nb_sommets)]
+    entrees = [dict() for _ in range(nb_sommets)]
+    a_examiner = list()
+
+    def relie(depart: int, arrivee: int, arete: int) -> None:
+        """Ajoute une arrête, fusionnée avec celle de mêmes extrémités si elle existe."""
+        if depart == puit or arrivee == source or depart == arrivee:
+            return
+        existante = sorties[depart].get(arrivee)
+        if existante is not None:
+            capacites_composees.append(capacites_composees[existante] + capacites_composees[arete])
+            enfants.append(("parallele", existante, arete))
+            arete = len(enfants) - 1
+        sorties[depart][arrivee] = arete
+        entrees[arrivee][depart] = arete
+        a_examiner.extend((depart, arrivee))
+
+    for arete, (depart, arrivee) in enumerate(zip(origines, destinations)):
+        relie(depart, arrivee, arete)
+    while a_examiner:
+        sommet = a_examiner.pop()
+        if sommet in (source, puit):
+            continue
+        if not entrees[sommet] or not sorties[sommet]:
+            for voisin in entrees[sommet]:
+                del sorties[voisin][sommet]
+                a_examiner.append(voisin)
+            for voisin in sorties[sommet]:
+                del entrees[voisin][sommet]
+                a_examiner.append(voisin)
+            entrees[sommet], sorties[sommet] = dict(), dict()
+        elif len(entrees[sommet]) == 1 and len(sorties[sommet]) == 1:
+            (depart, avant), = entrees[sommet].items()
+            (arrivee, apres), = sorties[sommet].items()
+            del sorties[depart][sommet], entrees[arrivee][sommet]
+            entrees[sommet], sorties[sommet] = dict(), dict()
+            capacites_composees.append(min(capacites_composees[avant], capacites_composees[apres]))
+            enfants.append(("serie", avant, apres))
+            a_examiner.extend((depart, arrivee))
+            relie(depart, arrivee, len(enfants) - 1)
+
+    restantes = sum(len(voisins) for voisins in sorties)
+    flots = np.zeros(nb_aretes)
+    if restantes == 0:
+        return flots
+    if restantes > 1 or puit not in sorties[source]:
+        return None
+    pile = [(sorties[source][puit], capacites_composees[sorties[source][puit]])]
+    while pile:
+        arete, flot = pile.pop()
+        if arete < nb_aretes:
+            flots[arete] = flot
+        elif enfants[arete][0] == "serie":
+            pile.extend(((enfants[arete][1], flot), (enfants[arete][2], flot)))
+        else:
+            premier = min(flot, capacites_composees[enfants[arete][1]])
+            pile.extend(((enfants[arete][1], premier), (enfants[arete][2], flot - premier)))
+    return flots
@@ -0,0 +1,98 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Analyse de la livrabilité de chaque ville : on calcule l'eau que chaque ville
+recevrait si elle était seule à être alimentée, et on la compare à son alimentation
+par tous les flots maximaux communs pour mesurer la concurrence entre villes sur
+les canalisations partagées. Les problèmes des villes sont résolus en parallèle
+sur un même graphe résiduel préparé une seule fois.
+
+Fonctions principales :
+- analyse_villes
+
+Fonctions secondaires :
+- _resout_ville
+"""
+
+from typing import Dict, Tuple, Union
+from Adduction_eau import Probleme
+from Adduction_eau.algorithme import Solution, _en_solution
+from Adduction_eau.flot import GrapheResiduel
+from Adduction_eau.parallele import GroupeDeCalcul, graphe_partage
+import numpy as np
+import pandas as pd
+
+
+def _resout_ville(tableaux: Dict[str, np.ndarray], tache: Tuple[int, float]) -> float:
+    """Renvoie l'eau qu'une ville recevrait seule, dans la limite de sa demande.
+
+    Le graphe partagé est inversé : le flot est poussé de la ville vers la source, si bien
+    que chaque parcours ne visite que les sommets qui peuvent alimenter la ville.
+    """
+    ville, demande = tache
+    source = int(tableaux["parametres"][1])
+    return graphe_partage(tableaux).copie().pousse(ville, source, demande)
+
+
+def analyse_villes(probleme: Union[Probleme, Solution], processus: int = None) -> pd.DataFrame:
+    """Calcule, pour chaque ville, l'eau qu'elle recevrait si elle était seule à être alimentée.
+
+    Le graphe résiduel du réseau inversé, sans les arrêtes vers le puit, est placé une
+    fois en mémoire partagée et chaque processus le copie pour calculer le flot entre la
+    source et une ville, dans la limite de sa demande. Une ville n'est calculée que si l'eau reçue
+    dans le flot commun et le plus large chemin depuis la source (bornes basses) restent
+    sous sa demande et sous la capacité des canalisations qui y arrivent (bornes hautes).
+
+    Renvoie une table indexée par ville avec sa demande, l'eau qu'elle recevrait seule
+    (`seule`), si elle serait entièrement alimentée seule et si elle l'est par tous les
+    flots maximaux communs (`alimentee`, voir `Solution.villes_non_alimentees`). L'eau
+    reçue par chaque ville dans le flot commun n'est pas donnée : sa répartition entre
+    villes n'est pas unique. Une ville alimentée seule mais pas dans le flot commun
+    souffre de la concurrence des autres villes.
+
+    Exemple :
+>>> from Adduction_eau import Probleme
+>>> from Adduction_eau.livrabilite import analyse_villes
+>>> probleme = Probleme([("source", "A", 6), ("A", "B", 4), ("A", "C", 5), ("source", "D", 2),
+...                      ("B", "puit", 6), ("C", "puit", 3), ("D", "puit", 1)])
+>>> analyse = analyse_villes(probleme, processus=1)
+>>> analyse
+       demande  seule  alimentee_seule  alimentee
+ville
+B          6.0    4.0            False      False
+C          3.0    3.0             True      False
+D          1.0    1.0             True       True
+    """
+    solution = _en_solution(probleme)
+    table, graphe = solution.table_creuse, solution.graphe
+    source, puit = table.numero("source"), table.numero("puit")
+    origines, destinations, capacites = graphe.origines, graphe.destinations, graphe.capacites
+    demandes = np.flatnonzero(destinations == puit)
+    villes = origines[demandes]
+    recues = graphe.flots[demandes]
+    besoins = capacites[demandes]
+    alimentees = graphe.toujours_saturees(demandes, puit)
+
+    garde = destinations != puit
+    base = GrapheResiduel(len(table.sommets), origines[garde], destinations[garde], capacites[garde])
+    entrees = np.bincount(base.destinations, weights=base.capacites, minlength=len(table.sommets))
+    seules = np.minimum(besoins, np.maximum(recues, base.plus_larges(source)[villes]))
+    a_resoudre = np.flatnonzero(seules < np.minimum(besoins, entrees[villes]) - 1e-9)
+    tableaux = {
+        "origines": base.destinations,
+        "destinations": base.origines,
+        "capacites": base.capacites,
+        "flots": np.zeros(len(base.capacites)),
+        "parametres": np.array([len(table.sommets), source, puit], dtype=np.int64),
+    }
+    taches = list(zip(villes[a_resoudre].tolist(), besoins[a_resoudre].tolist()))
+    with GroupeDeCalcul(tableaux, processus) as groupe:
+        seules[a_resoudre] = list(groupe.map(_resout_ville, taches))
+
+    return pd.DataFrame({
+        "demande": besoins,
+        "seule": seules,
+        "alimentee_seule": seules >= besoins - 1e-9,
+        "alimentee": alimentees,
+    }, index=pd.Index([table.sommets[ville] for ville in villes.tolist()], name="ville"))
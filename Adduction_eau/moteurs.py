@@ -0,0 +1,242 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Registre des moteurs de calcul du flot maximal. Chaque moteur reçoit le réseau en
+identifiants entiers et renvoie le flot de chaque arrête. Le moteur est choisi à
+chaque appel, par configuration (`configure_moteur` ou variable d'environnement
+ADDUCTION_EAU_MOTEUR) ou automatiquement selon la taille du réseau et la nature
+des capacités.
+
+Tous les moteurs donnent un flot maximal, donc la même valeur, la même coupe
+minimale et les mêmes villes non alimentées : une ville n'est alimentée que si
+tous les flots maximaux la satisfont (voir `GrapheResiduel.toujours_saturees`).
+La répartition du flot entre canalisations, elle, n'est pas unique et peut changer
+avec le moteur, donc avec la taille du réseau en choix automatique ; le flot de
+chaque canalisation est celui du moteur utilisé, qu'il faut fixer pour le retrouver.
+
+Moteurs :
+- natif : algorithme de Dinic du module flot
+- serie_parallele : réduction en temps linéaire des réseaux série-parallèles
+- networkx : nx.maximum_flow
+- scipy : scipy.sparse.csgraph.maximum_flow, sur des capacités ramenées à des entiers
+
+Fonctions principales :
+- enregistre_moteur
+- configure_moteur
+- moteur_demande
+- choisit_moteur
+- calcule_flot
+
+Fonctions secondaires :
+- _repartit
+- _facteur_entier
+- _scipy_disponible
+"""
+
+from typing import Callable, Dict, Tuple
+import os
+import time
+import numpy as np
+from Adduction_eau.flot import flot_maximal, flot_serie_parallele
+
+
+MOTEURS: Dict[str, Callable] = dict()
+SEUIL_SCIPY = 200
+MAILLAGE_SERIE_PARALLELE = 1.5
+_MOTEUR_CONFIGURE = None
+
+
+def enregistre_moteur(nom: str) -> Callable:
+    """Décorateur ajoutant une fonction `(nb_sommets, origines, destinations, capacites, source, puit) -> flots` au registre.
+
+    Exemple :
+>>> from Adduction_eau.moteurs import enregistre_moteur, calcule_flot, MOTEURS
+>>> @enregistre_moteur("nul")
+... def moteur_nul(nb_sommets, origines, destinations, capacites, source, puit):
+...     return np.zeros(len(origines))
+>>> calcule_flot(2, [0], [1], [3.], 0, 1, moteur="nul")[0]
+array([0.])
+>>> del MOTEURS["nul"]
+    """
+    def enregistre(fonction: Callable) -> Callable:
+        MOTEURS[nom] = fonction
+        return fonction
+    return enregistre
+
+
+def configure_moteur(nom: str = None) -> None:
+    """Choisit le moteur utilisé par défaut ; None rend la main à la variable d'environnement puis au choix automatique."""
+    global _MOTEUR_CONFIGURE
+    if nom is not None and nom != "automatique" and nom not in MOTEURS:
+        raise ValueError(f"Le moteur {nom} n'existe pas ; moteurs disponibles : {sorted(MOTEURS)}.")
+    _MOTEUR_CONFIGURE = nom
+
+
+def _facteur_entier(capacites: np.ndarray, origines: np.ndarray = None, destinations: np.ndarray = None) -> int:
+    """Renvoie la plus petite puissance de dix rendant toutes les capacités entières sur 32 bits, ou 0.
+
+    Avec `origines` et `destinations`, la borne des 32 bits s'applique à la capacité totale
+    de chaque couple de sommets, que la matrice creuse obtient en additionnant les
+    canalisations parallèles.
+    """
+    fusionnees = capacites
+    if origines is not None and len(capacites):
+        cles = np.asarray(origines, dtype=np.int64) * (int(np.max(destinations)) + 1) + destinations
+        _, couples = np.unique(cles, return_inverse=True)
+        fusionnees = np.bincount(couples.reshape(-1), weights=capacites)
+    for puissance in range(7):
+        facteur = 10 ** puissance
+        mises_a_echelle = capacites * facteur
+        if np.all(fusionnees * facteur < 2 ** 31) and np.allclose(mises_a_echelle, np.round(mises_a_echelle), rtol=0., atol=1e-6):
+            return facteur
+    return 0
+
+
+def _repartit(origines: np.ndarray, destinations: np.ndarray, capacites: np.ndarray,
+              flots_nets: Dict[Tuple[int, int], float]) -> np.ndarray:
+    """Répartit le flot net de chaque couple de sommets sur ses arrêtes, dans l'ordre des arrêtes."""
+    flots = np.zeros(len(origines))
+    for arete, (depart, arrivee, capacite) in enumerate(zip(origines.tolist(), destinations.tolist(), capacites.tolist())):
+        reste = flots_nets.get((depart, arrivee), 0.)
+        if reste > 0:
+            flots[arete] = min(reste, capacite)
+            flots_nets[(depart, arrivee)] = reste - flots[arete]
+    return flots
+
+
+@enregistre_moteur("natif")
+def _natif(nb_sommets, origines, destinations, capacites, source, puit) -> np.ndarray:
+    """Algorithme de Dinic du module flot."""
+    return flot_maximal(nb_sommets, origines, destinations, capacites, source, puit)[1]
+
+
+@enregistre_moteur("serie_parallele")
+def _serie_parallele(nb_sommets, origines, destinations, capacites, source, puit) -> np.ndarray:
+    """Réduction série-parallèle, qui refuse les autres réseaux."""
+    flots = flot_serie_parallele(nb_sommets, origines, destinations, capacites, source, puit)
+    if flots is None:
+        raise ValueError("Le réseau n'est pas série-parallèle.")
+    return flots
+
+
+@enregistre_moteur("networkx")
+def _networkx(nb_sommets, origines, destinations, capacites, source, puit) -> np.ndarray:
+    """Algorithme par défaut de nx.maximum_flow, les arrêtes parallèles étant regroupées."""
+    import networkx as nx
+    graphe = nx.DiGraph()
+    graphe.add_nodes_from((source, puit))
+    for depart, arrivee, capacite in zip(origines.tolist(), destinations.tolist(), capacites.tolist()):
+        if graphe.has_edge(depart, arrivee):
+            graphe[depart][arrivee]["capacity"] += capacite
+        else:
+            graphe.add_edge(depart, arrivee, capacity=capacite)
+    _, flots = nx.maximum_flow(graphe, source, puit)
+    flots_nets = {
+        (depart, arrivee): flot - flots.get(arrivee, dict()).get(depart, 0.)
+        for depart, voisins in flots.items() for arrivee, flot in voisins.items()
+    }
+    return _repartit(origines, destinations, capacites, flots_nets)
+
+
+@enregistre_moteur("scipy")
+def _scipy(nb_sommets, origines, destinations, capacites, source, puit) -> np.ndarray:
+    """scipy.sparse.csgraph.maximum_flow (Dinic compilé) sur les capacités multipliées par une puissance de dix."""
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import maximum_flow
+    facteur = _facteur_entier(capacites, origines, destinations)
+    if facteur == 0:
+        raise ValueError(
+            "Le moteur scipy demande des capacités entières après multiplication par une puissance de dix, "
+            "dont la somme sur des canalisations parallèles tient sur 32 bits."
+        )
+    matrice = csr_matrix(
+        (np.round(capacites * facteur).astype(np.int32), (origines, destinations)), shape=(nb_sommets, nb_sommets)
+    )
+    flots = maximum_flow(matrice, source, puit, method="dinic").flow.tocoo()
+    flots_nets = {
+        (depart, arrivee): flot / facteur
+        for depart, arrivee, flot in zip(flots.row.tolist(), flots.col.tolist(), flots.data.tolist())
+    }
+    return _repartit(origines, destinations, capacites, flots_nets)
+
+
+def moteur_demande(moteur: str = None) -> str:
+    """Renvoie le moteur demandé : `moteur`, sinon le moteur configuré, celui de ADDUCTION_EAU_MOTEUR ou "automatique"."""
+    return moteur or _MOTEUR_CONFIGURE or os.environ.get("ADDUCTION_EAU_MOTEUR") or "automatique"
+
+
+def _scipy_disponible() -> bool:
+    """Indique si scipy est installé."""
+    try:
+        import scipy.sparse.csgraph
+    except ImportError:
+        return False
+    return True
+
+
+def choisit_moteur(nb_sommets: int, capacites: np.ndarray, serie_parallele: bool = True,
+                   origines: np.ndarray = None, destinations: np.ndarray = None) -> str:
+    """Choisit le moteur le plus rapide d'après la taille du réseau et ses capacités.
+
+    Un réseau peu maillé (moins de `MAILLAGE_SERIE_PARALLELE` arrêtes par sommet), comme
+    un arbre, est d'abord confié à la réduction série-parallèle, que `calcule_flot`
+    remplace par un moteur général si elle échoue. Parmi les moteurs généraux, scipy est
+    le plus rapide à partir de `SEUIL_SCIPY` arrêtes s'il est installé et si les capacités
+    se ramènent à des entiers sur 32 bits, y compris la somme des canalisations parallèles
+    quand `origines` et `destinations` sont données ; sinon le moteur natif l'est. networkx, plus lent que le
+    moteur natif, n'est jamais choisi automatiquement.
+
+    Exemple :
+>>> import numpy as np
+>>> from Adduction_eau.moteurs import choisit_moteur
+>>> choisit_moteur(1000, np.ones(1200))
+'serie_parallele'
+>>> choisit_moteur(1000, np.ones(5000))
+'scipy'
+>>> choisit_moteur(1000, np.full(5000, 0.1234567891))
+'natif'
+    """
+    if serie_parallele and len(capacites) < MAILLAGE_SERIE_PARALLELE * nb_sommets:
+        return "serie_parallele"
+    if len(capacites) >= SEUIL_SCIPY and _facteur_entier(capacites, origines, destinations) and _scipy_disponible():
+        return "scipy"
+    return "natif"
+
+
+def calcule_flot(nb_sommets: int, origines, destinations, capacites, source: int, puit: int,
+                 moteur: str = None) -> Tuple[np.ndarray, Dict[str, float]]:
+    """Calcule le flot maximal avec le moteur demandé et renvoie le flot de chaque arrête et la mesure du calcul.
+
+    Sans `moteur`, le moteur configuré par `configure_moteur`, puis celui de la variable
+    d'environnement ADDUCTION_EAU_MOTEUR, puis le choix automatique sont utilisés. Le
+    choix automatique passe à un moteur général si la réduction série-parallèle échoue.
+    La mesure donne le moteur effectivement utilisé et la durée du calcul en secondes.
+
+    Exemple :
+>>> from Adduction_eau.moteurs import calcule_flot
+>>> for moteur in ["natif", "networkx", "scipy"]:
+...     flots, mesure = calcule_flot(4, [0, 0, 1, 2], [1, 2, 3, 3], [10., 4., 3., 8.], 0, 3, moteur)
+...     print(mesure["moteur"], flots)
+natif [3. 4. 3. 4.]
+networkx [3. 4. 3. 4.]
+scipy [3. 4. 3. 4.]
+    """
+    moteur = moteur_demande(moteur)
+    origines = np.asarray(origines, dtype=np.int64)
+    destinations = np.asarray(destinations, dtype=np.int64)
+    capacites = np.asarray(capacites, dtype=np.float64)
+    automatique = moteur == "automatique"
+    if automatique:
+        moteur = choisit_moteur(nb_sommets, capacites, origines=origines, destinations=destinations)
+    if moteur not in MOTEURS:
+        raise ValueError(f"Le moteur {moteur} n'existe pas ; moteurs disponibles : {sorted(MOTEURS)}.")
+    debut = time.perf_counter()
+    if automatique and moteur == "serie_parallele":
+        flots = flot_serie_parallele(nb_sommets, origines, destinations, capacites, source, puit)
+        if flots is None:
+            moteur = choisit_moteur(nb_sommets, capacites, False, origines, destinations)
+            flots = MOTEURS[moteur](nb_sommets, origines, destinations, capacites, source, puit)
+    else:
+        flots = MOTEURS[moteur](nb_sommets, origines, destinations, capacites, source, puit)
+    return flots, {"moteur": moteur, "duree": time.perf_counter() - debut}
@@ -0,0 +1,225 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Outils de calcul en parallèle : les tableaux décrivant un réseau sont placés une
+seule fois en mémoire partagée, puis chaque processus de calcul s'y rattache au
+lieu de recevoir une copie de ces tableaux avec chaque tâche.
+
+Fonctions principales :
+- execute_en_parallele
+- graphe_partage
+
+Fonctions secondaires :
+- _initialise
+- _execute
+
+Classes :
+- TopologiePartagee
+- GroupeDeCalcul
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+import itertools
+import os
+import numpy as np
+from Adduction_eau.flot import GrapheResiduel
+
+
+_TABLEAUX = dict()
+_GRAPHES: Dict[Tuple[int, int], GrapheResiduel] = dict()
+_GENERATIONS = itertools.count()
+
+
+class TopologiePartagee:
+    """Tableaux numpy copiés dans un unique bloc de mémoire partagée.
+
+    La description renvoyée par `description()` est légère et permet à un autre
+    processus de retrouver les tableaux avec `TopologiePartagee.attache`.
+
+    Exemple :
+>>> import numpy as np
+>>> from Adduction_eau.parallele import TopologiePartagee
+>>> with TopologiePartagee({"capacites": np.array([1., 2.])}) as topologie:
+...     _, tableaux = TopologiePartagee.attache(topologie.description())
+...     tableaux["capacites"]
+array([1., 2.])
+    """
+    def __init__(self, tableaux: Dict[str, np.ndarray]):
+        disposition = dict()
+        taille = 0
+        for nom, tableau in tableaux.items():
+            tableau = np.ascontiguousarray(tableau)
+            taille = -(-taille // 8) * 8
+            disposition[nom] = (tableau.dtype.str, tableau.shape, taille)
+            taille += tableau.nbytes
+        self.memoire = shared_memory.SharedMemory(create=True, size=max(taille, 1))
+        self.disposition = disposition
+        self.tableaux = TopologiePartagee._vues(self.memoire, disposition)
+        for nom, tableau in tableaux.items():
+            self.tableaux[nom][...] = tableau
+
+
+    def __enter__(self) -> "TopologiePartagee":
+        return self
+
+
+    def __exit__(self, *exception) -> None:
+        self.libere()
+
+
+    def description(self) -> Tuple[str, Dict[str, Tuple[str, Tuple[int, ...], int]]]:
+        """Renvoie le nom du bloc partagé et la position de chaque tableau."""
+        return self.memoire.name, self.disposition
+
+
+    @staticmethod
+    def _vues(memoire: shared_memory.SharedMemory, disposition) -> Dict[str, np.ndarray]:
+        """Construit les tableaux numpy pointant dans le bloc partagé."""
+        return {
+            nom: np.ndarray(forme, dtype=np.dtype(type_), buffer=memoire.buf, offset=decalage)
+            for nom, (type_, forme, decalage) in disposition.items()
+        }
+
+
+    @staticmethod
+    def attache(description) -> Tuple[shared_memory.SharedMemory, Dict[str, np.ndarray]]:
+        """Se rattache à un bloc partagé existant et renvoie le bloc et ses tableaux."""
+        nom, disposition = description
+        memoire = shared_memory.SharedMemory(name=nom)
+        return memoire, TopologiePartagee._vues(memoire, disposition)
+
+
+    def libere(self) -> None:
+        """Libère le bloc partagé."""
+        self.tableaux = dict()
+        self.memoire.close()
+        self.memoire.unlink()
+
+
+def _initialise(description) -> None:
+    """Rattache un processus de calcul aux tableaux partagés."""
+    memoire, tableaux = TopologiePartagee.attache(description)
+    _TABLEAUX["memoire"] = memoire
+    _TABLEAUX["tableaux"] = tableaux
+
+
+def _execute(fonction: Callable, lot: List) -> List:
+    """Applique la fonction à chaque tâche d'un lot avec les tableaux partagés."""
+    return [fonction(_TABLEAUX["tableaux"], tache) for tache in lot]
+
+
+class GroupeDeCalcul:
+    """Processus de calcul rattachés aux mêmes tableaux partagés, réutilisables entre plusieurs appels.
+
+    Avec un seul processus, les tâches sont calculées ici même, sans mémoire partagée.
+    Les tableaux reçus par les tâches comprennent en plus un jeton `generation` propre
+    au groupe, qui désigne ces tableaux tant que le groupe n'est pas fermé ; ils ne
+    doivent pas être modifiés pendant ce temps.
+
+    Exemple :
+>>> import numpy as np
+>>> from Adduction_eau.parallele import GroupeDeCalcul
+>>> def somme(tableaux, facteur):
+...     return float(tableaux["valeurs"].sum() * facteur)
+>>> with GroupeDeCalcul({"valeurs": np.arange(4.)}, processus=1) as groupe:
+...     list(groupe.map(somme, [1, 2])), list(groupe.map(somme, [3]))
+([6.0, 12.0], [18.0])
+    """
+    def __init__(self, tableaux: Dict[str, np.ndarray], processus: int = None):
+        self.processus = processus or os.cpu_count() or 1
+        self.generation = (os.getpid(), next(_GENERATIONS))
+        self.tableaux = {**tableaux, "generation": np.array(self.generation, dtype=np.int64)}
+        self.topologie = None
+        self.executeur = None
+
+
+    def __enter__(self) -> "GroupeDeCalcul":
+        return self
+
+
+    def __exit__(self, *exception) -> None:
+        self.ferme()
+
+
+    def _demarre(self) -> None:
+        """Crée la mémoire partagée et les processus de calcul au premier besoin."""
+        if self.executeur is None:
+            self.topologie = TopologiePartagee(self.tableaux)
+            self.executeur = ProcessPoolExecutor(
+                self.processus, initializer=_initialise, initargs=(self.topologie.description(),)
+            )
+
+
+    def map(self, fonction: Callable, taches: Iterable, taille_lot: int = None) -> Iterator:
+        """Applique `fonction(tableaux, tache)` à chaque tâche et renvoie les résultats dans l'ordre."""
+        taches = list(taches)
+        processus = min(self.processus, len(taches))
+        if processus <= 1:
+            for tache in taches:
+                yield fonction(self.tableaux, tache)
+            return
+        self._demarre()
+        taille_lot = taille_lot or max(1, -(-len(taches) // (4 * processus)))
+        lots = [taches[debut:debut + taille_lot] for debut in range(0, len(taches), taille_lot)]
+        for resultats in self.executeur.map(_execute, [fonction] * len(lots), lots):
+            yield from resultats
+
+
+    def ferme(self) -> None:
+        """Arrête les processus de calcul, libère la mémoire partagée et oublie le graphe résiduel de ses tableaux."""
+        _GRAPHES.pop(self.generation, None)
+        if self.executeur is not None:
+            self.executeur.shutdown()
+            self.topologie.libere()
+            self.executeur, self.topologie = None, None
+
+
+def execute_en_parallele(fonction: Callable, tableaux: Dict[str, np.ndarray], taches: Iterable,
+                         processus: int = None, taille_lot: int = None) -> Iterator:
+    """Applique `fonction(tableaux, tache)` à chaque tâche et renvoie les résultats dans l'ordre.
+
+    Les tableaux sont placés une seule fois en mémoire partagée ; seules les tâches,
+    regroupées par lots, sont envoyées aux processus de calcul. La fonction doit être
+    définie au niveau d'un module. Avec un seul processus, tout est calculé ici même.
+
+    Exemple :
+>>> import numpy as np
+>>> from Adduction_eau.parallele import execute_en_parallele
+>>> def somme(tableaux, facteur):
+...     return float(tableaux["valeurs"].sum() * facteur)
+>>> list(execute_en_parallele(somme, {"valeurs": np.arange(4.)}, [1, 2], processus=1))
+[6.0, 12.0]
+    """
+    with GroupeDeCalcul(tableaux, processus) as groupe:
+        yield from groupe.map(fonction, taches, taille_lot)
+
+
+def graphe_partage(tableaux: Dict[str, np.ndarray]) -> GrapheResiduel:
+    """Renvoie le graphe résiduel décrit par les tableaux d'un groupe de calcul, construit une fois par processus.
+
+    Les tableaux donnent les arrêtes (`origines`, `destinations`, `capacites`), leur flot
+    (`flots`) et le nombre de sommets (`parametres[0]`). Le graphe est retrouvé grâce au
+    jeton `generation` du groupe, sans relire les tableaux, et oublié à la fermeture du
+    groupe. Les tâches doivent le copier avant de le modifier.
+
+    Exemple :
+>>> import numpy as np
+>>> from Adduction_eau.parallele import GroupeDeCalcul, graphe_partage
+>>> def flot(tableaux, tache):
+...     return graphe_partage(tableaux).copie().pousse(*tache)
+>>> tableaux = {"origines": np.array([0, 1]), "destinations": np.array([1, 2]), "capacites": np.array([5., 3.]),
+...             "flots": np.zeros(2), "parametres": np.array([3])}
+>>> with GroupeDeCalcul(tableaux, processus=1) as groupe:
+...     list(groupe.map(flot, [(0, 2), (0, 1)]))
+[3.0, 5.0]
+    """
+    generation = tuple(tableaux["generation"].tolist())
+    if generation not in _GRAPHES:
+        _GRAPHES[generation] = GrapheResiduel(
+            int(tableaux["parametres"][0]), tableaux["origines"], tableaux["destinations"],
+            tableaux["capacites"], tableaux["flots"]
+        )
+    return _GRAPHES[generation]
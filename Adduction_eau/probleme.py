@@ -5,28 +5,70 @@
 Classe Probleme permettant de décrire le problème d'adduction d'eau.
 """
 
-from typing import Tuple, List, Any
-from rich.table import Table
+from typing import IO, Tuple, List, Any, Union
+import csv
+import hashlib
+import json
+import os
 import numpy as np
 import pandas as pd
+from Adduction_eau.canalisations import Canalisations
+from Adduction_eau.table import TableCreuse
 
 
 class Probleme:
-    """Crée un graphe pour l'adduction d'eau."""
-    def __init__(self, reseau):
-        self._reseau = reseau
-        self._enleve_doublons()
-        self._est_valide()
+    """Crée un graphe pour l'adduction d'eau.
+    
+    `attributs` donne, dans l'ordre des canalisations, leurs attributs supplémentaires
+    (diamètre, longueur, matériau...) ; ils ne changent pas le calcul et sont recopiés
+    dans les résultats en colonnes (voir `Adduction_eau.colonnes`). Le réseau n'est pas
+    validé si `verifie` vaut False (voir `depuis_canalisations`).
+    """
+    def __init__(self, reseau, attributs: pd.DataFrame = None, *, verifie: bool = True):
+        if isinstance(reseau, Canalisations):
+            self._canalisations = reseau
+        else:
+            self._canalisations = Canalisations.depuis_tuples(reseau)
+        if attributs is not None and len(attributs) != len(self._canalisations):
+            raise ValueError(
+                f"Les attributs décrivent {len(attributs)} canalisations au lieu de {len(self._canalisations)}."
+            )
+        self.attributs = attributs
+        self._empreinte = None
+        if verifie:
+            self._est_valide()
+        
+    
+    @classmethod
+    def depuis_canalisations(cls, canalisations: Canalisations, attributs: pd.DataFrame = None,
+                             verifie: bool = False) -> "Probleme":
+        """Constructeur alternatif à partir de canalisations déjà validées, par exemple relues d'un fichier.
+        
+        Le réseau n'est revalidé que si `verifie` est vrai.
         
+        Exemple :
+>>> from Adduction_eau import Probleme
+>>> from Adduction_eau.canalisations import Canalisations
+>>> Probleme.depuis_canalisations(Canalisations.depuis_tuples([("source", "puit", 4)]))
+Probleme(reseau=[('source', 'puit', 4)])
+        """
+        return cls(canalisations, attributs, verifie=verifie)
+    
+    
+    @property
+    def _reseau(self) -> List[Tuple[str, str, int]]:
+        """Vue historique du réseau sous forme de liste de tuples."""
+        return self._canalisations.tuples()
+    
     
     def __repr__(self) -> str:
         """Renvoie la liste de construction."""
-        return f"Probleme(reseau={list(self._reseau) !r})"
+        return f"Probleme(reseau={self._reseau !r})"
     
     
     def __str__(self) -> List[Tuple[str, str, int]]:
         """Affiche les canalisations par ligne."""
-        return "\n".join(repr(debit) for debit in self._reseau)
+        return "\n".join(repr(debit) for debit in self._canalisations)
     
     
     @staticmethod
@@ -44,6 +86,19 @@ class Probleme:
         except ValueError:
             capacite_valide = float(capacite.strip())
         return (initial.replace(" ", ""), arrivee.replace(" ", ""), capacite_valide)
+    
+    
+    @staticmethod
+    def _encode_capacite(texte: str) -> Union[int, float, None]:
+        """Encode une capacité comme `_encode`, ou renvoie None si elle est invalide."""
+        try:
+            return int(texte.strip())
+        except ValueError:
+            pass
+        try:
+            return float(texte.strip())
+        except ValueError:
+            return None
         
     
     
@@ -85,47 +140,220 @@ class Probleme:
 Probleme(reseau=[('source', 'A', 15), ('source', 'B', 15), ('source', 'C', 15), ('source', 'D', 10), ('C', 'A', 5), ('C', 'F', 5), ('A', 'E', 7), ('B', 'F', 10), ('B', 'G', 7), ('D', 'G', 10), ('E', 'F', 5), ('E', 'H', 4), ('E', 'I', 15), ('F', 'G', 5), ('F', 'I', 15), ('G', 'I', 15), ('H', 'J', 7), ('I', 'K', 30), ('I', 'L', 4), ('K', 'J', 10), ('J', 'puit', 15), ('K', 'puit', 20), ('L', 'puit', 15)])
         """
         reseau = list()
-        for ligne in message.strip().splitlines():
-            reseau.append(cls._encode(ligne))
+        for numero, ligne in enumerate(message.strip().splitlines(), start=1):
+            try:
+                reseau.append(cls._encode(ligne))
+            except ValueError:
+                raise ValueError(f"La ligne {numero} ne respecte pas la syntaxe DEPART / ARRIVEE / CAPACITE : {ligne!r}")
         return cls(reseau)
     
     
+    @classmethod
+    def depuis_fichier(cls, fichier: Union[str, os.PathLike, IO], taille_bloc: int = 1_000_000) -> "Probleme":
+        """Constructeur alternatif lisant un fichier texte au format DEPART / ARRIVEE / CAPACITE.
+        
+        Le fichier est lu par blocs de `taille_bloc` lignes avec le lecteur CSV de pandas,
+        sans passer par des tuples Python. `fichier` peut être un chemin (les fichiers
+        `.gz`, `.bz2`, `.xz` ou `.zip` sont décompressés à la volée) ou tout objet
+        fichier, par exemple `gzip.open(chemin, "rt")`. Les lignes vides sont ignorées
+        et les numéros de ligne des erreurs comptent les canalisations.
+        
+        Exemple :
+>>> import io
+>>> from Adduction_eau import Probleme
+
+>>> Probleme.depuis_fichier(io.StringIO('''
+... source / A / 15
+... A / puit / 10.5
+... '''))
+Probleme(reseau=[('source', 'A', 15), ('A', 'puit', 10.5)])
+        """
+        numeros = dict()
+        origines, destinations, capacites, entieres = list(), list(), list(), list()
+        lignes_lues = 0
+        blocs = pd.read_csv(
+            fichier, sep="/", header=None, names=["initial", "arrivee", "capacite"],
+            dtype=str, quoting=csv.QUOTE_NONE, skip_blank_lines=True, chunksize=taille_bloc
+        )
+        for bloc in blocs:
+            incompletes = bloc["arrivee"].isna() | bloc["capacite"].isna()
+            if incompletes.any():
+                vides = incompletes & bloc["arrivee"].isna() & bloc["initial"].fillna("").str.strip().eq("")
+                bloc = bloc[~vides]
+                incompletes = incompletes[~vides]
+            codes_capacites, textes_capacites = pd.factorize(bloc["capacite"])
+            valeurs_capacites = [cls._encode_capacite(texte) for texte in textes_capacites]
+            invalides = np.flatnonzero(
+                incompletes.to_numpy()
+                | np.isin(codes_capacites, [code for code, valeur in enumerate(valeurs_capacites) if valeur is None])
+            )
+            if len(invalides) > 0:
+                position = invalides[0]
+                ligne = "/".join(bloc.iloc[position].dropna())
+                raise ValueError(
+                    f"La ligne {lignes_lues + position + 1} ne respecte pas la syntaxe "
+                    f"DEPART / ARRIVEE / CAPACITE : {ligne!r}"
+                )
+            codes, noms = pd.factorize(np.column_stack([
+                bloc["initial"].to_numpy(dtype=object), bloc["arrivee"].to_numpy(dtype=object)
+            ]).ravel())
+            correspondance = np.array(
+                [numeros.setdefault(nom.replace(" ", ""), len(numeros)) for nom in noms], dtype=np.int32
+            )
+            numerotes = correspondance[codes]
+            origines.append(numerotes[0::2])
+            destinations.append(numerotes[1::2])
+            capacites.append(np.array(valeurs_capacites, dtype=np.float64)[codes_capacites])
+            entieres.append(np.array(
+                [isinstance(valeur, int) for valeur in valeurs_capacites], dtype=bool
+            )[codes_capacites])
+            lignes_lues += len(bloc)
+        if lignes_lues == 0:
+            return cls(list())
+        return cls(Canalisations(
+            list(numeros),
+            np.concatenate(origines),
+            np.concatenate(destinations),
+            np.concatenate(capacites),
+            np.concatenate(entieres)
+        ))
+    
+    
+    @classmethod
+    def depuis_parquet(cls, chemin: Union[str, os.PathLike], initial: str = "initial", arrivee: str = "arrivee",
+                       capacite: str = "capacite", attributs: List[str] = None) -> "Probleme":
+        """Constructeur alternatif lisant un fichier Parquet, une canalisation par ligne.
+        
+        Les colonnes `initial`, `arrivee` et `capacite` décrivent les canalisations ; les
+        colonnes `attributs` (par défaut toutes les autres) sont gardées dans `attributs`.
+        Demande pyarrow (voir `Adduction_eau.colonnes`).
+        """
+        from Adduction_eau.colonnes import lit_parquet
+        return lit_parquet(chemin, initial, arrivee, capacite, attributs)
+    
+    
+    @classmethod
+    def charge(cls, chemin: Union[str, os.PathLike], verifie: bool = False) -> "Probleme":
+        """Constructeur alternatif ouvrant un fichier binaire écrit par `sauvegarde`.
+        
+        Les tableaux des canalisations sont projetés en mémoire depuis le fichier sans
+        être copiés ni revalidés (voir `Adduction_eau.stockage`).
+        
+        Exemple :
+>>> import os, tempfile
+>>> from Adduction_eau import Probleme
+
+>>> chemin = os.path.join(tempfile.mkdtemp(), "reseau.adduction")
+>>> Probleme.par_str('''
+... source / A / 15
+... A / puit / 10.5
+... ''').sauvegarde(chemin)
+>>> Probleme.charge(chemin)
+Probleme(reseau=[('source', 'A', 15), ('A', 'puit', 10.5)])
+        """
+        from Adduction_eau.stockage import charge
+        return charge(chemin, verifie)
+    
+    
+    def sauvegarde(self, chemin: Union[str, os.PathLike]) -> None:
+        """Écrit le réseau au format binaire relu par `charge`."""
+        from Adduction_eau.stockage import sauvegarde
+        sauvegarde(self, chemin)
+    
+    
+    def _forme_canonique(self) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Renvoie le réseau sous une forme qui ne dépend pas de l'ordre de saisie.
+        
+        Les sommets sont renumérotés dans l'ordre de leurs noms et les canalisations triées
+        par départ puis arrivée ; le tri étant stable, une canalisation répétée garde l'ordre
+        de ses occurrences, dont la dernière fixe la capacité. Renvoie les noms triés, les
+        départs, arrivées et capacités triés et la position de chaque canalisation triée.
+        """
+        canalisations = self._canalisations
+        noms = sorted(canalisations.noms)
+        rangs = np.empty(len(noms), dtype=np.int64)
+        rangs[sorted(range(len(noms)), key=canalisations.noms.__getitem__)] = np.arange(len(noms))
+        origines, destinations = rangs[canalisations.origines], rangs[canalisations.destinations]
+        ordre = np.lexsort((destinations, origines))
+        return noms, origines[ordre], destinations[ordre], canalisations.capacites[ordre] + 0., ordre
+    
+    
+    def empreinte(self) -> str:
+        """Renvoie une empreinte du contenu du réseau, indépendante de l'ordre des canalisations.
+        
+        Deux réseaux égaux ont la même empreinte, qui sert de clé au cache des résultats
+        (voir `Adduction_eau.cache`). Les attributs des canalisations n'en font pas partie.
+        
+        Exemple :
+>>> from Adduction_eau import Probleme
+>>> premier = Probleme([("source", "A", 15), ("A", "puit", 10)])
+>>> second = Probleme([("A", "puit", 10.), ("source", "A", 15)])
+>>> premier == second, premier.empreinte() == second.empreinte(), len({premier, second})
+(True, True, 1)
+        """
+        if self._empreinte is None:
+            noms, origines, destinations, capacites, _ = self._forme_canonique()
+            condensat = hashlib.sha256(json.dumps(noms, ensure_ascii=False).encode("utf-8"))
+            for tableau in (origines.astype("<i8"), destinations.astype("<i8"), capacites.astype("<f8")):
+                condensat.update(tableau.tobytes())
+            self._empreinte = condensat.hexdigest()
+        return self._empreinte
+    
+    
+    def __hash__(self) -> int:
+        """Renvoie un hash tiré de l'empreinte."""
+        return int(self.empreinte()[:16], 16)
+    
+    
     def __eq__(self, autre: Any) -> bool:
-        """Teste l'égalité de 2 réseaux."""
+        """Teste l'égalité de 2 réseaux, quel que soit l'ordre de leurs canalisations."""
         if type(autre) != type(self):
             return False
-        return self._reseau == autre._reseau
+        if self._empreinte is not None and autre._empreinte is not None:
+            return self._empreinte == autre._empreinte
+        return all(
+            np.array_equal(gauche, droite) if isinstance(gauche, np.ndarray) else gauche == droite
+            for gauche, droite in zip(self._forme_canonique()[:4], autre._forme_canonique()[:4])
+        )
     
     
     def _est_valide(self) -> None:
-        """Vérifie que la capacite est positive."""
-        for debit in self._reseau:
-            if debit[2] < 0:
-                raise ValueError("Toutes les capacités doivent être positives.")
-                
-    
-    def _enleve_doublons(self) -> None:
-        """Empêche de mettre des doublons."""
-        deja_passer = list()
-        for canalisation in self._reseau:
-            if canalisation in deja_passer:
-                raise ValueError(f"La canalisation {canalisation} est présente deux fois!")
-            else:
-                 deja_passer.append(canalisation)
+        """Vérifie en un seul passage que les capacités sont positives et qu'il n'y a pas de doublon.
+        
+        Les erreurs indiquent le numéro de ligne (à partir de 1) des canalisations fautives.
+        """
+        canalisations = self._canalisations
+        if not np.any(canalisations.capacites < 0):
+            ordre = np.lexsort((canalisations.capacites, canalisations.destinations, canalisations.origines))
+            cles = [colonne[ordre] for colonne in (
+                canalisations.origines, canalisations.destinations, canalisations.capacites
+            )]
+            if not np.any(np.logical_and.reduce([colonne[1:] == colonne[:-1] for colonne in cles])):
+                return
+        deja_passer = dict()
+        for ligne, cle in enumerate(zip(
+            canalisations.origines.tolist(),
+            canalisations.destinations.tolist(),
+            canalisations.capacites.tolist()
+        ), start=1):
+            if cle[2] < 0:
+                raise ValueError(
+                    f"Toutes les capacités doivent être positives (ligne {ligne} : {canalisations[ligne - 1]})."
+                )
+            premiere = deja_passer.setdefault(cle, ligne)
+            if premiere != ligne:
+                raise ValueError(
+                    f"La canalisation {canalisations[ligne - 1]} est présente deux fois "
+                    f"(lignes {premiere} et {ligne})!"
+                )
     
     
     def recupere_sommets(self) -> List:
         """Récupère tous les sommets rentrés."""
-        liste_sommets = list()
-        for initial, arrivee, _ in self._reseau:
-            if initial not in liste_sommets:
-                liste_sommets.append(initial)
-            if arrivee not in liste_sommets:
-                liste_sommets.append(arrivee)
-        return liste_sommets
+        return list(self._canalisations.noms)
         
     
-    def _genere_table(self) -> Table:
+    def _genere_table(self) -> "Table":
         """Renvoie un résumé du réseau rich.
         
         Exemple :
@@ -190,11 +418,12 @@ Probleme(reseau=[('source', 'A', 15), ('source', 'B', 15), ('source', 'C', 15),
 │ L       │ puit    │ 15       │
 └─────────┴─────────┴──────────┘
         """
+        from rich.table import Table
         resultat = Table(title="Problème d'adduction d'eau")
         resultat.add_column("Initial")
         resultat.add_column("Arrivée")
         resultat.add_column("Capacité")
-        for debit in self._reseau:
+        for debit in self._canalisations:
             resultat.add_row(
                 debit[0], str(debit[1]), str(debit[2])
             )
@@ -321,19 +550,57 @@ Probleme(reseau=[('source', 'A', 15), ('source', 'B', 15), ('source', 'C', 15),
 | K    | 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|10.0| 0.0| 0.0|20.0|
 | L    | 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0| 0.0|15.0|
         """
-        ligne = self.recupere_sommets()
-        ligne.remove("puit")
-        colonne = self.recupere_sommets()
-        colonne.remove("source")
-        tableau = pd.DataFrame(
-            data=np.zeros((len(ligne), len(colonne))),
-            index=ligne,
-            columns=colonne
+        return self.table_creuse().en_dataframe()
+    
+    
+    def table_creuse(self) -> TableCreuse:
+        """Ressort la table de départ sous forme creuse, indexée par numéro de sommet.
+        
+        Exemple :
+>>> from Adduction_eau import Probleme
+
+>>> probleme = Probleme.par_str(
+...    '''
+... source / A / 15
+... A / puit / 10
+... '''
+... )
+
+>>> probleme.table_creuse()
+TableCreuse(sommets=3, aretes=2)
+        """
+        canalisations = self._canalisations
+        gardees = canalisations.dernieres_occurrences()
+        return TableCreuse(
+            canalisations.noms,
+            canalisations.origines[gardees],
+            canalisations.destinations[gardees],
+            canalisations.capacites[gardees]
         )
-        for depart, arrivee, flot_max in self._reseau:
-            tableau.loc[depart, arrivee] = flot_max
-        tableau = tableau.fillna(0);
-        return tableau
+    
+    
+    def resoudre(self, moteur: str = None) -> "Solution":
+        """Renvoie la solution du problème, dont les étapes sont calculées à la demande puis mémorisées.
+        
+        Le flot maximal est calculé par le moteur `moteur` (voir `Adduction_eau.moteurs`),
+        par défaut celui qui est configuré ou choisi automatiquement.
+        
+        Exemple :
+>>> from Adduction_eau import Probleme
+
+>>> solution = Probleme.par_str(
+...    '''
+... source / A / 15
+... A / puit / 10
+... B / puit / 5
+... '''
+... ).resoudre()
+
+>>> solution.villes_non_alimentees
+[('B', 5)]
+        """
+        from Adduction_eau.algorithme import Solution
+        return Solution(self, moteur)
     
     
     @staticmethod
@@ -421,19 +688,25 @@ Probleme(reseau=[('source', 'A', 15), ('source', 'B', 15), ('source', 'C', 15),
 [('A', 'E'), ('E', 'H'), ('I', 'L')]
         """
         capacites_insuffisantes = list()
-        table = self.table_depart()
-        non_nulle = self._recupere_noeud_non_alimente_par_source(table)
-        sommets = self.recupere_sommets()
-        sommets.remove("source")
-        liste_sommets = list()
-        for valeur in non_nulle:
-            liste_sommets.append(sommets[valeur])
-        sommets.remove("puit")
-        flot_minimal_ville = min(i for i in table.loc[:,"puit"] if i > 0)
-        for arrivee in liste_sommets:
-            if sum(table.loc[:, arrivee]) < flot_minimal_ville:
-                for depart in sommets:
-                    if table.loc[depart, arrivee] != 0:
-                        capacites_insuffisantes.append((depart, arrivee))
+        table = self.table_creuse()
+        source, puit = table.numero("source"), table.numero("puit")
+        origines, destinations, valeurs = table.non_nulles()
+        alimentes = set(destinations[origines == source].tolist())
+        entrees_puit = valeurs[destinations == puit]
+        entrees_puit = entrees_puit[entrees_puit > 0]
+        if len(entrees_puit) == 0:
+            raise ValueError("Au moins une ville doit être reliée au puit.")
+        flot_minimal_ville = entrees_puit.min()
+        sommes = np.bincount(table.destinations, weights=table.valeurs, minlength=len(table.sommets))
+        entrantes = dict()
+        for depart, arrivee in zip(origines.tolist(), destinations.tolist()):
+            if depart not in (source, puit):
+                entrantes.setdefault(arrivee, list()).append(depart)
+        for arrivee in range(len(table.sommets)):
+            if arrivee == source or arrivee in alimentes:
+                continue
+            if sommes[arrivee] < flot_minimal_ville:
+                for depart in sorted(entrantes.get(arrivee, list())):
+                    capacites_insuffisantes.append((table.sommets[depart], table.sommets[arrivee]))
         return capacites_insuffisantes
-    
\ No newline at end of file
+    
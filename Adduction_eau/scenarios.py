@@ -0,0 +1,106 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Résolution en parallèle de nombreuses variantes d'un même réseau : chaque scénario
+modifie la capacité de quelques canalisations (ou la demande d'une ville sur son
+arrête vers le puit) et son flot maximal est calculé par un processus de calcul.
+
+Fonctions principales :
+- resout_scenarios
+
+Fonctions secondaires :
+- _taches
+- _resout_scenario
+"""
+
+from typing import Dict, List, Tuple
+from Adduction_eau import Probleme
+from Adduction_eau.flot import GrapheResiduel
+from Adduction_eau.parallele import execute_en_parallele
+from Adduction_eau.table import TableCreuse
+import numpy as np
+import pandas as pd
+
+
+def _taches(table: TableCreuse, scenarios: List[Dict[Tuple[str, str], float]]) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Traduit chaque scénario en positions d'arrêtes et nouvelles capacités."""
+    taches = list()
+    for numero, scenario in enumerate(scenarios):
+        positions = np.empty(len(scenario), dtype=np.int64)
+        valeurs = np.empty(len(scenario), dtype=np.float64)
+        for rang, (arrete, capacite) in enumerate(scenario.items()):
+            positions[rang] = table._position(arrete)
+            if positions[rang] < 0:
+                raise ValueError(f"Scénario {numero} : la canalisation {arrete} n'existe pas dans le réseau de base.")
+            if capacite < 0:
+                raise ValueError(f"Scénario {numero} : la capacité de {arrete} doit être positive.")
+            valeurs[rang] = capacite
+        taches.append((positions, valeurs))
+    return taches
+
+
+def _resout_scenario(tableaux: Dict[str, np.ndarray], tache: Tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+    """Calcule les flots maximaux du réseau partagé dont quelques capacités sont remplacées."""
+    positions, valeurs = tache
+    nb_sommets, source, puit = tableaux["parametres"].tolist()
+    capacites = tableaux["capacites"].copy()
+    capacites[positions] = valeurs
+    graphe = GrapheResiduel(nb_sommets, tableaux["origines"], tableaux["destinations"], capacites)
+    graphe.pousse(source, puit)
+    return graphe.flots
+
+
+def resout_scenarios(probleme: Probleme, scenarios: List[Dict[Tuple[str, str], float]],
+                     processus: int = None) -> pd.DataFrame:
+    """Calcule les flots maximaux et les demandes non satisfaites de chaque scénario.
+
+    Un scénario est un dictionnaire {(départ, arrivée): capacité} remplaçant la capacité
+    de canalisations du problème de base ; modifier une arrête vers le puit modifie la
+    demande d'une ville. Le réseau de base est placé une seule fois en mémoire partagée
+    et les scénarios sont répartis sur `processus` processus (tous les cœurs par défaut).
+
+    Renvoie une table avec une ligne par scénario et, en colonnes, le flot de chaque
+    canalisation ("flot", départ, arrivée) puis le déficit de chaque ville ("deficit", ville, "puit").
+
+    Exemple :
+>>> from Adduction_eau import Probleme
+>>> from Adduction_eau.scenarios import resout_scenarios
+>>> probleme = Probleme([("source", "A", 10), ("A", "puit", 8), ("source", "B", 5), ("B", "puit", 6)])
+>>> resout_scenarios(probleme, [{}, {("A", "puit"): 12}, {("source", "B"): 0}], processus=1)
+grandeur   flot                   deficit
+depart   source     A source    B       A    B
+arrivee       A  puit      B puit    puit puit
+scenario
+0           8.0   8.0    5.0  5.0     0.0  1.0
+1          10.0  10.0    5.0  5.0     2.0  1.0
+2           8.0   8.0    0.0  0.0     0.0  6.0
+    """
+    table = probleme.table_creuse()
+    if "source" not in table.sommets or "puit" not in table.sommets:
+        raise ValueError("Le réseau doit comprendre une source et un puit.")
+    taches = _taches(table, scenarios)
+    tableaux = {
+        "origines": table.origines,
+        "destinations": table.destinations,
+        "capacites": table.valeurs,
+        "parametres": np.array([len(table.sommets), table.numero("source"), table.numero("puit")], dtype=np.int64),
+    }
+    flots = np.array(list(execute_en_parallele(_resout_scenario, tableaux, taches, processus)), dtype=np.float64)
+    flots = flots.reshape(len(taches), len(table))
+
+    demandes = np.flatnonzero(table.destinations == table.numero("puit"))
+    capacites = np.tile(table.valeurs, (len(taches), 1))
+    for rang, (positions, valeurs) in enumerate(taches):
+        capacites[rang, positions] = valeurs
+    deficits = capacites[:, demandes] - flots[:, demandes]
+
+    sommets = table.sommets
+    colonnes = [("flot", sommets[depart], sommets[arrivee])
+                for depart, arrivee in zip(table.origines.tolist(), table.destinations.tolist())]
+    colonnes += [("deficit", sommets[table.origines[position]], "puit") for position in demandes.tolist()]
+    return pd.DataFrame(
+        np.hstack([flots, deficits]),
+        index=pd.RangeIndex(len(taches), name="scenario"),
+        columns=pd.MultiIndex.from_tuples(colonnes, names=["grandeur", "depart", "arrivee"]),
+    )
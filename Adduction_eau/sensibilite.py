@@ -0,0 +1,68 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Rapport de sensibilité des canalisations, tiré du graphe résiduel d'un seul calcul de
+flot maximal : pour chaque canalisation, on indique si l'augmenter ferait monter l'eau
+livrée aux villes et de combien au plus par cette seule canalisation.
+
+Fonctions principales :
+- rapport_sensibilite
+"""
+
+from typing import Union
+from Adduction_eau import Probleme
+from Adduction_eau.algorithme import Solution, _en_solution
+import numpy as np
+import pandas as pd
+
+
+def rapport_sensibilite(probleme: Union[Probleme, Solution]) -> pd.DataFrame:
+    """Classe chaque canalisation et estime le gain apporté par son augmentation.
+
+    Le statut d'une canalisation est :
+    - "coupe" si son origine est atteignable depuis la source et si le puit est
+      atteignable depuis sa destination dans le graphe résiduel : elle est sur une coupe
+      minimale et chaque unité de capacité ajoutée (`valeur_marginale` = 1) augmente le flot ;
+    - "sature" si elle est pleine sans être critique : l'augmenter seule ne sert à rien ;
+    - "libre" si elle n'est pas pleine (`marge` > 0).
+
+    `gain_max` est la plus petite des deux largeurs de chemin résiduel, de la source à
+    l'origine et de la destination au puit : c'est le gain assuré en augmentant cette
+    seule canalisation d'autant (infini pour une arrête directe de la source au puit),
+    calculé par deux recherches de plus larges chemins.
+
+    Exemple :
+>>> from Adduction_eau import Probleme
+>>> from Adduction_eau.sensibilite import rapport_sensibilite
+>>> probleme = Probleme([("source", "A", 10), ("A", "B", 2), ("source", "B", 3),
+...                      ("A", "puit", 5), ("B", "puit", 8)])
+>>> rapport_sensibilite(probleme)
+   depart arrivee  capacite  flot  marge statut  valeur_marginale  gain_max
+0  source       A      10.0   7.0    3.0  libre               0.0       0.0
+1  source       B       3.0   3.0    0.0  coupe               1.0       3.0
+2       A       B       2.0   2.0    0.0  coupe               1.0       3.0
+3       A    puit       5.0   5.0    0.0  coupe               1.0       3.0
+4       B    puit       8.0   5.0    3.0  libre               0.0       0.0
+    """
+    solution = _en_solution(probleme)
+    table, graphe = solution.table_creuse, solution.graphe
+    source, puit = table.numero("source"), table.numero("puit")
+    depuis_source = graphe.plus_larges(source)
+    vers_puit = graphe.plus_larges(puit, vers_depart=True)
+    origines, destinations = graphe.origines, graphe.destinations
+    flots = graphe.flots
+    marges = graphe.capacites - flots
+    critiques = (depuis_source[origines] > 0) & (vers_puit[destinations] > 0)
+    statuts = np.where(critiques, "coupe", np.where(marges > 0, "libre", "sature"))
+    sommets = table.sommets
+    return pd.DataFrame({
+        "depart": [sommets[sommet] for sommet in origines.tolist()],
+        "arrivee": [sommets[sommet] for sommet in destinations.tolist()],
+        "capacite": graphe.capacites,
+        "flot": flots,
+        "marge": marges,
+        "statut": statuts,
+        "valeur_marginale": critiques.astype(np.float64),
+        "gain_max": np.where(critiques, np.minimum(depuis_source[origines], vers_puit[destinations]), 0.),
+    })
@@ -0,0 +1,102 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Simulation de séries temporelles de demandes : la demande de chaque ville varie à
+chaque pas de temps (par exemple heure par heure sur une année) et l'eau qui manque
+à chaque ville est calculée pour chaque pas. Chaque pas repart du flot du pas
+précédent ; les pas sont découpés en blocs résolus en parallèle.
+
+Fonctions principales :
+- simule_demandes
+
+Fonctions secondaires :
+- _resout_bloc
+"""
+
+from typing import Dict, Tuple
+from Adduction_eau import Probleme
+from Adduction_eau.flot import GrapheResiduel
+from Adduction_eau.parallele import GroupeDeCalcul
+import numpy as np
+import pandas as pd
+
+
+def _resout_bloc(tableaux: Dict[str, np.ndarray], bloc: Tuple[int, int]) -> np.ndarray:
+    """Renvoie l'eau manquant à chaque ville pour les pas de temps `debut` à `fin` exclu."""
+    debut, fin = bloc
+    nb_sommets, source, puit = tableaux["parametres"].tolist()
+    aretes, demandes = tableaux["aretes"], tableaux["demandes"]
+    capacites = tableaux["capacites"].copy()
+    capacites[aretes] = demandes[debut]
+    graphe = GrapheResiduel(nb_sommets, tableaux["origines"], tableaux["destinations"], capacites)
+    graphe.pousse(source, puit)
+    manques = np.empty((fin - debut, len(aretes)))
+    for pas in range(debut, fin):
+        if pas > debut:
+            for rang in np.flatnonzero(demandes[pas] != demandes[pas - 1]).tolist():
+                graphe.modifie_capacite(aretes[rang], demandes[pas, rang], source, puit)
+            graphe.pousse(source, puit)
+        manques[pas - debut] = demandes[pas] - graphe.flots[aretes]
+    return manques
+
+
+def simule_demandes(probleme: Probleme, demandes: pd.DataFrame, taille_bloc: int = 168,
+                    processus: int = None, fichier: str = None) -> pd.DataFrame:
+    """Calcule l'eau manquant à chaque ville à chaque pas de temps d'une série de demandes.
+
+    `demandes` a une ligne par pas de temps et une colonne par ville ; chaque ville doit
+    avoir une arrête vers le puit dans le problème, dont la capacité est remplacée par
+    la demande du pas. Les villes absentes de `demandes` gardent leur demande du problème.
+
+    Les pas sont découpés en blocs de `taille_bloc` pas répartis sur `processus` processus.
+    Dans un bloc, chaque pas repart du flot du pas précédent et seules les demandes qui
+    changent sont modifiées. Si `fichier` est donné, les résultats y sont écrits au format
+    CSV au fur et à mesure que les blocs sont calculés.
+
+    Renvoie une table de même forme que `demandes` donnant l'eau manquante. Le total
+    manquant à chaque pas est celui du flot maximal ; lorsque plusieurs villes se
+    partagent une canalisation saturée, sa répartition entre elles n'est pas unique.
+
+    Exemple :
+>>> import pandas as pd
+>>> from Adduction_eau import Probleme
+>>> from Adduction_eau.series import simule_demandes
+>>> probleme = Probleme([("source", "A", 20), ("A", "B", 5), ("A", "puit", 6), ("B", "puit", 6)])
+>>> demandes = pd.DataFrame({"A": [2., 6., 8.], "B": [4., 6., 3.]})
+>>> simule_demandes(probleme, demandes, processus=1)
+     A    B
+0  0.0  0.0
+1  0.0  1.0
+2  0.0  0.0
+    """
+    table = probleme.table_creuse()
+    if "source" not in table.sommets or "puit" not in table.sommets:
+        raise ValueError("Le réseau doit comprendre une source et un puit.")
+    source, puit = table.numero("source"), table.numero("puit")
+    aretes = np.array([table._position((ville, "puit")) for ville in demandes.columns], dtype=np.int64)
+    if np.any(aretes < 0):
+        absentes = [ville for ville, arete in zip(demandes.columns, aretes.tolist()) if arete < 0]
+        raise ValueError(f"Les villes {absentes} ne sont pas reliées au puit.")
+    valeurs = demandes.to_numpy(dtype=np.float64)
+    if np.any(valeurs < 0):
+        raise ValueError("Les demandes doivent être positives.")
+    tableaux = {
+        "origines": table.origines,
+        "destinations": table.destinations,
+        "capacites": table.valeurs,
+        "aretes": aretes,
+        "demandes": valeurs,
+        "parametres": np.array([len(table.sommets), source, puit], dtype=np.int64),
+    }
+    blocs = [(debut, min(debut + taille_bloc, len(valeurs))) for debut in range(0, len(valeurs), taille_bloc)]
+    resultats = list()
+    with GroupeDeCalcul(tableaux, processus) as groupe:
+        for (debut, fin), manques in zip(blocs, groupe.map(_resout_bloc, blocs, taille_lot=1)):
+            resultat = pd.DataFrame(manques, index=demandes.index[debut:fin], columns=demandes.columns)
+            if fichier is not None:
+                resultat.to_csv(fichier, mode="w" if debut == 0 else "a", header=debut == 0)
+            resultats.append(resultat)
+    if not resultats:
+        return pd.DataFrame(columns=demandes.columns, index=demandes.index, dtype=np.float64)
+    return pd.concat(resultats)
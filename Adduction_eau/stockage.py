@@ -0,0 +1,171 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Format binaire des réseaux et de leurs solutions. Un fichier commence par une
+signature, la longueur de l'en-tête puis un en-tête JSON (noms des sommets,
+description des tableaux, rapport d'élagage), suivis des tableaux bruts alignés
+sur 64 octets. Les tableaux sont relus par `np.memmap` sans copie : des processus
+qui ouvrent le même fichier partagent ses pages et un grand réseau s'ouvre sans
+être relu ni revalidé.
+
+Tableaux :
+- origines, destinations : numéros des sommets de chaque canalisation (int32)
+- capacites : capacité de chaque canalisation (float64)
+- entieres : si la capacité a été saisie comme un entier (bool)
+- flots : flot maximal de chaque canalisation, pour une solution (float64)
+
+Fonctions principales :
+- sauvegarde
+- charge
+- charge_solution
+
+Fonctions secondaires :
+- _lit_entete
+- _tableau
+
+Classes :
+- _SolutionChargee
+"""
+
+from typing import Any, Dict, Tuple, Union
+from functools import cached_property
+import json
+import os
+import struct
+import numpy as np
+from Adduction_eau.algorithme import Solution, _en_solution, _flots_par_canalisation, _graphe_depuis_flots
+from Adduction_eau.canalisations import Canalisations
+from Adduction_eau.flot import GrapheResiduel
+from Adduction_eau.probleme import Probleme
+
+
+SIGNATURE = b"ADDEAU\x00\x01"
+ALIGNEMENT = 64
+_TYPES = {
+    "origines": "<i4",
+    "destinations": "<i4",
+    "capacites": "<f8",
+    "entieres": "|b1",
+    "flots": "<f8",
+}
+
+
+def sauvegarde(probleme: Union[Probleme, Solution], chemin: Union[str, os.PathLike]) -> None:
+    """Écrit un problème, ou une solution avec le flot de chaque canalisation et le rapport d'élagage, au format binaire.
+
+    Les attributs des canalisations ne sont pas écrits : les résultats en colonnes les
+    gardent (voir `Adduction_eau.colonnes`).
+
+    Exemple :
+>>> import os, tempfile
+>>> from Adduction_eau import Probleme
+>>> from Adduction_eau.stockage import sauvegarde, charge
+>>> probleme = Probleme([("source", "A", 10), ("A", "puit", 2.5)])
+>>> chemin = os.path.join(tempfile.mkdtemp(), "reseau.adduction")
+>>> sauvegarde(probleme, chemin)
+>>> charge(chemin)
+Probleme(reseau=[('source', 'A', 10), ('A', 'puit', 2.5)])
+    """
+    if isinstance(probleme, Solution):
+        solution, probleme = probleme, probleme.probleme
+    else:
+        solution = None
+    canalisations = probleme._canalisations
+    tableaux = {
+        "origines": canalisations.origines,
+        "destinations": canalisations.destinations,
+        "capacites": canalisations.capacites,
+        "entieres": canalisations.entieres,
+    }
+    entete: Dict[str, Any] = {"noms": canalisations.noms, "tableaux": dict()}
+    if solution is not None:
+        tableaux["flots"] = _flots_par_canalisation(canalisations, solution.graphe)
+        entete["rapport"] = solution.elagage
+
+    debut = len(SIGNATURE) + 8 + len(json.dumps(entete, ensure_ascii=False).encode("utf-8"))
+    while True:
+        decalage = debut
+        for nom, tableau in tableaux.items():
+            decalage = -(-decalage // ALIGNEMENT) * ALIGNEMENT
+            entete["tableaux"][nom] = {"type": _TYPES[nom], "taille": len(tableau), "decalage": decalage}
+            decalage += len(tableau) * np.dtype(_TYPES[nom]).itemsize
+        octets = json.dumps(entete, ensure_ascii=False).encode("utf-8")
+        if len(SIGNATURE) + 8 + len(octets) <= debut:
+            break
+        debut = len(SIGNATURE) + 8 + len(octets)
+
+    with open(chemin, "wb") as fichier:
+        fichier.write(SIGNATURE)
+        fichier.write(struct.pack("<Q", len(octets)))
+        fichier.write(octets)
+        for nom, tableau in tableaux.items():
+            fichier.write(b"\x00" * (entete["tableaux"][nom]["decalage"] - fichier.tell()))
+            fichier.write(np.ascontiguousarray(tableau, dtype=_TYPES[nom]).tobytes())
+
+
+def _lit_entete(chemin: Union[str, os.PathLike]) -> Dict[str, Any]:
+    """Lit et vérifie l'en-tête d'un fichier binaire."""
+    with open(chemin, "rb") as fichier:
+        if fichier.read(len(SIGNATURE)) != SIGNATURE:
+            raise ValueError(f"Le fichier {os.fspath(chemin)!r} n'est pas un réseau d'adduction d'eau au format binaire.")
+        longueur, = struct.unpack("<Q", fichier.read(8))
+        return json.loads(fichier.read(longueur).decode("utf-8"))
+
+
+def _tableau(chemin: Union[str, os.PathLike], description: Dict[str, Any]) -> np.ndarray:
+    """Projette un tableau du fichier en mémoire en lecture seule, sans le copier."""
+    if description["taille"] == 0:
+        return np.empty(0, dtype=description["type"])
+    return np.memmap(
+        chemin, dtype=description["type"], mode="r", offset=description["decalage"], shape=(description["taille"],)
+    )
+
+
+def charge(chemin: Union[str, os.PathLike], verifie: bool = False) -> Probleme:
+    """Ouvre un problème écrit par `sauvegarde`, ses tableaux restant projetés depuis le fichier.
+
+    Le réseau ayant été validé avant d'être écrit, il n'est revalidé que si `verifie` est vrai.
+    """
+    entete = _lit_entete(chemin)
+    tableaux = {nom: _tableau(chemin, description) for nom, description in entete["tableaux"].items()}
+    canalisations = Canalisations(
+        entete["noms"], tableaux["origines"], tableaux["destinations"], tableaux["capacites"], tableaux["entieres"]
+    )
+    return Probleme.depuis_canalisations(canalisations, verifie=verifie)
+
+
+class _SolutionChargee(Solution):
+    """Solution dont le flot maximal, relu depuis un fichier, n'est pas recalculé."""
+    def __init__(self, probleme: Probleme, flots: np.ndarray, rapport: Dict[str, Any]):
+        super().__init__(probleme)
+        self._flots_charges = flots
+        self._rapport_charge = rapport
+
+
+    @cached_property
+    def _resolution(self) -> Tuple[GrapheResiduel, Dict[str, int]]:
+        """Graphe résiduel du réseau de départ portant le flot relu, et rapport d'élagage relu."""
+        return _graphe_depuis_flots(self.table_creuse, self.probleme._canalisations, self._flots_charges), self._rapport_charge
+
+
+def charge_solution(chemin: Union[str, os.PathLike]) -> Solution:
+    """Ouvre une solution écrite par `sauvegarde` sans recalculer son flot maximal.
+
+    Un fichier ne contenant qu'un problème donne une solution qui sera calculée à la demande.
+
+    Exemple :
+>>> import os, tempfile
+>>> from Adduction_eau import Probleme
+>>> from Adduction_eau.stockage import sauvegarde, charge_solution
+>>> solution = Probleme([("source", "A", 10), ("A", "puit", 2.5), ("B", "puit", 3)]).resoudre()
+>>> chemin = os.path.join(tempfile.mkdtemp(), "solution.adduction")
+>>> sauvegarde(solution, chemin)
+>>> charge_solution(chemin).villes_non_alimentees
+[('B', 3)]
+    """
+    probleme = charge(chemin)
+    entete = _lit_entete(chemin)
+    if "flots" not in entete["tableaux"]:
+        return _en_solution(probleme)
+    return _SolutionChargee(probleme, _tableau(chemin, entete["tableaux"]["flots"]), entete.get("rapport", dict()))
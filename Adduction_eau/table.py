@@ -0,0 +1,192 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Classe TableCreuse permettant de stocker la table des capacités sous forme creuse
+(tableaux COO indexés par numéro de sommet) plutôt qu'en dataframe dense.
+"""
+
+from typing import Iterable, List, Tuple
+import numpy as np
+import pandas as pd
+
+
+class TableCreuse:
+    """Table des capacités d'un réseau stockée sous forme creuse.
+
+    Le sommet numéro `i` est `sommets[i]` et l'arrête numéro `k` va de
+    `sommets[origines[k]]` à `sommets[destinations[k]]` avec la valeur `valeurs[k]`.
+
+    Exemple :
+>>> from Adduction_eau.table import TableCreuse
+>>> table = TableCreuse.depuis_aretes([("source", "A", 10), ("A", "puit", 5)])
+>>> table["A", "puit"] += 2
+>>> table.aretes()
+[('source', 'A', 10.0), ('A', 'puit', 7.0)]
+>>> table.en_dataframe()
+           A  puit
+source  10.0   0.0
+A        0.0   7.0
+    """
+    def __init__(self, sommets: List[str], origines, destinations, valeurs):
+        self.sommets = list(sommets)
+        self.origines = np.asarray(origines, dtype=np.int32)
+        self.destinations = np.asarray(destinations, dtype=np.int32)
+        self.valeurs = np.asarray(valeurs, dtype=np.float64)
+        self._numeros = None
+        self._positions = None
+
+
+    def __repr__(self) -> str:
+        """Renvoie un résumé de la table."""
+        return f"TableCreuse(sommets={len(self.sommets)}, aretes={len(self)})"
+
+
+    def __len__(self) -> int:
+        """Renvoie le nombre d'arrêtes stockées."""
+        return len(self.valeurs)
+
+
+    @classmethod
+    def depuis_aretes(cls, aretes: Iterable[Tuple[str, str, float]]) -> "TableCreuse":
+        """Construit la table à partir d'une liste de canalisations.
+
+        Les sommets sont numérotés dans leur ordre d'apparition. Si une même
+        canalisation apparaît plusieurs fois, la dernière capacité est conservée.
+        """
+        numeros = dict()
+        positions = dict()
+        origines, destinations, valeurs = list(), list(), list()
+        for depart, arrivee, capacite in aretes:
+            cle = (numeros.setdefault(depart, len(numeros)), numeros.setdefault(arrivee, len(numeros)))
+            if cle in positions:
+                valeurs[positions[cle]] = capacite
+            else:
+                positions[cle] = len(valeurs)
+                origines.append(cle[0])
+                destinations.append(cle[1])
+                valeurs.append(capacite)
+        return cls(list(numeros), origines, destinations, valeurs)
+
+
+    @classmethod
+    def depuis_dataframe(cls, table: pd.DataFrame) -> "TableCreuse":
+        """Construit la table creuse à partir d'une table dense."""
+        sommets = list(dict.fromkeys(list(table.index) + list(table.columns)))
+        numeros = {sommet: numero for numero, sommet in enumerate(sommets)}
+        numeros_lignes = np.array([numeros[ligne] for ligne in table.index], dtype=np.int32)
+        numeros_colonnes = np.array([numeros[colonne] for colonne in table.columns], dtype=np.int32)
+        valeurs = table.to_numpy(dtype=np.float64)
+        lignes, colonnes = np.nonzero(valeurs)
+        return cls(sommets, numeros_lignes[lignes], numeros_colonnes[colonnes], valeurs[lignes, colonnes])
+
+
+    def numero(self, sommet: str) -> int:
+        """Renvoie le numéro d'un sommet."""
+        if self._numeros is None:
+            self._numeros = {nom: numero for numero, nom in enumerate(self.sommets)}
+        return self._numeros[sommet]
+
+
+    def _position(self, arrete: Tuple[str, str]) -> int:
+        """Renvoie la position de l'arrête dans les tableaux, ou -1 si elle est absente."""
+        if self._positions is None:
+            self._positions = {
+                cle: position
+                for position, cle in enumerate(zip(self.origines.tolist(), self.destinations.tolist()))
+            }
+        depart, arrivee = arrete
+        try:
+            cle = (self.numero(depart), self.numero(arrivee))
+        except KeyError:
+            return -1
+        return self._positions.get(cle, -1)
+
+
+    def __getitem__(self, arrete: Tuple[str, str]) -> float:
+        """Renvoie la valeur de l'arrête (0 si elle est absente)."""
+        position = self._position(arrete)
+        return 0. if position < 0 else self.valeurs[position]
+
+
+    def __setitem__(self, arrete: Tuple[str, str], valeur: float) -> None:
+        """Modifie la valeur d'une arrête, en l'ajoutant si besoin."""
+        position = self._position(arrete)
+        if position >= 0:
+            self.valeurs[position] = valeur
+            return
+        depart, arrivee = arrete
+        for sommet in (depart, arrivee):
+            if sommet not in self._numeros:
+                self._numeros[sommet] = len(self.sommets)
+                self.sommets.append(sommet)
+        cle = (self._numeros[depart], self._numeros[arrivee])
+        self._positions[cle] = len(self.valeurs)
+        self.origines = np.append(self.origines, np.int32(cle[0]))
+        self.destinations = np.append(self.destinations, np.int32(cle[1]))
+        self.valeurs = np.append(self.valeurs, np.float64(valeur))
+
+
+    def copie(self) -> "TableCreuse":
+        """Renvoie une copie indépendante de la table."""
+        return TableCreuse(self.sommets, self.origines.copy(), self.destinations.copy(), self.valeurs.copy())
+
+
+    def _disposition_dense(self) -> Tuple[List[str], List[str], np.ndarray, np.ndarray]:
+        """Renvoie les lignes et colonnes de la table dense équivalente et le rang de chaque sommet."""
+        try:
+            source, puit = self.numero("source"), self.numero("puit")
+        except KeyError:
+            raise ValueError("Le réseau doit comprendre une source et un puit.")
+        lignes = [numero for numero in range(len(self.sommets)) if numero != puit]
+        colonnes = [numero for numero in range(len(self.sommets)) if numero != source]
+        if np.any(self.origines == puit):
+            lignes.append(puit)
+        if np.any(self.destinations == source):
+            colonnes.append(source)
+        rang_lignes = np.full(len(self.sommets), -1, dtype=np.int64)
+        rang_lignes[lignes] = np.arange(len(lignes))
+        rang_colonnes = np.full(len(self.sommets), -1, dtype=np.int64)
+        rang_colonnes[colonnes] = np.arange(len(colonnes))
+        return (
+            [self.sommets[numero] for numero in lignes],
+            [self.sommets[numero] for numero in colonnes],
+            rang_lignes,
+            rang_colonnes
+        )
+
+
+    def non_nulles(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Renvoie les arrêtes de valeur non nulle, dans l'ordre de lecture de la table dense."""
+        _, _, rang_lignes, rang_colonnes = self._disposition_dense()
+        garde = np.flatnonzero(self.valeurs != 0)
+        ordre = garde[np.lexsort((rang_colonnes[self.destinations[garde]], rang_lignes[self.origines[garde]]))]
+        return self.origines[ordre], self.destinations[ordre], self.valeurs[ordre]
+
+
+    def aretes(self) -> List[Tuple[str, str, float]]:
+        """Renvoie les arrêtes de valeur non nulle sous forme de liste de tuples."""
+        origines, destinations, valeurs = self.non_nulles()
+        return [
+            (self.sommets[depart], self.sommets[arrivee], valeur)
+            for depart, arrivee, valeur in zip(origines.tolist(), destinations.tolist(), valeurs.tolist())
+        ]
+
+
+    def en_dataframe(self) -> pd.DataFrame:
+        """Renvoie la table dense équivalente (lignes sans le puit, colonnes sans la source)."""
+        lignes, colonnes, rang_lignes, rang_colonnes = self._disposition_dense()
+        donnees = np.zeros((len(lignes), len(colonnes)))
+        donnees[rang_lignes[self.origines], rang_colonnes[self.destinations]] = np.where(
+            np.isnan(self.valeurs), 0., self.valeurs
+        )
+        return pd.DataFrame(data=donnees, index=lignes, columns=colonnes)
+
+
+    def en_scipy(self):
+        """Renvoie la matrice d'adjacence au format `scipy.sparse.csr_matrix`."""
+        from scipy.sparse import csr_matrix
+        return csr_matrix(
+            (self.valeurs, (self.origines, self.destinations)),
+            shape=(len(self.sommets), len(self.sommets))
+        )
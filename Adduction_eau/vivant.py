@@ -0,0 +1,178 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Classe ReseauVivant permettant de suivre un réseau qui change en cours
+d'exploitation (vannes fermées, canalisations réparées ou ajoutées) : le flot
+maximal et les villes mal alimentées sont mis à jour à partir du flot précédent
+au lieu d'être recalculés entièrement après chaque changement.
+"""
+
+from typing import Dict, List, Tuple, Union
+from Adduction_eau import Probleme
+from Adduction_eau.flot import GrapheResiduel
+import numpy as np
+
+
+class ReseauVivant:
+    """Réseau modifiable dont le flot maximal est entretenu de façon incrémentale.
+
+    Changer ou retirer une canalisation ne déplace que le flot qu'elle portait en trop.
+    Ajouter une canalisation entre deux sommets non encore reliés oblige à reconstruire
+    la structure du graphe résiduel ; les ajouts sont donc regroupés et la structure
+    n'est reconstruite, avec le flot courant, qu'à la consultation suivante.
+
+    Exemple :
+>>> from Adduction_eau import Probleme
+>>> from Adduction_eau.vivant import ReseauVivant
+>>> reseau = ReseauVivant(Probleme([("source", "A", 10), ("A", "puit", 6), ("source", "B", 2), ("B", "puit", 5)]))
+>>> reseau.valeur, reseau.villes_non_alimentees
+(8.0, [('B', 5.0)])
+>>> reseau.ajoute("A", "B", 4)
+>>> reseau.valeur, reseau.villes_non_alimentees
+(11.0, [])
+>>> reseau.modifie("source", "A", 5)
+>>> reseau.valeur
+7.0
+>>> reseau.retire("A", "B")
+>>> reseau.valeur, reseau.villes_non_alimentees
+(7.0, [('A', 6.0), ('B', 5.0)])
+    """
+    def __init__(self, probleme: Probleme):
+        table = probleme.table_creuse()
+        self._noms = list(table.sommets)
+        self._numeros = {nom: numero for numero, nom in enumerate(self._noms)}
+        for nom in ("source", "puit"):
+            self._numero(nom)
+        self._positions = {
+            arrete: position
+            for position, arrete in enumerate(zip(table.origines.tolist(), table.destinations.tolist()))
+        }
+        self._graphe = GrapheResiduel(len(self._noms), table.origines, table.destinations, table.valeurs)
+        self._ajouts = list()
+        self._a_jour = False
+
+
+    def __repr__(self) -> str:
+        """Renvoie le nombre de sommets et de canalisations du réseau."""
+        return f"ReseauVivant(sommets={len(self._noms)}, canalisations={len(self._positions) + len(self._ajouts)})"
+
+
+    def _numero(self, nom: str) -> int:
+        """Renvoie le numéro d'un sommet, en le créant si besoin."""
+        if nom not in self._numeros:
+            self._numeros[nom] = len(self._noms)
+            self._noms.append(nom)
+        return self._numeros[nom]
+
+
+    def _position(self, depart: str, arrivee: str) -> int:
+        """Renvoie la position d'une canalisation présente dans le graphe, ou lève une ValueError."""
+        cle = (self._numeros.get(depart, -1), self._numeros.get(arrivee, -1))
+        if cle not in self._positions:
+            raise ValueError(f"La canalisation {depart} / {arrivee} n'existe pas.")
+        return self._positions[cle]
+
+
+    def ajoute(self, depart: str, arrivee: str, capacite: Union[int, float]) -> None:
+        """Ajoute une canalisation."""
+        if capacite < 0:
+            raise ValueError("Toutes les capacités doivent être positives.")
+        cle = (self._numero(depart), self._numero(arrivee))
+        if cle in self._positions or any(ajout[:2] == cle for ajout in self._ajouts):
+            raise ValueError(f"La canalisation {depart} / {arrivee} est déjà présente.")
+        self._ajouts.append((*cle, float(capacite)))
+        self._a_jour = False
+
+
+    def modifie(self, depart: str, arrivee: str, capacite: Union[int, float]) -> None:
+        """Remplace la capacité d'une canalisation."""
+        cle = (self._numeros.get(depart, -1), self._numeros.get(arrivee, -1))
+        for rang, ajout in enumerate(self._ajouts):
+            if ajout[:2] == cle:
+                if capacite < 0:
+                    raise ValueError("Toutes les capacités doivent être positives.")
+                self._ajouts[rang] = (*cle, float(capacite))
+                return
+        self._graphe.modifie_capacite(
+            self._position(depart, arrivee), float(capacite), self._numeros["source"], self._numeros["puit"]
+        )
+        self._a_jour = False
+
+
+    def retire(self, depart: str, arrivee: str) -> None:
+        """Retire une canalisation : son flot est redirigé puis la canalisation est oubliée."""
+        cle = (self._numeros.get(depart, -1), self._numeros.get(arrivee, -1))
+        for rang, ajout in enumerate(self._ajouts):
+            if ajout[:2] == cle:
+                del self._ajouts[rang]
+                return
+        position = self._position(depart, arrivee)
+        self._graphe.modifie_capacite(position, 0., self._numeros["source"], self._numeros["puit"])
+        del self._positions[cle]
+        self._a_jour = False
+
+
+    def _met_a_jour(self) -> GrapheResiduel:
+        """Intègre les ajouts en attente puis complète le flot jusqu'au flot maximal."""
+        if self._ajouts:
+            graphe = self._graphe
+            garde = np.zeros(len(graphe.capacites), dtype=bool)
+            garde[list(self._positions.values())] = True
+            origines = np.concatenate([graphe.origines[garde], [ajout[0] for ajout in self._ajouts]])
+            destinations = np.concatenate([graphe.destinations[garde], [ajout[1] for ajout in self._ajouts]])
+            capacites = np.concatenate([graphe.capacites[garde], [ajout[2] for ajout in self._ajouts]])
+            flots = np.concatenate([graphe.flots[garde], np.zeros(len(self._ajouts))])
+            self._graphe = GrapheResiduel(len(self._noms), origines, destinations, capacites, flots)
+            self._positions = {
+                arrete: position
+                for position, arrete in enumerate(zip(origines.tolist(), destinations.tolist()))
+            }
+            self._ajouts = list()
+            self._a_jour = False
+        if not self._a_jour:
+            self._graphe.pousse(self._numeros["source"], self._numeros["puit"])
+            self._a_jour = True
+        return self._graphe
+
+
+    @property
+    def valeur(self) -> float:
+        """Valeur du flot maximal courant."""
+        return self._met_a_jour().valeur(self._numeros["source"])
+
+
+    @property
+    def flots(self) -> Dict[Tuple[str, str], float]:
+        """Flot porté par chaque canalisation présente."""
+        flots = self._met_a_jour().flots
+        noms = self._noms
+        return {(noms[depart], noms[arrivee]): float(flots[position]) for (depart, arrivee), position in self._positions.items()}
+
+
+    @property
+    def villes_non_alimentees(self) -> List[Tuple[str, float]]:
+        """Villes, avec leur demande, dont l'arrivée d'eau n'est pas saturée par tous les flots maximaux.
+
+        Comme pour `Solution.villes_non_alimentees`, le résultat ne dépend pas de la
+        répartition du flot courant, donc ni de l'ordre ni de l'historique des changements.
+        """
+        graphe = self._met_a_jour()
+        puit = self._numeros["puit"]
+        demandes = [(depart, position) for (depart, arrivee), position in self._positions.items() if arrivee == puit]
+        saturees = graphe.toujours_saturees([position for _, position in demandes], puit).tolist()
+        return [
+            (self._noms[depart], float(graphe.capacites[position]))
+            for (depart, position), saturee in zip(demandes, saturees)
+            if not saturee
+        ]
+
+
+    def probleme(self) -> Probleme:
+        """Renvoie le problème correspondant à l'état courant du réseau."""
+        graphe = self._met_a_jour()
+        noms = self._noms
+        return Probleme([
+            (noms[depart], noms[arrivee], float(graphe.capacites[position]))
+            for (depart, arrivee), position in self._positions.items()
+        ])
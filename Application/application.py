@@ -9,8 +9,8 @@ from ipywidgets.widgets.interaction import show_inline_matplotlib_plots
 import ipywidgets as ipw
 from IPython.display import display
 import matplotlib.pyplot as plt
-from Adduction_eau import Probleme
-from Adduction_eau import ressort_table_apres_travaux, visualisation_graphe_flots_maximaux, recupere_ville_flot_maximal_faible, transforme_table
+from Adduction_eau import Probleme, Solution
+from Adduction_eau import visualisation_graphe_flots_maximaux, recupere_ville_flot_maximal_faible, transforme_table
 
 
 class Application:
@@ -57,6 +57,8 @@ L / puit / 10.
             ),
             ipw.HBox([self.choix_graphique, self.graphique])
         ])
+        self._texte_resolu = None
+        self._solution = None
         self._sur_clique(self.bouton)
         self.bouton.on_click(self._sur_clique)
         self._choix_graphique(self.choix_graphique)
@@ -78,28 +80,27 @@ L / puit / 10.
             self.erreur.clear_output()
             self.etapes.clear_output()
             self.graphique.clear_output()
+            solution = self._resous()
             self.choix_graphique.value = "Début"
-            probleme = Probleme.par_str(self.zone_entree.value)
-            solution = ressort_table_apres_travaux(probleme)
             with self.zone_probleme:
-                probleme.affiche()
+                solution.probleme.affiche()
             with self.zone_solution:
-                solution_arretes = transforme_table(probleme.table_depart())
+                solution_arretes = transforme_table(solution)
                 solution_finale = Probleme(solution_arretes)
                 solution_finale.affiche()
             with self.etapes:
-                self._capacites_insuffisantes(probleme)
+                self._capacites_insuffisantes(solution)
             with self.graphique:
-                visualisation_graphe_flots_maximaux(probleme.table_depart())
+                visualisation_graphe_flots_maximaux(solution)
                 show_inline_matplotlib_plots()
-        except ValueError:
+        except ValueError as erreur:
             with self.erreur:
                 display(
                     ipw.HTML(
                         f"""
 <p style="color:red; border:2px solid yellow;"> <B><U> Veuillez respecter la syntaxe : </U> </B><br>
 DEPART / ARRIVEE / CAPACITE MAXIMALE <br>
-<B> Le problème est à la ligne {self._est_valide()} </B>
+<B> {erreur} </B>
 </p>
 
 <p style="color:red; border:2px solid yellow;">  <B><U> Exemple : </U> </B><br>
@@ -120,50 +121,45 @@ L'entrée doit comprendre une source et un puit. Pour plus d'informations, cliqu
         self.graphique.clear_output()
         plt.rcParams["figure.figsize"] = (12, 9)
         
-        probleme = Probleme.par_str(self.zone_entree.value)
-        solution = ressort_table_apres_travaux(probleme)
+        solution = self._resous()
         if self.choix_graphique.value == "Début":
             with self.graphique:
-                visualisation_graphe_flots_maximaux(probleme.table_depart())
+                visualisation_graphe_flots_maximaux(solution)
                 show_inline_matplotlib_plots()
         else:
             with self.graphique:
-                visualisation_graphe_flots_maximaux(solution)
+                visualisation_graphe_flots_maximaux(solution.table_finale, solution.flots_finaux)
                 show_inline_matplotlib_plots()
     
     
-    def _capacites_insuffisantes(self, probleme: Probleme):
+    def _resous(self) -> Solution:
+        """Renvoie la solution du réseau saisi, qui n'est recalculée que si la saisie a changé."""
+        if self._texte_resolu != self.zone_entree.value:
+            self._solution = Probleme.par_str(self.zone_entree.value).resoudre()
+            self._texte_resolu = self.zone_entree.value
+        return self._solution
+    
+    
+    def _capacites_insuffisantes(self, solution: Solution):
         """Annonce les capacités insuffisantes pour l'utilisateur."""
-        longueur_villes_non_alimentees = len(recupere_ville_flot_maximal_faible(probleme))
-        if longueur_villes_non_alimentees != 0:
-            if longueur_villes_non_alimentees == 1:
-                print(f"La ville {recupere_ville_flot_maximal_faible(probleme)[0][0]} n'est pas assez alimentée.")
+        villes_non_alimentees = recupere_ville_flot_maximal_faible(solution)
+        if len(villes_non_alimentees) != 0:
+            if len(villes_non_alimentees) == 1:
+                print(f"La ville {villes_non_alimentees[0][0]} n'est pas assez alimentée.")
             else:
                 print(f"Les villes qui ne sont pas assez alimentées en eau sont : ")
-                for canalisation in recupere_ville_flot_maximal_faible(probleme):
+                for canalisation in villes_non_alimentees:
                     print("- ", canalisation[0])
-            capacites_insuffisantes = probleme._recupere_noeuds_capacite_insuffisante()
+            capacites_insuffisantes = solution.capacites_insuffisantes
             if len(capacites_insuffisantes) > 0:
-                table = probleme.table_depart()
+                table = solution.table_creuse
                 print("Les capacités à modifier sont : ")
                 for valeur in capacites_insuffisantes:
-                    print(f"{valeur[0]} --> {valeur[1]} : {table.loc[valeur[0], valeur[1]]}")
+                    print(f"{valeur[0]} --> {valeur[1]} : {table[valeur]} (+{solution.travaux[valeur]})")
         else:
             print("Aucun travail n'est nécessaire.")
     
     
-    def _est_valide(self):
-        """Vérifie que la ligne est valide sinon ressort message d'erreur."""
-        reseau = list()
-        i = 0
-        for ligne in self.zone_entree.value.strip().splitlines():
-            i += 1
-            try:
-                initial, arrivee, capacite = ligne.split("/")
-            except ValueError:
-                return i
-    
-    
     def _clique_aide(self, b):
         """Permet à l'utilisateur d'obtenir une aide pour l'application."""
         self.zone_probleme.clear_output()
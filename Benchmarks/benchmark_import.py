@@ -0,0 +1,60 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Mesure le temps de démarrage à froid d'un processus qui importe Adduction_eau et
+résout un petit problème, et vérifie qu'il reste sous le budget donné sans charger
+les dépendances de visualisation et d'affichage.
+
+Exemple :
+python -m Benchmarks.benchmark_import
+python -m Benchmarks.benchmark_import --repetitions 20 --budget 0.5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+MODULES_DIFFERES = ["matplotlib", "networkx", "rich"]
+
+PROGRAMME = """
+import json, sys, time
+debut = time.perf_counter()
+import Adduction_eau
+import_seul = time.perf_counter() - debut
+Adduction_eau.Probleme([("source", "A", 3), ("A", "puit", 2)]).resoudre().flots
+print(json.dumps({
+    "import": import_seul,
+    "import_et_calcul": time.perf_counter() - debut,
+    "modules": [module for module in %r if module in sys.modules],
+}))
+""" % MODULES_DIFFERES
+
+
+def mesure() -> dict:
+    """Lance un nouveau processus et renvoie ses durées et les modules différés qu'il a chargés."""
+    sortie = subprocess.run([sys.executable, "-c", PROGRAMME], capture_output=True, text=True, check=True)
+    return json.loads(sortie.stdout)
+
+
+def main() -> None:
+    """Lance le benchmark, affiche les médianes et échoue si le budget est dépassé."""
+    analyseur = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    analyseur.add_argument("--repetitions", type=int, default=10)
+    analyseur.add_argument("--budget", type=float, default=1.0,
+                           help="durée médiane maximale, en secondes, de l'import suivi du calcul")
+    arguments = analyseur.parse_args()
+    mesures = [mesure() for _ in range(arguments.repetitions)]
+    import_median = statistics.median(resultat["import"] for resultat in mesures)
+    total_median = statistics.median(resultat["import_et_calcul"] for resultat in mesures)
+    charges = sorted({module for resultat in mesures for module in resultat["modules"]})
+    print(f"import : {import_median:.4f} s, import et calcul : {total_median:.4f} s (médianes sur {len(mesures)})")
+    print(f"modules différés chargés : {charges or 'aucun'}")
+    if charges or total_median > arguments.budget:
+        sys.exit(f"Budget de démarrage dépassé ({arguments.budget} s) ou modules différés chargés.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Mesure la durée du calcul du flot maximal par chaque moteur du registre sur des
+réseaux aléatoires de tailles croissantes, et vérifie qu'ils trouvent la même valeur
+et les mêmes villes alimentées par tous les flots maximaux.
+
+Exemple :
+python -m Benchmarks.benchmark_moteurs
+python -m Benchmarks.benchmark_moteurs --tailles 1000 10000 --moteurs natif scipy
+"""
+
+import argparse
+import numpy as np
+import pandas as pd
+from Adduction_eau import TableCreuse
+from Adduction_eau.flot import GrapheResiduel
+from Adduction_eau.moteurs import calcule_flot
+from Benchmarks.benchmark_tables import genere_reseau
+
+
+def mesure(nb_canalisations: int, moteurs) -> dict:
+    """Mesure chaque moteur sur un réseau de `nb_canalisations` canalisations."""
+    table = TableCreuse.depuis_aretes(genere_reseau(nb_canalisations))
+    origines, destinations, capacites = table.non_nulles()
+    source, puit = table.numero("source"), table.numero("puit")
+    mesures = {"canalisations": len(origines), "sommets": len(table.sommets)}
+    demandes = np.flatnonzero(destinations == puit)
+    valeurs, alimentees = dict(), dict()
+    for moteur in moteurs:
+        flots, mesure_moteur = calcule_flot(len(table.sommets), origines, destinations, capacites, source, puit, moteur)
+        valeurs[moteur] = flots[demandes].sum()
+        graphe = GrapheResiduel(len(table.sommets), origines, destinations, capacites, np.minimum(flots, capacites))
+        alimentees[moteur] = graphe.toujours_saturees(demandes, puit)
+        mesures[moteur] = mesure_moteur["duree"]
+        if moteur == "automatique":
+            mesures["choix_automatique"] = mesure_moteur["moteur"]
+    assert np.allclose(list(valeurs.values()), next(iter(valeurs.values())))
+    assert all(np.array_equal(villes, next(iter(alimentees.values()))) for villes in alimentees.values())
+    return mesures
+
+
+def main() -> None:
+    """Lance le benchmark et affiche les résultats."""
+    analyseur = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    analyseur.add_argument("--tailles", type=int, nargs="+", default=[100, 1_000, 10_000])
+    analyseur.add_argument("--moteurs", nargs="+", default=["natif", "networkx", "scipy", "automatique"])
+    arguments = analyseur.parse_args()
+    resultats = pd.DataFrame([mesure(taille, arguments.moteurs) for taille in arguments.tailles])
+    print(resultats.to_string(index=False, float_format=lambda valeur: f"{valeur:.4f}"))
+
+
+if __name__ == "__main__":
+    main()
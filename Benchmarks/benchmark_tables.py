@@ -0,0 +1,105 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Mesure le temps de construction de la table de départ et de sa transformation
+en liste de tuples, comparé aux anciennes versions boucle par boucle avec `.loc`.
+
+Exemple :
+python -m Benchmarks.benchmark_tables
+python -m Benchmarks.benchmark_tables --tailles 1000 10000
+"""
+
+from typing import List, Tuple
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from Adduction_eau import TableCreuse, transforme_table
+
+
+def genere_reseau(nb_canalisations: int, graine: int = 0) -> List[Tuple[str, str, float]]:
+    """Génère un réseau aléatoire sans doublon d'environ `nb_canalisations` canalisations."""
+    generateur = np.random.default_rng(graine)
+    nb_sommets = max(10, int(4 * np.sqrt(nb_canalisations)))
+    noms = ["source"] + [f"N{i}" for i in range(1, nb_sommets - 1)] + ["puit"]
+    origines = generateur.integers(0, nb_sommets - 1, 2 * nb_canalisations)
+    destinations = generateur.integers(1, nb_sommets, 2 * nb_canalisations)
+    paires = np.unique(np.stack([origines, destinations], axis=1)[origines != destinations], axis=0)
+    paires = paires[generateur.permutation(len(paires))[:nb_canalisations]]
+    capacites = generateur.integers(1, 100, len(paires)).astype(float)
+    return [
+        (noms[depart], noms[arrivee], capacite)
+        for (depart, arrivee), capacite in zip(paires.tolist(), capacites.tolist())
+    ]
+
+
+def _table_depart_reference(reseau: List[Tuple[str, str, float]]) -> pd.DataFrame:
+    """Ancienne version de Probleme.table_depart (une affectation `.loc` par canalisation)."""
+    sommets = list()
+    for initial, arrivee, _ in reseau:
+        if initial not in sommets:
+            sommets.append(initial)
+        if arrivee not in sommets:
+            sommets.append(arrivee)
+    ligne = [sommet for sommet in sommets if sommet != "puit"]
+    colonne = [sommet for sommet in sommets if sommet != "source"]
+    tableau = pd.DataFrame(data=np.zeros((len(ligne), len(colonne))), index=ligne, columns=colonne)
+    for depart, arrivee, flot_max in reseau:
+        tableau.loc[depart, arrivee] = flot_max
+    return tableau.fillna(0)
+
+
+def _transforme_table_reference(table: pd.DataFrame) -> List[Tuple[str, str, float]]:
+    """Ancienne version de transforme_table (double boucle sur toutes les cases)."""
+    liste_tuple = list()
+    for ligne in list(table.index):
+        for colonne in list(table.loc[:]):
+            if table.loc[ligne, colonne] != 0:
+                liste_tuple.append((ligne, colonne, table.loc[ligne, colonne]))
+    return liste_tuple
+
+
+def _chronometre(fonction, *arguments) -> Tuple[float, object]:
+    """Renvoie la durée d'exécution de la fonction et son résultat."""
+    debut = time.perf_counter()
+    resultat = fonction(*arguments)
+    return time.perf_counter() - debut, resultat
+
+
+def mesure(nb_canalisations: int, reference: bool = True) -> dict:
+    """Mesure les deux conversions pour un réseau de `nb_canalisations` canalisations."""
+    reseau = genere_reseau(nb_canalisations)
+    duree_table, table = _chronometre(lambda: TableCreuse.depuis_aretes(reseau).en_dataframe())
+    duree_tuples, tuples = _chronometre(transforme_table, table)
+    mesures = {
+        "canalisations": len(reseau),
+        "sommets": table.shape[0] + 1,
+        "table_depart": duree_table,
+        "transforme_table": duree_tuples,
+    }
+    if reference:
+        duree_table_reference, table_reference = _chronometre(_table_depart_reference, reseau)
+        duree_tuples_reference, tuples_reference = _chronometre(_transforme_table_reference, table_reference)
+        assert table.equals(table_reference)
+        assert tuples == tuples_reference
+        mesures["table_depart_reference"] = duree_table_reference
+        mesures["transforme_table_reference"] = duree_tuples_reference
+        mesures["acceleration_table_depart"] = duree_table_reference / duree_table
+        mesures["acceleration_transforme_table"] = duree_tuples_reference / duree_tuples
+    return mesures
+
+
+def main() -> None:
+    """Lance le benchmark et affiche les résultats."""
+    analyseur = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    analyseur.add_argument("--tailles", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    analyseur.add_argument("--sans-reference", action="store_true",
+                           help="ne mesure pas les anciennes versions (lentes sur les grands réseaux)")
+    arguments = analyseur.parse_args()
+    resultats = pd.DataFrame([mesure(taille, not arguments.sans_reference) for taille in arguments.tailles])
+    print(resultats.to_string(index=False, float_format=lambda valeur: f"{valeur:.4f}"))
+
+
+if __name__ == "__main__":
+    main()
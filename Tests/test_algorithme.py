@@ -7,7 +7,7 @@ Tests du module algorithme qui permet de résoudre le problème d'adduction d'ea
 
 import pytest
 from Adduction_eau import Probleme, ressort_table_apres_travaux, transforme_table, recupere_ville_flot_maximal_faible
-from Adduction_eau.algorithme import _modifie_reseau, _recupere_sommets, _recupere_flots_maximaux
+from Adduction_eau.algorithme import _modifie_reseau, _recupere_sommets, _recupere_flots_maximaux, planifie_travaux, coupe_minimale, courbe_flot_travaux, courbe_flot_demande
 import numpy as np
 import pandas as pd
 import networkx as nx
@@ -41,15 +41,15 @@ def test_modifie_reseau(Reseau):
     resultat = pd.DataFrame(
         data=np.array(
             [
-                [30., 0., 0., 0., 0., 0., 0., 0., 0., 0.],
-                [0., 32., 0., 0., 0., 0., 0., 0., 0., 0.],
-                [0., 0., 21., 0., 0., 0., 0., 0., 0., 0.],
-                [0., 0., 0., 22., 0., 0., 0., 0., 0., 0.],
-                [0., 0., 0., 0., 23., 0., 0., 0., 0., 0.],
-                [0., 0., 0., 0., 0., 12., 0., 0., 0., 0.],
-                [0., 0., 0., 0., 0., 0., 35., 0., 0., 0.],
+                [50., 0., 0., 0., 0., 0., 0., 0., 0., 0.],
+                [0., 50., 0., 0., 0., 0., 0., 0., 0., 0.],
+                [0., 0., 50., 0., 0., 0., 0., 0., 0., 0.],
+                [0., 0., 0., 50., 0., 0., 0., 0., 0., 0.],
+                [0., 0., 0., 0., 50., 0., 0., 0., 0., 0.],
+                [0., 0., 0., 0., 0., 50., 0., 0., 0., 0.],
+                [0., 0., 0., 0., 0., 0., 50., 0., 0., 0.],
                 [0., 0., 0., 0., 0., 0., 0., 30., 0., 30.],
-                [0., 0., 0., 0., 0., 0., 0., 0., 52., 10.],
+                [0., 0., 0., 0., 0., 0., 0., 0., 10., 10.],
                 [0., 0., 0., 0., 0., 0., 0., 0., 0., 10.]
             ]
         ),
@@ -66,15 +66,15 @@ def test_ressort_table_apres_travaux(Reseau):
     test = pd.DataFrame(
         data=np.array(
             [
-                [30., 0., 0., 0., 0., 0., 0., 0., 0., 0.],
-                [0., 32., 0., 0., 0., 0., 0., 0., 0., 0.],
-                [0., 0., 21., 0., 0., 0., 0., 0., 0., 0.],
-                [0., 0., 0., 22., 0., 0., 0., 0., 0., 0.],
-                [0., 0., 0., 0., 23., 0., 0., 0., 0., 0.],
-                [0., 0., 0., 0., 0., 12., 0., 0., 0., 0.],
-                [0., 0., 0., 0., 0., 0., 35., 0., 0., 0.],
+                [50., 0., 0., 0., 0., 0., 0., 0., 0., 0.],
+                [0., 50., 0., 0., 0., 0., 0., 0., 0., 0.],
+                [0., 0., 50., 0., 0., 0., 0., 0., 0., 0.],
+                [0., 0., 0., 50., 0., 0., 0., 0., 0., 0.],
+                [0., 0., 0., 0., 50., 0., 0., 0., 0., 0.],
+                [0., 0., 0., 0., 0., 50., 0., 0., 0., 0.],
+                [0., 0., 0., 0., 0., 0., 50., 0., 0., 0.],
                 [0., 0., 0., 0., 0., 0., 0., 30., 0., 30.],
-                [0., 0., 0., 0., 0., 0., 0., 0., 0., 10.],
+                [0., 0., 0., 0., 0., 0., 0., 0., 10., 10.],
                 [0., 0., 0., 0., 0., 0., 0., 0., 0., 10.]
             ]
         ),
@@ -195,3 +195,181 @@ L / puit / 15
 
 
 
+
+
+def test_solution_memorisee(Reseau, monkeypatch):
+    """Chaque étape de la solution n'est calculée qu'une seule fois."""
+    from Adduction_eau.flot import GrapheResiduel
+    appels = list()
+    pousse = GrapheResiduel.pousse
+    def compte(graphe, *arguments, **options):
+        appels.append(arguments)
+        return pousse(graphe, *arguments, **options)
+    monkeypatch.setattr(GrapheResiduel, "pousse", compte)
+    import Adduction_eau.algorithme as algorithme
+    resolutions = list()
+    flot_par_composantes = algorithme.flot_par_composantes
+    def compte_resolutions(*arguments, **options):
+        resolutions.append(arguments)
+        return flot_par_composantes(*arguments, **options)
+    monkeypatch.setattr(algorithme, "flot_par_composantes", compte_resolutions)
+    solution = Probleme(reseau=Reseau).resoudre()
+    for _ in range(3):
+        recupere_ville_flot_maximal_faible(solution)
+        ressort_table_apres_travaux(solution)
+        transforme_table(solution)
+        solution.flots_finaux
+        recupere_ville_flot_maximal_faible(solution.apres_travaux)
+    assert solution.flots is solution.flots
+    assert len(resolutions) == 1
+    assert len(appels) == 1
+    
+    
+def test_travaux_repart_du_flot_initial(Reseau):
+    """Le flot après travaux repart du flot de départ et reste maximal."""
+    probleme = Probleme(reseau=Reseau)
+    solution = probleme.resoudre()
+    valeur_initiale = sum(flot for (_, arrivee), flot in solution.flots.items() if arrivee == "puit")
+    valeur_finale = sum(flot for (_, arrivee), flot in solution.flots_finaux.items() if arrivee == "puit")
+    assert valeur_finale >= valeur_initiale
+    assert valeur_finale == sum(
+        flot for (_, arrivee), flot in _recupere_flots_maximaux(solution.table_finale).items() if arrivee == "puit"
+    )
+    solution_finale = Probleme(transforme_table(solution)).resoudre()
+    assert solution.apres_travaux.villes_non_alimentees == solution_finale.villes_non_alimentees == []
+    assert solution.apres_travaux.coupe[1] == solution_finale.coupe[1] == valeur_finale
+    assert solution.apres_travaux.elagage["travaux"]
+    
+    
+def test_solution_identique_aux_fonctions(Reseau):
+    """Les fonctions donnent le même résultat avec un problème ou sa solution."""
+    probleme = Probleme(reseau=Reseau)
+    solution = probleme.resoudre()
+    assert ressort_table_apres_travaux(solution).equals(ressort_table_apres_travaux(probleme))
+    assert recupere_ville_flot_maximal_faible(solution) == recupere_ville_flot_maximal_faible(probleme)
+    assert transforme_table(solution) == transforme_table(ressort_table_apres_travaux(probleme))
+    assert solution.table_depart.equals(probleme.table_depart())
+
+
+def test_villes_non_alimentees_par_moteur():
+    """Sur des arbres, les villes non alimentées ne dépendent ni du moteur ni de l'ordre des canalisations.
+
+    Une ville est alimentée quand baisser sa demande baisse l'eau livrée : tous les flots
+    maximaux la satisfont alors.
+    """
+    generateur = np.random.default_rng(20)
+    serie_parallele = 0
+    for _ in range(60):
+        nb_sommets = int(generateur.integers(3, 15))
+        reseau = [("source", "N1", int(generateur.integers(1, 30)))]
+        for sommet in range(2, nb_sommets):
+            reseau.append((f"N{generateur.integers(1, sommet)}", f"N{sommet}", int(generateur.integers(1, 30))))
+        reseau += [
+            (f"N{sommet}", "puit", int(generateur.integers(1, 30)))
+            for sommet in range(1, nb_sommets) if sommet == nb_sommets - 1 or generateur.random() < 0.5
+        ]
+        probleme = Probleme(reseau)
+        villes = probleme.resoudre("natif").villes_non_alimentees
+        automatique = probleme.resoudre()
+        assert automatique.villes_non_alimentees == villes
+        serie_parallele += "serie_parallele" in automatique.elagage["moteurs"]
+        for moteur in ["networkx", "scipy"]:
+            assert probleme.resoudre(moteur).villes_non_alimentees == villes
+        assert sorted(Probleme(reseau[::-1]).resoudre().villes_non_alimentees) == sorted(villes)
+
+        graphe = nx.DiGraph([(depart, arrivee, {"capacity": capacite}) for depart, arrivee, capacite in reseau])
+        valeur = nx.maximum_flow_value(graphe, "source", "puit")
+        for depart, arrivee, capacite in reseau:
+            if arrivee == "puit":
+                graphe[depart]["puit"]["capacity"] = capacite - 1
+                alimentee = nx.maximum_flow_value(graphe, "source", "puit") < valeur
+                graphe[depart]["puit"]["capacity"] = capacite
+                assert ((depart, capacite) not in villes) == alimentee
+    assert serie_parallele > 20
+
+
+def test_planifie_travaux(Reseau):
+    """Les travaux planifiés sont de coût minimal et alimentent toutes les villes."""
+    probleme = Probleme(reseau=Reseau)
+    travaux = planifie_travaux(probleme)
+    assert travaux == {
+        ("source", "D"): 20., ("D", "E"): 18., ("E", "F"): 29., ("F", "G"): 28.,
+        ("G", "H"): 27., ("H", "I"): 38., ("I", "J"): 15., ("K", "L"): 8.
+    }
+    assert probleme.resoudre().capacites_insuffisantes == list(travaux)
+    assert recupere_ville_flot_maximal_faible(Probleme(transforme_table(_modifie_reseau(probleme)))) == []
+    with pytest.raises(ValueError):
+        planifie_travaux(probleme, couts={("source", "D"): float("inf")})
+
+
+def test_planifie_travaux_comparaison_networkx():
+    """Compare le coût des travaux avec le flot de coût minimal de networkx."""
+    generateur = np.random.default_rng(1)
+    for _ in range(10):
+        noms = ["source"] + [f"N{numero}" for numero in range(12)] + ["puit"]
+        reseau = dict()
+        for depart, arrivee in generateur.integers(0, len(noms) - 1, (60, 2)).tolist():
+            if depart != arrivee and arrivee != 0:
+                reseau[(noms[depart], noms[arrivee])] = float(generateur.integers(0, 15))
+        for ville in generateur.choice(range(1, len(noms) - 1), 4, replace=False).tolist():
+            reseau[(noms[ville], "puit")] = float(generateur.integers(1, 20))
+        couts = {arrete: float(generateur.integers(1, 5)) for arrete in reseau if arrete[1] != "puit"}
+        probleme = Probleme([(*arrete, capacite) for arrete, capacite in reseau.items()])
+        graphe = nx.DiGraph()
+        demande = sum(capacite for (_, arrivee), capacite in reseau.items() if arrivee == "puit")
+        graphe.add_node("source", demand=-demande)
+        graphe.add_node("puit", demand=demande)
+        for (depart, arrivee), capacite in reseau.items():
+            graphe.add_edge(depart, arrivee, capacity=capacite, weight=0)
+            if arrivee != "puit":
+                graphe.add_edge(depart, (depart, arrivee), capacity=demande, weight=couts[(depart, arrivee)])
+                graphe.add_edge((depart, arrivee), arrivee, capacity=demande, weight=0)
+        try:
+            attendu = nx.min_cost_flow_cost(graphe)
+        except nx.NetworkXUnfeasible:
+            with pytest.raises(ValueError):
+                planifie_travaux(probleme, couts)
+            continue
+        travaux = planifie_travaux(probleme, couts)
+        assert sum(couts[arrete] * ajout for arrete, ajout in travaux.items()) == pytest.approx(attendu)
+
+
+def test_coupe_minimale(Reseau):
+    """La coupe minimale est saturée et sa capacité vaut le flot maximal."""
+    probleme = Probleme(reseau=Reseau)
+    canalisations, capacite, villes = coupe_minimale(probleme)
+    flots = _recupere_flots_maximaux(probleme.table_depart())
+    assert canalisations == [("H", "I")]
+    assert capacite == sum(flot for (_, arrivee), flot in flots.items() if arrivee == "puit")
+    assert villes == ["J", "K", "L"]
+    generateur = np.random.default_rng(2)
+    for _ in range(10):
+        reseau = dict()
+        for depart, arrivee in generateur.integers(0, 12, (40, 2)).tolist():
+            if depart != arrivee and arrivee != 0 and depart != 11:
+                reseau[(f"N{depart}" if depart else "source", f"N{arrivee}" if arrivee < 11 else "puit")] = float(generateur.integers(1, 20))
+        graphe = nx.DiGraph()
+        for (depart, arrivee), capacite in reseau.items():
+            graphe.add_edge(depart, arrivee, capacity=capacite)
+        if not graphe.has_node("source") or not graphe.has_node("puit"):
+            continue
+        canalisations, capacite, _ = coupe_minimale(Probleme([(*arrete, valeur) for arrete, valeur in reseau.items()]))
+        assert capacite == pytest.approx(nx.minimum_cut_value(graphe, "source", "puit"))
+        assert capacite == pytest.approx(sum(reseau[arrete] for arrete in canalisations))
+
+
+def test_courbes_flot(Reseau):
+    """Les courbes paramétriques coïncident avec des calculs de flot maximal répétés."""
+    probleme = Probleme(reseau=Reseau)
+    courbe = courbe_flot_travaux(probleme, [("H", "I")], 30, points=7)
+    for ajout, flot in zip(courbe["ajout"], courbe["flot"]):
+        reseau = [(depart, arrivee, capacite + ajout if (depart, arrivee) == ("H", "I") else capacite)
+                  for depart, arrivee, capacite in Reseau]
+        flots = _recupere_flots_maximaux(Probleme(reseau=reseau).table_depart())
+        assert flot == pytest.approx(sum(valeur for (_, arrivee), valeur in flots.items() if arrivee == "puit"))
+    courbe = courbe_flot_demande(probleme, 2)
+    assert list(courbe.columns) == ["facteur", "flot"]
+    assert courbe["flot"].iloc[0] == 0.
+    assert courbe["flot"].iloc[-1] == pytest.approx(12.)
+    with pytest.raises(ValueError):
+        courbe_flot_travaux(probleme, [("A", "Z")], 10)
@@ -0,0 +1,83 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Tests du cache persistant des résultats.
+"""
+
+import pytest
+from Adduction_eau import Probleme, algorithme, configure_cache, recupere_ville_flot_maximal_faible, ressort_table_apres_travaux
+from Adduction_eau.cache import CacheResultats, cache_actif
+
+
+@pytest.fixture
+def Reseau():
+    """Réseau pour tous les tests."""
+    return [
+        ("source", "A", 15), ("source", "B", 15), ("A", "C", 7), ("B", "C", 4),
+        ("A", "puit", 6), ("C", "puit", 12), ("B", "puit", 8),
+    ]
+
+
+@pytest.fixture
+def Cache(tmp_path):
+    """Cache actif le temps d'un test."""
+    configure_cache(tmp_path / "cache.sqlite")
+    yield cache_actif()
+    configure_cache(None)
+
+
+def test_lru(tmp_path):
+    """Les entrées utilisées le moins récemment sont effacées au-delà du nombre ou de la taille maximale."""
+    probleme = Probleme([("source", "puit", 1)])
+    cache = CacheResultats(tmp_path / "cache.sqlite", entrees_max=2)
+    cles = [cache.cle(probleme, "calcul", numero=numero) for numero in range(3)]
+    cache.ecrit(cles[0], "a")
+    cache.ecrit(cles[1], "b")
+    assert cache.lit(cles[0]) == "a"
+    cache.ecrit(cles[2], "c")
+    assert len(cache) == 2
+    assert cache.lit(cles[1]) is None
+    assert cache.lit(cles[0]) == "a"
+
+    cache = CacheResultats(tmp_path / "petit.sqlite", taille_max=1000)
+    cache.ecrit(cles[0], b"x" * 600)
+    cache.ecrit(cles[1], b"y" * 600)
+    assert cache.lit(cles[0]) is None and cache.lit(cles[1]) == b"y" * 600
+    cache.ecrit(cles[2], b"z" * 2000)
+    assert cache.lit(cles[2]) is None
+    assert cache.taille <= 1000
+    cache.vide()
+    assert len(cache) == 0
+
+
+def test_resultats_memorises(Reseau, Cache, monkeypatch):
+    """Un réseau déjà vu, même saisi dans un autre ordre, n'est pas recalculé."""
+    resolutions, planifications = list(), list()
+    flot_par_composantes, planifie_travaux = algorithme.flot_par_composantes, algorithme.planifie_travaux
+    monkeypatch.setattr(algorithme, "flot_par_composantes",
+                        lambda *arguments, **options: resolutions.append(1) or flot_par_composantes(*arguments, **options))
+    monkeypatch.setattr(algorithme, "planifie_travaux",
+                        lambda *arguments, **options: planifications.append(1) or planifie_travaux(*arguments, **options))
+    villes = recupere_ville_flot_maximal_faible(Probleme(Reseau))
+    table = ressort_table_apres_travaux(Probleme(Reseau))
+    melange = Probleme(Reseau[::-1])
+    assert sorted(recupere_ville_flot_maximal_faible(melange)) == sorted(villes)
+    assert ressort_table_apres_travaux(melange).loc[table.index, table.columns].equals(table)
+    assert melange.resoudre().flots == Probleme(Reseau).resoudre().flots
+    rapport = melange.resoudre().elagage
+    assert rapport["cache"] and rapport["moteurs"] == dict()
+    assert len(resolutions) == 1
+    assert len(planifications) == 1
+    assert Probleme(Reseau).resoudre(moteur="natif").flots
+    assert len(resolutions) == 2
+
+
+def test_variable_environnement(Reseau, tmp_path, monkeypatch):
+    """Sans configuration, le cache est celui de ADDUCTION_EAU_CACHE, et absent sans elle."""
+    monkeypatch.delenv("ADDUCTION_EAU_CACHE", raising=False)
+    assert cache_actif() is None
+    monkeypatch.setenv("ADDUCTION_EAU_CACHE", str(tmp_path / "environnement.sqlite"))
+    Probleme(Reseau).resoudre().flots
+    assert len(cache_actif()) == 1
+    assert cache_actif().chemin == str(tmp_path / "environnement.sqlite")
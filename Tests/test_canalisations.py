@@ -0,0 +1,68 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Tests du stockage compact des canalisations.
+"""
+
+import pytest
+import numpy as np
+from Adduction_eau import Probleme
+from Adduction_eau.canalisations import Canalisations
+
+
+@pytest.fixture
+def Reseau():
+    """Réseau pour tous les tests."""
+    canalisation_0 = ("source", "A", 10)
+    canalisation_1 = ("A", "C", 5.5)
+    canalisation_2 = ("B", "D", 4)
+    canalisation_3 = ("C", "D", 2)
+    canalisation_4 = ("D", "puit", 10)
+    return [canalisation_0, canalisation_1, canalisation_2, canalisation_3, canalisation_4]
+
+
+def test_tableaux_types(Reseau):
+    """Les canalisations sont stockées dans des tableaux typés."""
+    canalisations = Canalisations.depuis_tuples(Reseau)
+    assert canalisations.origines.dtype == np.int32
+    assert canalisations.destinations.dtype == np.int32
+    assert canalisations.capacites.dtype == np.float64
+    assert list(canalisations.origines) == [0, 1, 3, 2, 4]
+    assert list(canalisations.destinations) == [1, 2, 4, 4, 5]
+
+
+def test_correspondance_noms(Reseau):
+    """Les noms et numéros des sommets se correspondent dans les deux sens."""
+    canalisations = Canalisations.depuis_tuples(Reseau)
+    for numero, nom in enumerate(["source", "A", "C", "B", "D", "puit"]):
+        assert canalisations.numero(nom) == numero
+        assert canalisations.nom(numero) == nom
+
+
+def test_vue_tuples(Reseau):
+    """La vue en tuples restitue le réseau saisi, entiers compris."""
+    canalisations = Canalisations.depuis_tuples(Reseau)
+    assert canalisations.tuples() == Reseau
+    assert isinstance(canalisations[0][2], int)
+    assert isinstance(canalisations[1][2], float)
+
+
+def test_slots(Reseau):
+    """Le stockage n'accepte pas d'attribut supplémentaire."""
+    canalisations = Canalisations.depuis_tuples(Reseau)
+    with pytest.raises(AttributeError):
+        canalisations.autre = 1
+
+
+def test_dernieres_occurrences():
+    """Seule la dernière occurrence d'un même couple de sommets est gardée."""
+    canalisations = Canalisations.depuis_tuples([("A", "B", 1), ("B", "C", 2), ("A", "B", 3)])
+    assert list(canalisations.dernieres_occurrences()) == [1, 2]
+
+
+def test_probleme_recupere_sommets(Reseau):
+    """Probleme s'appuie sur le stockage compact."""
+    probleme = Probleme(Reseau)
+    assert probleme.recupere_sommets() == ["source", "A", "C", "B", "D", "puit"]
+    assert probleme._reseau == Reseau
@@ -0,0 +1,72 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Tests de la lecture et de l'écriture en colonnes Arrow/Parquet.
+"""
+
+import pytest
+import numpy as np
+from Adduction_eau import Probleme, ecrit_parquet, table_resultats
+from Adduction_eau.colonnes import depuis_arrow
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+@pytest.fixture
+def Canalisations():
+    """Canalisations exportées par la base, avec leurs attributs."""
+    return pa.table({
+        "depart": ["source", "source", "A", "B", "A", "C", "B"],
+        "fin": ["A", "B", "C", "C", "puit", "puit", "puit"],
+        "debit": [15, 10, 5, 4, 6, 12, 8],
+        "diametre": [400, 300, 150, 150, 200, 250, 200],
+        "zone": ["nord", "sud", "nord", "sud", "nord", "nord", "sud"],
+    })
+
+
+def test_depuis_arrow(Canalisations):
+    """Le problème lu en colonnes est celui des mêmes canalisations en tuples, avec ses attributs."""
+    probleme = depuis_arrow(Canalisations, "depart", "fin", "debit")
+    attendu = Probleme(list(zip(*(Canalisations.column(nom).to_pylist() for nom in ["depart", "fin", "debit"]))))
+    assert probleme == attendu
+    assert probleme.recupere_sommets() == attendu.recupere_sommets()
+    assert list(probleme.attributs.columns) == ["diametre", "zone"]
+    assert probleme.attributs["zone"].tolist() == Canalisations.column("zone").to_pylist()
+    assert depuis_arrow(Canalisations, "depart", "fin", "debit", attributs=[]).attributs is None
+
+
+def test_erreurs(Canalisations):
+    """Une colonne absente, une valeur manquante ou des attributs mal alignés sont refusés."""
+    with pytest.raises(ValueError):
+        depuis_arrow(Canalisations)
+    incomplete = Canalisations.set_column(2, "debit", pa.array([15, 10, None, 4, 6, 12, 8]))
+    with pytest.raises(ValueError, match="ligne 3"):
+        depuis_arrow(incomplete, "depart", "fin", "debit")
+    with pytest.raises(ValueError):
+        Probleme([("source", "puit", 1)], Canalisations.to_pandas())
+
+
+def test_parquet(Canalisations, tmp_path):
+    """Le fichier Parquet relu donne le même problème ; les résultats sont écrits en colonnes avec les attributs."""
+    pq.write_table(Canalisations, tmp_path / "canalisations.parquet", row_group_size=3)
+    probleme = Probleme.depuis_parquet(tmp_path / "canalisations.parquet", "depart", "fin", "debit", ["zone"])
+    assert probleme == depuis_arrow(Canalisations, "depart", "fin", "debit")
+    assert list(probleme.attributs.columns) == ["zone"]
+
+    solution = probleme.resoudre()
+    ecrit_parquet(solution, tmp_path / "resultats.parquet")
+    resultats = pq.read_table(tmp_path / "resultats.parquet")
+    assert resultats.column_names == [
+        "initial", "arrivee", "capacite", "flot", "sature", "travaux", "capacite_finale", "zone"
+    ]
+    assert resultats.column("initial").to_pylist() == Canalisations.column("depart").to_pylist()
+    lignes = list(zip(*(resultats.column(nom).to_pylist() for nom in ["initial", "arrivee", "flot"])))
+    assert {(depart, arrivee): flot for depart, arrivee, flot in lignes} == solution.flots
+    travaux = dict(zip(zip(resultats.column("initial").to_pylist(), resultats.column("arrivee").to_pylist()),
+                       resultats.column("travaux").to_pylist()))
+    assert {arrete: valeur for arrete, valeur in travaux.items() if valeur} == solution.travaux
+    flots, capacites = resultats.column("flot").to_numpy(), resultats.column("capacite").to_numpy()
+    assert np.array_equal(resultats.column("sature").to_numpy(), np.isclose(flots, capacites))
+    assert table_resultats(probleme, travaux=False).column_names == ["initial", "arrivee", "capacite", "flot", "sature", "zone"]
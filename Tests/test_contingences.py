@@ -0,0 +1,102 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Tests de l'analyse de contingence N-1.
+"""
+
+import pytest
+import numpy as np
+from Adduction_eau import Probleme, analyse_contingences
+from Adduction_eau.flot import GrapheResiduel, flot_maximal
+
+
+@pytest.fixture
+def Reseau():
+    """Réseau pour tous les tests."""
+    return Probleme.par_str("""
+source / A / 15
+source / B / 15
+source / C / 15
+source / D / 10
+C / A / 5
+C / F / 5
+A / E / 7
+B / F / 10
+B / G / 7
+D / G / 10
+E / F / 5
+E / H / 4
+E / I / 15
+F / G / 5
+F / I / 15
+G / I / 15
+H / J / 7
+I / K / 30
+I / L / 4
+K / J / 10
+J / puit / 15
+K / puit / 20
+L / puit / 15
+""")
+
+
+def test_modifie_capacite():
+    """Après une baisse de capacité, le flot reste réalisable puis redevient maximal."""
+    generateur = np.random.default_rng(3)
+    for _ in range(20):
+        origines = generateur.integers(0, 12, 50)
+        destinations = generateur.integers(0, 12, 50)
+        garde = origines != destinations
+        origines, destinations = origines[garde], destinations[garde]
+        capacites = generateur.integers(1, 20, len(origines)).astype(float)
+        graphe = GrapheResiduel(12, origines, destinations, capacites)
+        graphe.pousse(0, 11)
+        for arete in range(len(capacites)):
+            copie = graphe.copie()
+            copie.modifie_capacite(arete, capacites[arete] / 2, 0, 11)
+            flots = copie.flots
+            bilan = np.zeros(12)
+            np.add.at(bilan, origines, -flots)
+            np.add.at(bilan, destinations, flots)
+            assert np.all(flots >= 0) and np.all(flots <= copie.capacites)
+            assert np.allclose(bilan[1:11], 0.)
+            copie.pousse(0, 11)
+            nouvelles = capacites.copy()
+            nouvelles[arete] /= 2
+            assert copie.valeur(0) == pytest.approx(flot_maximal(12, origines, destinations, nouvelles, 0, 11)[0])
+
+
+@pytest.mark.parametrize("processus", [1, 2])
+def test_analyse_contingences(Reseau, processus):
+    """La perte de chaque panne est celle d'une résolution complète du réseau privé de la canalisation."""
+    resultats = analyse_contingences(Reseau, processus=processus)
+    assert len(resultats) == 20
+    assert list(resultats["perte"]) == sorted(resultats["perte"], reverse=True)
+    base = Reseau.resoudre().flots
+    valeur_base = sum(flot for (_, arrivee), flot in base.items() if arrivee == "puit")
+    for ligne in resultats.itertuples():
+        reseau = [canalisation for canalisation in Reseau._reseau if canalisation[:2] != (ligne.depart, ligne.arrivee)]
+        flots = Probleme(reseau).resoudre().flots
+        valeur = sum(flot for (_, arrivee), flot in flots.items() if arrivee == "puit")
+        assert ligne.perte == pytest.approx(valeur_base - valeur)
+        assert ligne.flot == base[(ligne.depart, ligne.arrivee)]
+    assert resultats.iloc[0]["villes_non_alimentees"] != []
+
+
+def test_graphe_partage():
+    """Le graphe du réseau intact est gardé hors des tableaux, propre à chaque groupe de calcul et oublié à sa fermeture."""
+    from Adduction_eau import parallele
+    tableaux = {
+        "origines": np.array([0, 1]), "destinations": np.array([1, 2]), "capacites": np.array([5., 3.]),
+        "flots": np.zeros(2), "parametres": np.array([3, 0, 2]),
+    }
+    with parallele.GroupeDeCalcul(tableaux, processus=1) as groupe:
+        graphe = parallele.graphe_partage(groupe.tableaux)
+        assert parallele.graphe_partage(groupe.tableaux) is graphe
+        assert graphe.copie().pousse(0, 2) == 3.
+    assert groupe.generation not in parallele._GRAPHES
+    assert set(tableaux) == {"origines", "destinations", "capacites", "flots", "parametres"}
+    tableaux["capacites"][1] = 4.
+    with parallele.GroupeDeCalcul(tableaux, processus=1) as groupe:
+        assert parallele.graphe_partage(groupe.tableaux).copie().pousse(0, 2) == 4.
@@ -0,0 +1,73 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Tests de l'élagage et du découpage du réseau avant le calcul du flot maximal.
+"""
+
+import pytest
+import numpy as np
+import networkx as nx
+from Adduction_eau import Probleme
+from Adduction_eau.elagage import elague, decompose, flot_par_composantes
+
+
+@pytest.fixture
+def Reseau():
+    """Deux sous-réseaux indépendants, une branche morte et une partie non alimentée."""
+    return Probleme([
+        ("source", "A", 10), ("A", "B", 4), ("B", "puit", 6),
+        ("source", "C", 5), ("C", "D", 8), ("D", "puit", 3), ("C", "E", 2),
+        ("F", "G", 7), ("G", "puit", 4),
+    ])
+
+
+def test_rapport_elagage(Reseau):
+    """Le rapport compte les sommets et canalisations élagués et les sous-réseaux restants."""
+    solution = Reseau.resoudre()
+    rapport = dict(solution.elagage)
+    assert set(rapport.pop("moteurs")) == {"serie_parallele"}
+    assert rapport == {
+        "sommets": 9, "sommets_elagues": 3, "aretes": 9, "aretes_elaguees": 3,
+        "capacite_elaguee": 13.0, "composantes": 2, "plus_grande_composante": 3,
+    }
+    assert solution.flots[("C", "E")] == 0.
+    assert solution.flots[("G", "puit")] == 0.
+    assert solution.coupe[1] == 7.
+
+
+def test_elague_et_decompose():
+    """Seules les arrêtes d'un chemin de la source au puit sont gardées."""
+    origines = [0, 1, 2, 0, 3, 4, 0]
+    destinations = [1, 5, 5, 3, 4, 5, 5]
+    assert elague(6, origines, destinations, 0, 5).tolist() == [True, True, False, True, True, True, True]
+    assert decompose(6, origines, destinations, 0, 5).tolist() == [0, 0, 1, 2, 2, 2, 3]
+
+
+@pytest.mark.parametrize("processus", [1, 2])
+def test_flot_par_composantes(processus):
+    """Le flot obtenu sous-réseau par sous-réseau est réalisable et maximal."""
+    generateur = np.random.default_rng(6)
+    for _ in range(10):
+        origines, destinations = generateur.integers(0, 20, (2, 40))
+        garde = (origines != destinations) & (destinations != 0) & (origines != 19)
+        origines, destinations = origines[garde], destinations[garde]
+        capacites = generateur.integers(1, 10, len(origines)).astype(float)
+        flots, rapport = flot_par_composantes(20, origines, destinations, capacites, 0, 19, processus)
+        assert np.all((flots >= 0) & (flots <= capacites))
+        bilan = np.zeros(20)
+        np.add.at(bilan, origines, -flots)
+        np.add.at(bilan, destinations, flots)
+        assert np.allclose(bilan[1:19], 0.)
+        graphe = nx.DiGraph()
+        graphe.add_nodes_from([0, 19])
+        for depart, arrivee, capacite in zip(origines.tolist(), destinations.tolist(), capacites.tolist()):
+            if graphe.has_edge(depart, arrivee):
+                graphe[depart][arrivee]["capacity"] += capacite
+            else:
+                graphe.add_edge(depart, arrivee, capacity=capacite)
+        assert bilan[19] == pytest.approx(nx.maximum_flow_value(graphe, 0, 19))
+        assert rapport["aretes"] - rapport["aretes_elaguees"] == sum(
+            1 for (depart, arrivee) in zip(origines.tolist(), destinations.tolist())
+            if nx.has_path(graphe, 0, depart) and nx.has_path(graphe, arrivee, 19)
+        )
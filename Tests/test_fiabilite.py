@@ -0,0 +1,65 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Tests de la simulation de Monte-Carlo des pannes de canalisations.
+"""
+
+import pytest
+import numpy as np
+from Adduction_eau import Probleme, configure_moteur, simule_pannes
+
+
+@pytest.fixture
+def Reseau():
+    """Réseau pour tous les tests."""
+    return Probleme([
+        ("source", "A", 10), ("source", "B", 4), ("A", "B", 3), ("A", "puit", 6), ("B", "puit", 6)
+    ])
+
+
+def test_reproductible(Reseau):
+    """Une même graine donne les mêmes estimations, quels que soient le nombre de processus et le moteur configuré."""
+    seul = list(simule_pannes(Reseau, 0.2, graine=7, taille_lot=300, tirages_max=600, processus=1))
+    plusieurs = list(simule_pannes(Reseau, 0.2, graine=7, taille_lot=300, tirages_max=600, processus=2))
+    assert [estimation.attrs["tirages"] for estimation in seul] == [300, 600]
+    for premiere, seconde in zip(seul, plusieurs):
+        assert premiere.equals(seconde)
+    autre = list(simule_pannes(Reseau, 0.2, graine=8, taille_lot=300, tirages_max=600, processus=1))
+    assert not autre[-1].equals(seul[-1])
+    configure_moteur("networkx")
+    try:
+        assert list(simule_pannes(Reseau, 0.2, graine=7, taille_lot=300, tirages_max=600, processus=1))[-1].equals(seul[-1])
+    finally:
+        configure_moteur()
+
+
+def test_valeurs_exactes(Reseau):
+    """Les estimations approchent les valeurs calculées à la main."""
+    taux = {("source", "A"): 0.5}
+    estimation = list(simule_pannes(Reseau, taux, taille_lot=2000, tirages_max=4000, processus=1))[-1]
+    # Sans source / A, A ne reçoit rien et B reçoit 4 ; sinon A et B reçoivent 6.
+    assert estimation.loc["A", "moyenne"] == pytest.approx(3., abs=0.2)
+    assert estimation.loc["B", "moyenne"] == pytest.approx(5., abs=0.1)
+    assert estimation.loc["A", "borne_basse"] < 3. < estimation.loc["A", "borne_haute"]
+    assert estimation.loc["A", "probabilite_alimentee"] == pytest.approx(0.5, abs=0.05)
+    sans_panne = list(simule_pannes(Reseau, 0., taille_lot=10, tirages_max=10, processus=1))[-1]
+    assert np.array_equal(sans_panne["moyenne"], sans_panne["demande"])
+
+
+def test_alimentation_independante_de_la_repartition():
+    """Deux villes se partageant une canalisation trop petite ne sont alimentées par aucun flot maximal commun."""
+    probleme = Probleme([("source", "A", 5), ("A", "B", 5), ("A", "C", 5), ("B", "puit", 3), ("C", "puit", 3)])
+    estimation = list(simule_pannes(probleme, 0., taille_lot=10, tirages_max=10, processus=1))[-1]
+    assert estimation["probabilite_alimentee"].tolist() == [0., 0.]
+    assert estimation["moyenne"].sum() == pytest.approx(5.)
+
+
+def test_arret_anticipe(Reseau):
+    """Le calcul s'arrête dès que les intervalles de confiance sont assez étroits."""
+    estimations = list(simule_pannes(Reseau, 0.1, taille_lot=200, tirages_max=100_000, precision=0.2, processus=1))
+    assert estimations[-1].attrs["convergee"]
+    assert not any(estimation.attrs["convergee"] for estimation in estimations[:-1])
+    assert estimations[-1].attrs["tirages"] < 100_000
+    with pytest.raises(ValueError):
+        next(simule_pannes(Reseau, 1.5))
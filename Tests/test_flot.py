@@ -0,0 +1,177 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Tests du moteur natif de calcul du flot maximal.
+"""
+
+import pytest
+import numpy as np
+import networkx as nx
+from Adduction_eau.flot import GrapheResiduel, flot_maximal, flot_cout_minimal, flot_parametrique, flot_serie_parallele
+
+
+@pytest.fixture
+def Aretes():
+    """Petit réseau en identifiants entiers : source = 0, puit = 5."""
+    origines = [0, 0, 1, 1, 2, 3, 4, 3]
+    destinations = [1, 2, 2, 3, 4, 5, 5, 4]
+    capacites = [10., 8., 2., 5., 10., 7., 10., 3.]
+    return origines, destinations, capacites
+
+
+def _verifie_conservation(nb_sommets, origines, destinations, flots, source, puit):
+    """Vérifie que le flot est conservé en chaque sommet intermédiaire."""
+    bilan = np.zeros(nb_sommets)
+    np.add.at(bilan, origines, -flots)
+    np.add.at(bilan, destinations, flots)
+    for sommet in range(nb_sommets):
+        if sommet not in (source, puit):
+            assert bilan[sommet] == pytest.approx(0.)
+    return bilan[puit]
+
+
+def test_flot_maximal(Aretes):
+    """Teste la valeur du flot maximal et la faisabilité des flots."""
+    origines, destinations, capacites = Aretes
+    valeur, flots = flot_maximal(6, origines, destinations, capacites, 0, 5)
+    assert valeur == 15.
+    assert flots.shape == (len(origines),)
+    assert np.all(flots <= np.array(capacites))
+    assert _verifie_conservation(6, origines, destinations, flots, 0, 5) == valeur
+
+
+def test_flot_maximal_sans_chemin():
+    """Le flot est nul lorsque le puit n'est pas atteignable."""
+    valeur, flots = flot_maximal(3, [0, 2], [1, 1], [4., 4.], 0, 2)
+    assert valeur == 0.
+    assert list(flots) == [0., 0.]
+
+
+def test_pousse_limite(Aretes):
+    """Teste la limite de flot poussé puis la reprise du calcul."""
+    origines, destinations, capacites = Aretes
+    graphe = GrapheResiduel(6, origines, destinations, capacites)
+    assert graphe.pousse(0, 5, limite=4.) == 4.
+    assert graphe.pousse(0, 5) == 11.
+    assert graphe.flots.sum() > 0
+
+
+def test_source_egale_puit(Aretes):
+    """La source et le puit doivent être distincts."""
+    with pytest.raises(ValueError):
+        flot_maximal(6, *Aretes, 0, 0)
+
+
+def test_comparaison_networkx():
+    """Compare la valeur du flot maximal avec networkx sur des réseaux aléatoires."""
+    generateur = np.random.default_rng(0)
+    for _ in range(20):
+        nb_sommets = 30
+        origines = generateur.integers(0, nb_sommets, 120)
+        destinations = generateur.integers(0, nb_sommets, 120)
+        garde = origines != destinations
+        paires = dict()
+        for depart, arrivee, capacite in zip(
+            origines[garde], destinations[garde], generateur.integers(1, 20, 120)[garde]
+        ):
+            paires[(int(depart), int(arrivee))] = float(capacite)
+        origines = [depart for depart, _ in paires]
+        destinations = [arrivee for _, arrivee in paires]
+        capacites = list(paires.values())
+        graphe = nx.DiGraph()
+        graphe.add_nodes_from(range(nb_sommets))
+        for depart, arrivee, capacite in zip(origines, destinations, capacites):
+            graphe.add_edge(depart, arrivee, capacity=capacite)
+        attendu = nx.maximum_flow_value(graphe, 0, nb_sommets - 1)
+        valeur, flots = flot_maximal(nb_sommets, origines, destinations, capacites, 0, nb_sommets - 1)
+        assert valeur == pytest.approx(attendu)
+        assert _verifie_conservation(
+            nb_sommets, np.array(origines), np.array(destinations), flots, 0, nb_sommets - 1
+        ) == pytest.approx(attendu)
+
+
+def test_demarrage_a_chaud(Aretes):
+    """Après une augmentation de capacité, le calcul repart du flot précédent."""
+    origines, destinations, capacites = Aretes
+    graphe = GrapheResiduel(6, origines, destinations, capacites)
+    graphe.pousse(0, 5)
+    flots_avant = graphe.flots
+    graphe.augmente_capacites([5], 10.)
+    supplement = graphe.pousse(0, 5)
+    attendu, _ = flot_maximal(6, origines, destinations, np.array(capacites) + np.eye(8)[5] * 10., 0, 5)
+    assert graphe.valeur(0) == attendu
+    assert supplement == attendu - flots_avant[:2].sum()
+
+
+def test_flots_initiaux(Aretes):
+    """Le flot maximal peut partir d'un flot initial réalisable."""
+    origines, destinations, capacites = Aretes
+    _, flots = flot_maximal(6, origines, destinations, capacites, 0, 5)
+    valeur, nouveaux_flots = flot_maximal(6, origines, destinations, capacites, 0, 5, flots_initiaux=flots)
+    assert valeur == 15.
+    assert np.array_equal(nouveaux_flots, flots)
+    with pytest.raises(ValueError):
+        flot_maximal(6, origines, destinations, capacites, 0, 5, flots_initiaux=np.array(capacites) + 1)
+
+
+def test_flot_cout_minimal(Aretes):
+    """Le flot de coût minimal emprunte les arrêtes les moins chères et respecte la valeur demandée."""
+    origines, destinations, capacites = Aretes
+    couts = [1., 5., 0., 1., 1., 1., 1., 0.]
+    cout, flots = flot_cout_minimal(6, origines, destinations, capacites, couts, 0, 5, 12.)
+    assert _verifie_conservation(6, np.array(origines), np.array(destinations), flots, 0, 5) == 12.
+    assert np.all(flots <= np.array(capacites))
+    assert cout == pytest.approx(flots @ np.array(couts))
+    graphe = nx.DiGraph()
+    graphe.add_node(0, demand=-12)
+    graphe.add_node(5, demand=12)
+    for depart, arrivee, capacite, poids in zip(origines, destinations, capacites, couts):
+        graphe.add_edge(depart, arrivee, capacity=capacite, weight=poids)
+    assert cout == pytest.approx(nx.min_cost_flow_cost(graphe))
+    with pytest.raises(ValueError):
+        flot_cout_minimal(6, origines, destinations, capacites, couts, 0, 5, 16.)
+
+
+def test_flot_parametrique():
+    """Les points de rupture donnent le flot maximal en tout paramètre, par interpolation."""
+    generateur = np.random.default_rng(4)
+    for _ in range(20):
+        origines, destinations = generateur.integers(0, 8, (2, 30))
+        garde = (origines != destinations) & (destinations != 0) & (origines != 7)
+        origines, destinations = origines[garde], destinations[garde]
+        capacites = generateur.integers(0, 10, len(origines)).astype(float)
+        directions = generateur.integers(0, 3, len(origines)).astype(float)
+        parametres, valeurs = flot_parametrique(8, origines, destinations, capacites, directions, 0, 7, 5.)
+        assert parametres[0] == 0. and parametres[-1] == 5.
+        assert np.all(np.diff(valeurs) >= -1e-9)
+        for parametre in np.linspace(0., 5., 11):
+            attendu, _ = flot_maximal(8, origines, destinations, capacites + parametre * directions, 0, 7)
+            assert np.interp(parametre, parametres, valeurs) == pytest.approx(attendu)
+
+
+def test_flot_serie_parallele():
+    """Sur un arbre, la réduction série-parallèle donne un flot réalisable de même valeur que Dinic."""
+    generateur = np.random.default_rng(7)
+    for _ in range(30):
+        nb_sommets = int(generateur.integers(4, 40))
+        puit = nb_sommets - 1
+        origines, destinations = [0], [1]
+        for sommet in range(2, puit):
+            origines.append(int(generateur.integers(1, sommet)))
+            destinations.append(sommet)
+        for sommet in range(1, puit):
+            if generateur.random() < 0.6:
+                origines.append(sommet)
+                destinations.append(puit)
+        capacites = generateur.integers(1, 30, len(origines)).astype(float)
+        flots = flot_serie_parallele(nb_sommets, origines, destinations, capacites, 0, puit)
+        valeur, _ = flot_maximal(nb_sommets, origines, destinations, capacites, 0, puit)
+        assert np.all((flots >= 0) & (flots <= capacites))
+        assert _verifie_conservation(nb_sommets, np.array(origines), np.array(destinations), flots, 0, puit) == pytest.approx(valeur)
+
+
+def test_flot_serie_parallele_non_reductible(Aretes):
+    """Un réseau qui n'est pas série-parallèle est laissé au calcul général."""
+    origines, destinations, capacites = Aretes
+    assert flot_serie_parallele(6, origines, destinations, capacites, 0, 5) is None
@@ -0,0 +1,34 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Tests des imports différés du paquet.
+"""
+
+import os
+import subprocess
+import sys
+import pytest
+import Adduction_eau
+
+
+def test_import_sans_visualisation():
+    """Importer le paquet et résoudre un problème ne charge ni matplotlib, ni networkx, ni rich."""
+    programme = (
+        "import sys, Adduction_eau\n"
+        "from Adduction_eau import Probleme, coupe_minimale\n"
+        "coupe_minimale(Probleme([('source', 'A', 3), ('A', 'puit', 2)]))\n"
+        "print(sorted(module for module in ('matplotlib', 'networkx', 'rich') if module in sys.modules))\n"
+    )
+    racine = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sortie = subprocess.run([sys.executable, "-c", programme], capture_output=True, text=True, check=True, cwd=racine)
+    assert sortie.stdout.strip() == "[]"
+
+
+def test_noms_differes():
+    """Les noms différés sont listés et importés au premier accès."""
+    assert set(Adduction_eau.__all__) <= set(dir(Adduction_eau))
+    for nom in Adduction_eau.__all__:
+        assert getattr(Adduction_eau, nom) is not None
+    with pytest.raises(AttributeError):
+        Adduction_eau.inconnu
@@ -0,0 +1,49 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Tests de l'analyse de livrabilité de chaque ville.
+"""
+
+import pytest
+import numpy as np
+import networkx as nx
+from Adduction_eau import Probleme, analyse_villes
+
+
+def test_analyse_villes():
+    """L'eau reçue seule par chaque ville correspond au flot maximal du réseau où elle seule est reliée au puit.
+
+    Les villes alimentées par tous les flots maximaux communs sont celles de la solution.
+    """
+    generateur = np.random.default_rng(5)
+    for _ in range(15):
+        reseau = dict()
+        for depart, arrivee in generateur.integers(0, 12, (40, 2)).tolist():
+            if depart != arrivee and arrivee != 0 and depart != 11:
+                reseau[(f"N{depart}" if depart else "source", f"N{arrivee}" if arrivee < 11 else "puit")] = float(generateur.integers(1, 15))
+        sommets = {sommet for arrete in reseau for sommet in arrete}
+        if "source" not in sommets or "puit" not in sommets:
+            continue
+        probleme = Probleme([(*arrete, capacite) for arrete, capacite in reseau.items()])
+        analyse = analyse_villes(probleme, processus=1)
+        non_alimentees = {ville for ville, _ in probleme.resoudre().villes_non_alimentees}
+        assert {ville for ville, alimentee in analyse["alimentee"].items() if not alimentee} == non_alimentees
+        for ville, ligne in analyse.iterrows():
+            graphe = nx.DiGraph()
+            graphe.add_nodes_from(["source", "puit"])
+            for (depart, arrivee), capacite in reseau.items():
+                if arrivee != "puit" or depart == ville:
+                    graphe.add_edge(depart, arrivee, capacity=capacite)
+            assert ligne.seule == pytest.approx(nx.maximum_flow_value(graphe, "source", "puit"))
+            assert ligne.alimentee_seule or not ligne.alimentee
+            assert ligne.alimentee_seule == (ligne.seule >= ligne.demande)
+
+
+def test_analyse_villes_en_parallele():
+    """Le résultat ne dépend pas du nombre de processus."""
+    probleme = Probleme([
+        ("source", "A", 6), ("A", "B", 4), ("A", "C", 5), ("source", "D", 2), ("D", "C", 2),
+        ("B", "puit", 6), ("C", "puit", 8), ("D", "puit", 1)
+    ])
+    assert analyse_villes(probleme, processus=2).equals(analyse_villes(probleme, processus=1))
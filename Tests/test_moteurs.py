@@ -0,0 +1,119 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Tests du registre des moteurs de calcul du flot maximal.
+"""
+
+import pytest
+import numpy as np
+from Adduction_eau import Probleme
+from Adduction_eau.flot import GrapheResiduel
+from Adduction_eau.moteurs import MOTEURS, calcule_flot, choisit_moteur, configure_moteur
+
+
+def _bilan(nb_sommets, origines, destinations, flots):
+    """Flot net entrant en chaque sommet."""
+    bilan = np.zeros(nb_sommets)
+    np.add.at(bilan, origines, -flots)
+    np.add.at(bilan, destinations, flots)
+    return bilan
+
+
+@pytest.mark.parametrize("entieres", [True, False])
+def test_moteurs_identiques(entieres):
+    """Tous les moteurs donnent un flot réalisable de même valeur, arrêtes parallèles et opposées comprises.
+
+    Les arrêtes vers le puit saturées par tous les flots maximaux, qui désignent les villes alimentées, sont les mêmes.
+    """
+    generateur = np.random.default_rng(8)
+    for _ in range(15):
+        origines, destinations = generateur.integers(0, 10, (2, 30))
+        garde = origines != destinations
+        origines, destinations = origines[garde], destinations[garde]
+        capacites = generateur.integers(0, 20, len(origines)).astype(float)
+        if not entieres:
+            capacites += generateur.random(len(origines)).round(2)
+        valeurs, alimentees = dict(), dict()
+        demandes = np.flatnonzero(destinations == 9)
+        for moteur in ["natif", "networkx", "scipy", "automatique"]:
+            flots, mesure = calcule_flot(10, origines, destinations, capacites, 0, 9, moteur)
+            assert mesure["duree"] >= 0 and mesure["moteur"] in MOTEURS
+            assert np.all((flots >= 0) & (flots <= capacites + 1e-9))
+            bilan = _bilan(10, origines, destinations, flots)
+            assert np.allclose(bilan[1:9], 0.)
+            valeurs[moteur] = bilan[9]
+            graphe = GrapheResiduel(10, origines, destinations, capacites, np.minimum(flots, capacites))
+            alimentees[moteur] = graphe.toujours_saturees(demandes, 9).tolist()
+        assert valeurs["networkx"] == pytest.approx(valeurs["natif"])
+        assert valeurs["scipy"] == pytest.approx(valeurs["natif"])
+        assert valeurs["automatique"] == pytest.approx(valeurs["natif"])
+        assert alimentees["networkx"] == alimentees["scipy"] == alimentees["automatique"] == alimentees["natif"]
+
+
+def test_choix_du_moteur(monkeypatch):
+    """Le moteur vient de l'appel, puis de la configuration, puis de la variable d'environnement."""
+    arguments = (4, [0, 0, 1, 2], [1, 2, 3, 3], [10., 4., 3., 8.], 0, 3)
+    assert calcule_flot(*arguments)[1]["moteur"] == "serie_parallele"
+    monkeypatch.setenv("ADDUCTION_EAU_MOTEUR", "networkx")
+    assert calcule_flot(*arguments)[1]["moteur"] == "networkx"
+    configure_moteur("scipy")
+    try:
+        assert calcule_flot(*arguments)[1]["moteur"] == "scipy"
+        assert calcule_flot(*arguments, moteur="natif")[1]["moteur"] == "natif"
+    finally:
+        configure_moteur(None)
+    with pytest.raises(ValueError):
+        configure_moteur("inconnu")
+    with pytest.raises(ValueError):
+        calcule_flot(*arguments, moteur="inconnu")
+    with pytest.raises(ValueError):
+        calcule_flot(4, [0, 1, 0, 2, 1], [1, 3, 2, 3, 2], [1., 1., 1., 1., 1.], 0, 3, "serie_parallele")
+    assert choisit_moteur(100, np.ones(1000)) == "scipy"
+    assert choisit_moteur(100, np.full(1000, 1 / 3)) == "natif"
+
+
+def test_capacites_paralleles_32_bits():
+    """Des canalisations parallèles dont la somme dépasse 32 bits ne sont pas confiées à scipy."""
+    arguments = (3, [0, 0, 1], [1, 1, 2], [2e9, 2e9, 1e9], 0, 2)
+    with pytest.raises(ValueError):
+        calcule_flot(*arguments, moteur="scipy")
+    assert calcule_flot(*arguments, moteur="natif")[0][2] == 1e9
+    origines = np.concatenate([np.zeros(300, dtype=np.int64), np.arange(1, 301)])
+    destinations = np.concatenate([np.arange(1, 301), np.full(300, 301)])
+    capacites = np.full(600, 1e9)
+    assert choisit_moteur(302, capacites, False, origines, destinations) == "scipy"
+    origines[:300], destinations[:300] = 0, 1
+    assert choisit_moteur(302, capacites, False, origines, destinations) == "natif"
+    flots, mesure = calcule_flot(302, origines, destinations, capacites, 0, 301)
+    assert mesure["moteur"] == "natif"
+    assert flots[300:].sum() == 1e9
+
+
+def test_villes_independantes_du_seuil(monkeypatch):
+    """Passer du moteur natif à scipy en ajoutant des canalisations ne change pas les villes non alimentées."""
+    from Adduction_eau import moteurs
+    generateur = np.random.default_rng(21)
+    for _ in range(10):
+        reseau = {("source", "N1"): 1, ("N1", "puit"): 1}
+        for depart, arrivee in generateur.integers(0, 12, (60, 2)).tolist():
+            if depart != arrivee and depart != 11 and arrivee != 0:
+                reseau[("source" if depart == 0 else f"N{depart}", "puit" if arrivee == 11 else f"N{arrivee}")] = int(generateur.integers(1, 20))
+        probleme = Probleme([(*arrete, capacite) for arrete, capacite in reseau.items()])
+        villes, choix = list(), list()
+        for seuil in [1, 10 ** 9]:
+            monkeypatch.setattr(moteurs, "SEUIL_SCIPY", seuil)
+            solution = probleme.resoudre()
+            villes.append(solution.villes_non_alimentees)
+            choix.append(solution.elagage["moteurs"])
+        assert "scipy" in choix[0] and "scipy" not in choix[1]
+        assert villes[0] == villes[1]
+
+
+@pytest.mark.parametrize("moteur", ["natif", "networkx", "scipy", "serie_parallele"])
+def test_solution_par_moteur(moteur):
+    """Le moteur choisi pour une solution est indiqué dans son rapport, avec sa durée."""
+    probleme = Probleme([("source", "A", 10), ("A", "B", 4), ("A", "puit", 5), ("B", "puit", 8)])
+    solution = probleme.resoudre(moteur)
+    assert list(solution.elagage["moteurs"]) == [moteur]
+    assert solution.coupe[1] == 9.
@@ -5,6 +5,8 @@
 Tests de la classe Probleme.
 """
 
+import gzip
+import io
 import pytest
 import pandas as pd
 import numpy as np
@@ -42,6 +44,32 @@ def test_egalite(Reseau):
     assert probleme1 == probleme2
     
     
+def test_empreinte(Reseau):
+    """L'égalité et l'empreinte ne dépendent pas de l'ordre des canalisations, mais de leur contenu."""
+    probleme = Probleme(Reseau)
+    melange = Probleme(Reseau[::-1])
+    assert probleme == melange
+    assert probleme.empreinte() == melange.empreinte()
+    assert hash(probleme) == hash(melange)
+    assert len({probleme, melange, Probleme(Reseau)}) == 1
+    modifie = Probleme(Reseau[:-1] + [("D", "puit", 11)])
+    assert probleme != modifie
+    assert probleme.empreinte() != modifie.empreinte()
+    assert Probleme([("A", "B", 1), ("A", "B", 2)]) != Probleme([("A", "B", 2), ("A", "B", 1)])
+    assert Probleme([("A", "B", 2)]) != Probleme([("A", "C", 2)])
+    assert probleme != Reseau
+    
+    
+def test_depuis_canalisations(Reseau):
+    """Des canalisations déjà validées ne sont revalidées que sur demande."""
+    from Adduction_eau.canalisations import Canalisations
+    assert Probleme.depuis_canalisations(Canalisations.depuis_tuples(Reseau)) == Probleme(Reseau)
+    invalides = Canalisations.depuis_tuples([("A", "B", -1)])
+    assert Probleme.depuis_canalisations(invalides).attributs is None
+    with pytest.raises(ValueError):
+        Probleme.depuis_canalisations(invalides, verifie=True)
+    
+    
 def test_validation_doublon(Reseau):
     """Vérifie la détection de deux canalisations similaires."""
     s, a, b, c, p = Reseau
@@ -188,4 +216,67 @@ L / puit / 15
             columns=[a,c,b,d,"puit"]
         )
         test = Probleme._recupere_noeud_non_alimente_par_source(table)
-        assert test == []
\ No newline at end of file
+        assert test == []
+
+def test_validation_doublon_numero_ligne(Reseau):
+    """Le message d'erreur indique les lignes des deux canalisations identiques."""
+    s, a, b, c, p = Reseau
+    with pytest.raises(ValueError, match="lignes 2 et 5"):
+        Probleme([s, a, b, c, ("A", "C", 5.0), p])
+
+
+def test_verification_capacite_numero_ligne():
+    """Le message d'erreur indique la ligne de la capacité négative."""
+    with pytest.raises(ValueError, match="ligne 2"):
+        Probleme.par_str("A / B / 1\nC / D / -2")
+
+
+def test_constructeur_syntaxe_numero_ligne():
+    """Une ligne mal formée est signalée avec son numéro."""
+    with pytest.raises(ValueError, match="ligne 3"):
+        Probleme.par_str("source / A / 1\nA / puit / 1\nA puit 2")
+
+
+def test_instanciation_grand_reseau():
+    """La validation reste linéaire sur un grand réseau."""
+    reseau = [(f"N{i}", f"N{i + 1}", i % 7) for i in range(200_000)]
+    probleme = Probleme(reseau)
+    assert len(probleme.recupere_sommets()) == 200_001
+
+
+def test_depuis_fichier(Reseau):
+    """Le chargement par blocs donne le même problème que par_str."""
+    entree = """
+source / A / 10
+A / C / 5
+
+B / D / 4
+C / D / 2
+D / puit / 10
+"""
+    probleme = Probleme.depuis_fichier(io.StringIO(entree), taille_bloc=2)
+    assert probleme == Probleme(Reseau)
+    assert probleme._canalisations.origines.dtype == np.int32
+
+
+def test_depuis_fichier_gzip(Reseau, tmp_path):
+    """Un fichier compressé se lit sans décompression préalable, par chemin ou objet fichier."""
+    chemin = tmp_path / "reseau.txt.gz"
+    with gzip.open(chemin, "wt") as fichier:
+        fichier.write("\n".join(f"{depart} / {arrivee} / {capacite}" for depart, arrivee, capacite in Reseau))
+    assert Probleme.depuis_fichier(chemin) == Probleme(Reseau)
+    with gzip.open(chemin, "rt") as fichier:
+        assert Probleme.depuis_fichier(fichier) == Probleme(Reseau)
+
+
+def test_depuis_fichier_capacites():
+    """Les capacités sont encodées comme par _encode."""
+    probleme = Probleme.depuis_fichier(io.StringIO("source / Joue les Tours / 30.\nJoue les Tours / puit / 12"))
+    assert probleme._reseau == [("source", "JouelesTours", 30.), ("JouelesTours", "puit", 12)]
+    assert isinstance(probleme._reseau[1][2], int)
+
+
+def test_depuis_fichier_numero_ligne():
+    """Une ligne mal formée est signalée avec son numéro."""
+    with pytest.raises(ValueError, match="ligne 3"):
+        Probleme.depuis_fichier(io.StringIO("source / A / 1\nA / puit / 1\nA / B / x"), taille_bloc=2)
@@ -0,0 +1,78 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Tests de la résolution en parallèle de variantes d'un même réseau.
+"""
+
+import pytest
+import numpy as np
+from Adduction_eau import Probleme, resout_scenarios
+from Adduction_eau.algorithme import _recupere_flots_maximaux
+from Adduction_eau.parallele import TopologiePartagee, execute_en_parallele
+
+
+@pytest.fixture
+def Reseau():
+    """Réseau pour tous les tests."""
+    canalisation_0 = ("source", "D", 30.)
+    canalisation_1 = ("D", "E", 32.)
+    canalisation_2 = ("E", "F", 21.)
+    canalisation_3 = ("F", "G", 22.)
+    canalisation_4 = ("G", "H", 23.)
+    canalisation_5 = ("H", "I", 12.)
+    canalisation_6 = ("I", "J", 35.)
+    canalisation_7 = ("J", "K", 30.)
+    canalisation_8 = ("K", "L", 2.)
+    canalisation_9 = ("J", "puit", 30.)
+    canalisation_10 = ("K", "puit", 10.)
+    canalisation_11 = ("L", "puit", 10.)
+    return [
+        canalisation_0, canalisation_1, canalisation_2, canalisation_3, canalisation_4, canalisation_5,
+        canalisation_6, canalisation_7, canalisation_8, canalisation_9, canalisation_10, canalisation_11
+    ]
+
+
+def _somme(tableaux, facteur):
+    """Tâche de test : somme des valeurs partagées multipliée par un facteur."""
+    return float(tableaux["valeurs"].sum() * facteur)
+
+
+def test_execute_en_parallele():
+    """Les résultats des processus de calcul reviennent dans l'ordre des tâches."""
+    valeurs = np.arange(10.)
+    resultats = list(execute_en_parallele(_somme, {"valeurs": valeurs}, range(20), processus=2, taille_lot=3))
+    assert resultats == [45. * facteur for facteur in range(20)]
+
+
+def test_topologie_partagee():
+    """Les tableaux attachés pointent vers le même bloc de mémoire."""
+    with TopologiePartagee({"a": np.arange(3, dtype=np.int32), "b": np.ones(2)}) as topologie:
+        memoire, tableaux = TopologiePartagee.attache(topologie.description())
+        assert list(tableaux["a"]) == [0, 1, 2]
+        topologie.tableaux["b"][0] = 5.
+        assert tableaux["b"][0] == 5.
+        del tableaux
+        memoire.close()
+
+
+@pytest.mark.parametrize("processus", [1, 2])
+def test_resout_scenarios(Reseau, processus):
+    """Chaque scénario donne les mêmes flots qu'un problème construit à la main."""
+    scenarios = [{}, {("H", "I"): 40.}, {("K", "puit"): 25., ("K", "L"): 10.}, {("J", "puit"): 0.}]
+    resultats = resout_scenarios(Probleme(Reseau), scenarios, processus=processus)
+    assert list(resultats.index) == [0, 1, 2, 3]
+    for numero, scenario in enumerate(scenarios):
+        reseau = [(depart, arrivee, scenario.get((depart, arrivee), capacite)) for depart, arrivee, capacite in Reseau]
+        flots = _recupere_flots_maximaux(Probleme(reseau).table_creuse())
+        valeur = sum(flot for (_, arrivee), flot in flots.items() if arrivee == "puit")
+        assert resultats.loc[numero, "flot"].xs("puit", level="arrivee").sum() == pytest.approx(valeur)
+        demande = sum(capacite for _, arrivee, capacite in reseau if arrivee == "puit")
+        assert resultats.loc[numero, "deficit"].sum() == pytest.approx(demande - valeur)
+    assert resultats.loc[3, ("deficit", "J", "puit")] == 0.
+
+
+def test_resout_scenarios_canalisation_inconnue(Reseau):
+    """Un scénario ne peut modifier qu'une canalisation du réseau de base."""
+    with pytest.raises(ValueError):
+        resout_scenarios(Probleme(Reseau), [{("A", "Z"): 1.}], processus=1)
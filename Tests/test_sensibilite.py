@@ -0,0 +1,45 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Tests du rapport de sensibilité des canalisations.
+"""
+
+import pytest
+import numpy as np
+from Adduction_eau import Probleme, rapport_sensibilite
+
+
+def _valeur(reseau):
+    """Valeur du flot maximal d'un réseau, par une résolution complète."""
+    flots = Probleme(reseau).resoudre().flots
+    return sum(flot for (_, arrivee), flot in flots.items() if arrivee == "puit")
+
+
+def test_rapport_sensibilite():
+    """Le statut et le gain de chaque canalisation correspondent à une résolution par canalisation augmentée."""
+    generateur = np.random.default_rng(4)
+    for _ in range(10):
+        reseau = dict()
+        for depart, arrivee in generateur.integers(0, 10, (35, 2)).tolist():
+            if depart != arrivee and arrivee != 0 and depart != 9:
+                reseau[(f"N{depart}" if depart else "source", f"N{arrivee}" if arrivee < 9 else "puit")] = float(generateur.integers(1, 20))
+        sommets = {sommet for arrete in reseau for sommet in arrete}
+        if "source" not in sommets or "puit" not in sommets:
+            continue
+        canalisations = [(*arrete, capacite) for arrete, capacite in reseau.items()]
+        rapport = rapport_sensibilite(Probleme(canalisations))
+        valeur = _valeur(canalisations)
+        for ligne in rapport.itertuples():
+            augmente = [
+                (depart, arrivee, capacite + (1e6 if (depart, arrivee) == (ligne.depart, ligne.arrivee) else 0))
+                for depart, arrivee, capacite in canalisations
+            ]
+            gain = _valeur(augmente) - valeur
+            assert ligne.marge == pytest.approx(ligne.capacite - ligne.flot)
+            if ligne.statut == "coupe":
+                assert ligne.flot == ligne.capacite
+                assert gain >= min(ligne.gain_max, 1e6) > 0
+            else:
+                assert gain == pytest.approx(0.)
+                assert ligne.statut == ("libre" if ligne.marge > 0 else "sature")
@@ -0,0 +1,86 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Tests de la simulation de séries temporelles de demandes.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from Adduction_eau import Probleme, simule_demandes
+from Adduction_eau.algorithme import _recupere_flots_maximaux
+
+
+@pytest.fixture
+def Reseau():
+    """Réseau pour tous les tests."""
+    return Probleme.par_str("""
+source / A / 15
+source / B / 15
+source / C / 15
+source / D / 10
+C / A / 5
+C / F / 5
+A / E / 7
+B / F / 10
+B / G / 7
+D / G / 10
+E / F / 5
+E / H / 4
+E / I / 15
+F / G / 5
+F / I / 15
+G / I / 15
+H / J / 7
+I / K / 30
+I / L / 4
+K / J / 10
+J / puit / 15
+K / puit / 20
+L / puit / 15
+""")
+
+
+@pytest.fixture
+def Demandes():
+    """Demandes horaires aléatoires des trois villes."""
+    generateur = np.random.default_rng(0)
+    return pd.DataFrame(
+        generateur.integers(0, 25, (48, 3)).astype(float),
+        index=pd.date_range("2024-01-01", periods=48, freq="h"),
+        columns=["J", "K", "L"],
+    )
+
+
+def test_simule_demandes(Reseau, Demandes):
+    """Le total manquant à chaque pas est celui d'une résolution complète."""
+    manques = simule_demandes(Reseau, Demandes, taille_bloc=10, processus=1)
+    assert manques.shape == Demandes.shape
+    assert manques.index.equals(Demandes.index)
+    assert (manques.to_numpy() >= -1e-9).all() and (manques.to_numpy() <= Demandes.to_numpy() + 1e-9).all()
+    for pas in range(0, 48, 7):
+        reseau = [
+            (depart, arrivee, Demandes.iloc[pas][depart] if arrivee == "puit" else capacite)
+            for depart, arrivee, capacite in Reseau._reseau
+        ]
+        flots = _recupere_flots_maximaux(Probleme(reseau).table_creuse())
+        recu = sum(flot for (_, arrivee), flot in flots.items() if arrivee == "puit")
+        assert manques.iloc[pas].sum() == pytest.approx(Demandes.iloc[pas].sum() - recu)
+
+
+def test_simule_demandes_parallele(Reseau, Demandes, tmp_path):
+    """Les blocs calculés en parallèle sont écrits au fur et à mesure dans le fichier."""
+    fichier = tmp_path / "manques.csv"
+    manques = simule_demandes(Reseau, Demandes, taille_bloc=5, processus=2, fichier=fichier)
+    seul = simule_demandes(Reseau, Demandes, taille_bloc=5, processus=1)
+    assert manques.equals(seul)
+    relu = pd.read_csv(fichier, index_col=0, parse_dates=True)
+    assert np.allclose(relu.to_numpy(), manques.to_numpy())
+    assert len(relu) == 48
+
+
+def test_ville_inconnue(Reseau):
+    """Chaque colonne doit être une ville reliée au puit."""
+    with pytest.raises(ValueError):
+        simule_demandes(Reseau, pd.DataFrame({"A": [1.]}), processus=1)
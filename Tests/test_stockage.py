@@ -0,0 +1,75 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Tests du format binaire des réseaux et des solutions.
+"""
+
+import multiprocessing
+import pytest
+import numpy as np
+from Adduction_eau import Probleme, algorithme, charge_solution
+from Adduction_eau.stockage import ALIGNEMENT, _lit_entete, charge
+
+
+@pytest.fixture
+def Reseau():
+    """Réseau pour tous les tests, avec une canalisation répétée dont la dernière capacité compte."""
+    return Probleme([
+        ("source", "A", 15), ("source", "B", 15), ("A", "C", 7), ("B", "C", 4.5),
+        ("A", "C", 9), ("C", "puit", 12), ("B", "puit", 5), ("D", "puit", 3),
+    ])
+
+
+def _somme_capacites(chemin):
+    """Ouvre le fichier dans un autre processus."""
+    return float(charge(chemin)._canalisations.capacites.sum())
+
+
+def test_aller_retour(Reseau, tmp_path):
+    """Le problème relu est identique, ses tableaux sont projetés depuis le fichier et alignés."""
+    chemin = tmp_path / "reseau.adduction"
+    Reseau.sauvegarde(chemin)
+    relu = Probleme.charge(chemin)
+    assert relu == Reseau
+    assert relu._reseau == Reseau._reseau
+    canalisations = relu._canalisations
+    assert isinstance(canalisations.capacites.base, np.memmap)
+    assert not canalisations.capacites.flags.writeable
+    assert all(description["decalage"] % ALIGNEMENT == 0 for description in _lit_entete(chemin)["tableaux"].values())
+    assert relu.attributs is None and relu.empreinte() == Reseau.empreinte()
+    assert Probleme.charge(chemin, verifie=True) == Reseau
+
+
+def test_solution(Reseau, tmp_path, monkeypatch):
+    """La solution relue ne recalcule pas le flot maximal et donne les mêmes résultats."""
+    chemin = tmp_path / "solution.adduction"
+    solution = Reseau.resoudre()
+    solution.sauvegarde(chemin)
+    attendus = solution.flots, solution.villes_non_alimentees, solution.coupe
+    monkeypatch.setattr(algorithme, "flot_par_composantes", None)
+    relue = charge_solution(chemin)
+    assert (relue.flots, relue.villes_non_alimentees, relue.coupe) == attendus
+    assert relue.elagage == solution.elagage
+    monkeypatch.undo()
+    Reseau.sauvegarde(tmp_path / "probleme.adduction")
+    assert "flots" not in _lit_entete(tmp_path / "probleme.adduction")["tableaux"]
+    assert charge_solution(tmp_path / "probleme.adduction").flots == attendus[0]
+
+
+def test_processus(Reseau, tmp_path):
+    """Un autre processus ouvre le même fichier."""
+    chemin = tmp_path / "reseau.adduction"
+    Reseau.sauvegarde(chemin)
+    with multiprocessing.get_context("spawn").Pool(1) as groupe:
+        assert groupe.apply(_somme_capacites, (str(chemin),)) == pytest.approx(70.5)
+
+
+def test_erreurs(tmp_path):
+    """Un fichier d'un autre format est refusé et un réseau vide est relu."""
+    chemin = tmp_path / "texte.adduction"
+    chemin.write_text("source / A / 15\n")
+    with pytest.raises(ValueError):
+        Probleme.charge(chemin)
+    Probleme(list()).sauvegarde(chemin)
+    assert Probleme.charge(chemin) == Probleme(list())
@@ -0,0 +1,75 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Tests de la classe TableCreuse.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from Adduction_eau import Probleme, TableCreuse, transforme_table, ressort_table_apres_travaux
+
+
+@pytest.fixture
+def Reseau():
+    """Réseau pour tous les tests."""
+    canalisation_0 = ("source", "A", 10)
+    canalisation_1 = ("A", "C", 5)
+    canalisation_2 = ("B", "D", 4)
+    canalisation_3 = ("C", "D", 2)
+    canalisation_4 = ("D", "puit", 10)
+    return [canalisation_0, canalisation_1, canalisation_2, canalisation_3, canalisation_4]
+
+
+def test_depuis_aretes(Reseau):
+    """Les sommets sont numérotés dans leur ordre d'apparition."""
+    table = TableCreuse.depuis_aretes(Reseau)
+    assert table.sommets == ["source", "A", "C", "B", "D", "puit"]
+    assert table.origines.dtype == np.int32
+    assert len(table) == 5
+    assert table["A", "C"] == 5.
+    assert table["A", "D"] == 0.
+
+
+def test_derniere_capacite_conservee():
+    """Une canalisation répétée garde sa dernière capacité, comme dans la table dense."""
+    table = TableCreuse.depuis_aretes([("source", "A", 1), ("source", "A", 3), ("A", "puit", 2)])
+    assert len(table) == 2
+    assert table["source", "A"] == 3.
+
+
+def test_en_dataframe(Reseau):
+    """La table dense reconstruite est identique à table_depart."""
+    probleme = Probleme(Reseau)
+    assert probleme.table_creuse().en_dataframe().equals(probleme.table_depart())
+
+
+def test_depuis_dataframe(Reseau):
+    """L'aller-retour par la table dense conserve les arrêtes."""
+    probleme = Probleme(Reseau)
+    table = TableCreuse.depuis_dataframe(probleme.table_depart())
+    assert table.aretes() == transforme_table(probleme.table_depart())
+
+
+def test_ajout_arrete(Reseau):
+    """L'affectation d'une arrête absente l'ajoute à la table."""
+    table = TableCreuse.depuis_aretes(Reseau)
+    table["B", "E"] = 3
+    assert table["B", "E"] == 3.
+    assert table.sommets[-1] == "E"
+    assert ("B", "E", 3.) in table.aretes()
+
+
+def test_sans_puit():
+    """La table dense n'existe pas sans source ni puit."""
+    with pytest.raises(ValueError):
+        TableCreuse.depuis_aretes([("source", "A", 1)]).en_dataframe()
+
+
+def test_ressort_table_apres_travaux_creuse(Reseau):
+    """Les versions creuse et dense de la table après travaux sont identiques."""
+    probleme = Probleme(Reseau)
+    creuse = ressort_table_apres_travaux(probleme, creuse=True)
+    assert isinstance(creuse, TableCreuse)
+    assert creuse.en_dataframe().equals(ressort_table_apres_travaux(probleme))
@@ -0,0 +1,85 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Tests du réseau vivant dont le flot maximal est entretenu de façon incrémentale.
+"""
+
+import pytest
+import numpy as np
+from Adduction_eau import Probleme, ReseauVivant, recupere_ville_flot_maximal_faible
+
+
+@pytest.fixture
+def Reseau():
+    """Réseau pour tous les tests."""
+    return Probleme.par_str("""
+source / A / 15
+source / B / 15
+source / C / 15
+source / D / 10
+C / A / 5
+C / F / 5
+A / E / 7
+B / F / 10
+B / G / 7
+D / G / 10
+E / F / 5
+E / H / 4
+E / I / 15
+F / G / 5
+F / I / 15
+G / I / 15
+H / J / 7
+I / K / 30
+I / L / 4
+K / J / 10
+J / puit / 15
+K / puit / 20
+L / puit / 15
+""")
+
+
+def _valeur(probleme):
+    """Valeur du flot maximal d'un problème, par une résolution complète."""
+    return sum(flot for (_, arrivee), flot in probleme.resoudre().flots.items() if arrivee == "puit")
+
+
+def test_etat_initial(Reseau):
+    """Sans changement, le réseau vivant donne la même solution que le problème."""
+    reseau = ReseauVivant(Reseau)
+    assert reseau.valeur == _valeur(Reseau)
+    assert reseau.villes_non_alimentees == [(ville, float(demande)) for ville, demande in recupere_ville_flot_maximal_faible(Reseau)]
+    assert reseau.probleme()._reseau == [(depart, arrivee, float(capacite)) for depart, arrivee, capacite in Reseau._reseau]
+
+
+def test_changements_successifs(Reseau):
+    """Après chaque changement, le flot entretenu vaut celui d'une résolution complète."""
+    generateur = np.random.default_rng(0)
+    reseau = ReseauVivant(Reseau)
+    sommets = Reseau.recupere_sommets()
+    for _ in range(60):
+        canalisations = list(reseau.flots)
+        choix = generateur.integers(3)
+        if choix == 0:
+            depart, arrivee = generateur.choice(sommets[:-1]), generateur.choice(sommets[1:])
+            if depart != arrivee and (depart, arrivee) not in canalisations:
+                reseau.ajoute(depart, arrivee, int(generateur.integers(1, 20)))
+        elif choix == 1:
+            depart, arrivee = canalisations[generateur.integers(len(canalisations))]
+            reseau.modifie(depart, arrivee, int(generateur.integers(0, 30)))
+        elif len(canalisations) > 10:
+            depart, arrivee = canalisations[generateur.integers(len(canalisations))]
+            reseau.retire(depart, arrivee)
+        assert reseau.valeur == pytest.approx(_valeur(reseau.probleme()))
+
+
+def test_erreurs(Reseau):
+    """On ne peut ni ajouter deux fois une canalisation, ni retirer une canalisation absente."""
+    reseau = ReseauVivant(Reseau)
+    with pytest.raises(ValueError):
+        reseau.ajoute("source", "A", 3)
+    with pytest.raises(ValueError):
+        reseau.retire("A", "Z")
+    with pytest.raises(ValueError):
+        reseau.modifie("source", "A", -1)